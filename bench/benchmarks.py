@@ -0,0 +1,132 @@
+"""
+Benchmark definitions for the D&D character creator.
+Each benchmark is a setup function returning a zero-argument callable to time. Setup is not timed, and every
+input is built from a fixed seed so runs are reproducible.
+"""
+
+import atexit
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The project modules live in code/ and import each other by top-level name
+CODE_DIR = Path(__file__).resolve().parent.parent / "code"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+from misc.rng import stream_for  # noqa: E402
+
+SEED = 20261018
+
+
+def _built_character(index=0):
+    """Build the same headless character on every run."""
+    from character_builder import build_character, random_spec
+    rng = stream_for(SEED, index)
+    return build_character(random_spec(rng), rng)
+
+
+# --- Micro benchmarks ---
+
+def bench_roll_drop_lowest():
+    from misc.dice_rolling import Dice
+    dice = Dice(4, 6)
+    rng = stream_for(SEED, 1)
+    return lambda: dice.roll_drop_lowest(rng=rng)
+
+
+def bench_calc_ac():
+    from misc.stats import calc_ac
+    return lambda: (
+        calc_ac("Chain Mail", 1, 2, 0, shield=True),
+        calc_ac("Studded Leather Armor", 3, 1, 0),
+        calc_ac(None, 2, 3, 1, barbarian=True),
+        calc_ac(None, 3, 1, 2, monk=True),
+    )
+
+
+def bench_calculate_skill_scores():
+    from misc.skills import calculate_skill_scores
+    character = _built_character()
+    return lambda: calculate_skill_scores(character.ability_scores, character.proficiency_bonus, character.skills)
+
+
+def bench_filter_spells_by_class_and_known():
+    from spells.spells_utils import get_spell_dicts, filter_spells_by_class_and_known
+    spell_dicts = get_spell_dicts()
+    known = ["Cure Wounds", "Healing Word", "Bless"]
+    return lambda: [filter_spells_by_class_and_known(spell_dicts[level], "Cleric", known) for level in spell_dicts]
+
+
+def bench_parse_equipment_items():
+    from misc.backgrounds import BACKGROUND_DICT
+    from misc.backgrounds_utils import parse_equipment_items
+    option_lists = [option for data in BACKGROUND_DICT.values() for option in data.get("Equipment", [])]
+    return lambda: [parse_equipment_items(items) for items in option_lists]
+
+
+def bench_chargen_str():
+    character = _built_character()
+    return lambda: str(character)
+
+
+# --- Macro benchmarks ---
+
+def bench_headless_build():
+    from character_builder import build_character, random_spec
+    rng = stream_for(SEED, 2)
+    return lambda: build_character(random_spec(rng), rng)
+
+
+def bench_headless_build_level_5():
+    from character_builder import build_character, random_spec
+    rng = stream_for(SEED, 3)
+    return lambda: build_character(random_spec(rng, level=5), rng)
+
+
+def bench_build_and_advance_to_10():
+    from character_builder import build_character, random_spec
+    from level_up import advance_character
+    rng = stream_for(SEED, 4)
+    return lambda: advance_character(build_character(random_spec(rng), rng), 10, rng)
+
+
+def bench_generate_chunk():
+    from bulk_generator import generate_chunk
+    return lambda: generate_chunk(SEED, 0, 100)
+
+
+def bench_roster_round_trip():
+    from roster_store import RosterStore, write_roster
+    # A file of its own, so runs at the same time don't write over each other's roster
+    handle, path = tempfile.mkstemp(suffix=".roster")
+    os.close(handle)
+    atexit.register(os.remove, path)
+    characters = [_built_character(index) for index in range(100)]
+
+    def round_trip():
+        write_roster(path, characters)
+        with RosterStore(path) as roster:
+            return roster.count(level=1)
+    return round_trip
+
+
+MICRO_BENCHMARKS = {
+    "dice.roll_drop_lowest": bench_roll_drop_lowest,
+    "stats.calc_ac": bench_calc_ac,
+    "skills.calculate_skill_scores": bench_calculate_skill_scores,
+    "spells.filter_spells_by_class_and_known": bench_filter_spells_by_class_and_known,
+    "backgrounds.parse_equipment_items": bench_parse_equipment_items,
+    "charGen.__str__": bench_chargen_str,
+}
+
+MACRO_BENCHMARKS = {
+    "build.headless": bench_headless_build,
+    "build.headless_level_5": bench_headless_build_level_5,
+    "bulk.generate_chunk_100": bench_generate_chunk,
+    "levelup.build_and_advance_to_10": bench_build_and_advance_to_10,
+    "roster.write_and_open_100": bench_roster_round_trip,
+}
+
+BENCHMARKS = {**MICRO_BENCHMARKS, **MACRO_BENCHMARKS}
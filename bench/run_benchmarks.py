@@ -0,0 +1,172 @@
+"""
+Benchmark runner for the D&D character creator.
+
+Times every benchmark in benchmarks.py, compares the results against a JSON baseline, and exits with status 1
+if any benchmark is slower than its baseline by more than the threshold.
+
+Usage:
+    python bench/run_benchmarks.py                   # compare against bench/baseline.json (recorded if missing)
+    python bench/run_benchmarks.py --save-baseline   # record a new baseline
+    python bench/run_benchmarks.py --only micro      # micro (or macro) benchmarks only
+    python bench/run_benchmarks.py -k spells         # benchmarks whose name contains "spells"
+
+Baselines are machine-specific, so bench/baseline.json is not committed: the first run on a machine records it,
+and later runs compare against it.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from prettytable import PrettyTable
+
+from benchmarks import BENCHMARKS, MACRO_BENCHMARKS, MICRO_BENCHMARKS
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+# Each timed repeat runs for at least this long
+MIN_REPEAT_SECONDS = 0.2
+
+
+def time_benchmark(func, repeats: int = 5) -> dict:
+    """
+    Time func, calibrating the loop count so each repeat runs for at least MIN_REPEAT_SECONDS.
+    The fastest repeat is reported, as it is the least disturbed by other load on the machine.
+
+    Returns:
+        dict: {'seconds_per_call', 'loops', 'repeats'}
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_REPEAT_SECONDS:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(MIN_REPEAT_SECONDS / elapsed * 1.2))
+    best = elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return {"seconds_per_call": best / loops, "loops": loops, "repeats": repeats}
+
+
+def run_benchmarks(names, repeats: int = 5) -> dict:
+    """
+    Run the named benchmarks.
+
+    Returns:
+        dict: Mapping of benchmark name to its timing result
+    """
+    results = {}
+    for name in names:
+        func = BENCHMARKS[name]()
+        results[name] = time_benchmark(func, repeats)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare results to baseline timings.
+
+    Returns:
+        list: Rows of (name, current, baseline, change, status); status is 'REGRESSED' past the threshold
+    """
+    rows = []
+    for name, result in results.items():
+        current = result["seconds_per_call"]
+        base = baseline.get(name, {}).get("seconds_per_call")
+        if base is None:
+            rows.append((name, current, None, None, "new"))
+            continue
+        change = current / base - 1
+        status = "REGRESSED" if change > threshold else "ok"
+        rows.append((name, current, base, change, status))
+    return rows
+
+
+def load_baseline(path: Path) -> dict:
+    """Return the baseline timings saved at path, keyed by benchmark name."""
+    return json.loads(path.read_text(encoding="utf-8")).get("benchmarks", {})
+
+
+def save_baseline(path: Path, results: dict) -> None:
+    """Merge results into the baseline at path (creating it if needed)."""
+    baseline = load_baseline(path) if path.exists() else {}
+    baseline.update(results)
+    path.write_text(json.dumps({
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": baseline,
+    }, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _format_time(seconds) -> str:
+    """Format a per-call time with a readable unit."""
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def print_report(rows) -> None:
+    """Print the comparison as a table."""
+    table = PrettyTable(["Benchmark", "Per call", "Baseline", "Change", "Status"])
+    table.align = "l"
+    for name, current, base, change, status in rows:
+        table.add_row([name, _format_time(current), _format_time(base),
+                       "-" if change is None else f"{change:+.1%}", status])
+    print(table)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the character creator benchmarks")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help=f"Baseline JSON file (default: {DEFAULT_BASELINE.name})")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown as a fraction of the baseline (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repeats per benchmark (default: 5)")
+    parser.add_argument("--only", choices=["micro", "macro"], help="Run only micro or macro benchmarks")
+    parser.add_argument("-k", dest="keyword", help="Only run benchmarks whose name contains this text")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    names = list({"micro": MICRO_BENCHMARKS, "macro": MACRO_BENCHMARKS}.get(args.only, BENCHMARKS))
+    if args.keyword:
+        names = [name for name in names if args.keyword in name]
+    results = run_benchmarks(names, args.repeats)
+
+    if args.save_baseline or not args.baseline.exists():
+        # Without a baseline there is nothing to compare against: this run becomes the baseline for this machine
+        save_baseline(args.baseline, results)
+        print_report(compare(results, {}, args.threshold))
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    rows = compare(results, baseline, args.threshold)
+    print_report(rows)
+    added = {name: result for name, result in results.items() if name not in baseline}
+    if added:
+        save_baseline(args.baseline, added)
+        print(f"Added {len(added)} new benchmark(s) to {args.baseline}")
+    regressed = [row[0] for row in rows if row[4] == "REGRESSED"]
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Bulk character generation for the D&D character creator project.
+Generates random but legal characters across a process pool and streams them out as JSON Lines, or saves them
+to a character database (see character_store.py).
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import random
+import sys
+import time
+from collections import deque
+from typing import Iterator, TextIO
+
+from character_builder import build_character, random_spec
+from misc.rng import stream_for
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _json_default(value):
+    """
+    JSON fallback for the set-valued fields charGen uses (e.g. proficiencies).
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def character_record(character) -> dict:
+    """
+    Return a JSON-serializable dictionary of a built character.
+    Extends charGen.as_dict() with HP, feats, equipment, currency, spells, and class choices.
+    Spells are recorded by name only.
+    """
+    record = character.as_dict()
+    feature_spells = getattr(character, 'class_feature_spells', {}) or {}
+    record.update({
+        "HP": getattr(character, 'hp', None),
+        "Skills": getattr(character, 'skills', []),
+        "Feats": character.feats,
+        "Equipment": character.equipment.to_list(),
+        "Inventory": character.inventory.to_list(),
+        "Currency": {
+            "gp": character.gold_pieces,
+            "sp": character.silver_pieces,
+            "cp": character.copper_pieces,
+        },
+        "Spellcasting Ability": getattr(character, 'spellcasting_ability', None),
+        "Spell Save DC": getattr(character, 'spell_save_dc', None),
+        "Known Spells": {level: sorted(spells) for level, spells in getattr(character, 'known_spells', {}).items()},
+        "Feature Spells": {str(level): sorted(spells) for level, spells in feature_spells.items()},
+        "Eldritch Invocations": getattr(character, 'new_eldritch_invocations', []),
+        "Class Choices": getattr(character, 'class_special_choices', {}),
+    })
+    return record
+
+
+def build_chunk(seed: int, chunk_index: int, count: int, level: int = 1) -> list:
+    """
+    Build one chunk of characters.
+    Each chunk draws every choice and roll from its own stream, stream_for(seed, chunk_index), so output
+    does not depend on which worker runs which chunk and no RNG state is shared between workers.
+    """
+    rng = stream_for(seed, chunk_index)
+    return [build_character(random_spec(rng, level), rng) for _ in range(count)]
+
+
+def generate_chunk(seed: int, chunk_index: int, count: int, level: int = 1) -> str:
+    """
+    Generate one chunk of characters and return them as JSON Lines text.
+    """
+    lines = [json.dumps(character_record(character), default=_json_default)
+             for character in build_chunk(seed, chunk_index, count, level)]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _chunks(count: int, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """
+    Yield (chunk_index, chunk_count) pairs covering count characters.
+    """
+    for chunk_index, start in enumerate(range(0, count, chunk_size)):
+        yield chunk_index, min(chunk_size, count - start)
+
+
+def generate_characters(count: int, out: TextIO, workers: int = 1, seed: int = 0,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE, level: int = 1) -> float:
+    """
+    Generate count characters and write them to out as JSON Lines, flushing after every chunk.
+    Work is spread over a process pool when workers > 1; only a bounded number of chunks are in
+    flight at once, so memory use stays flat however many characters are generated.
+
+    Args:
+        count (int): Number of characters to generate.
+        out (TextIO): Stream to write JSON Lines to.
+        workers (int, optional): Number of worker processes. Defaults to 1 (no pool).
+        seed (int, optional): Master seed; the same seed always produces the same output. Defaults to 0.
+        chunk_size (int, optional): Characters per chunk. Defaults to DEFAULT_CHUNK_SIZE.
+        level (int, optional): Character level. Defaults to 1.
+
+    Returns:
+        float: Elapsed wall-clock time in seconds.
+    """
+    start = time.perf_counter()
+    for text in _run_chunks(generate_chunk, count, workers, seed, chunk_size, level):
+        out.write(text)
+        out.flush()
+    return time.perf_counter() - start
+
+
+def save_characters(count: int, path, workers: int = 1, seed: int = 0,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, level: int = 1) -> float:
+    """
+    Generate count characters and save them to the character database at path, one transaction per chunk.
+    Characters are built as in generate_characters(), so the same seed gives the same characters.
+
+    Returns:
+        float: Elapsed wall-clock time in seconds.
+    """
+    from character_store import CharacterStore
+    start = time.perf_counter()
+    with CharacterStore(path) as store:
+        for characters in _run_chunks(build_chunk, count, workers, seed, chunk_size, level):
+            store.save_many(characters, batch_size=max(chunk_size, 1))
+    return time.perf_counter() - start
+
+
+def _run_chunks(func, count: int, workers: int, seed: int, chunk_size: int, level: int) -> Iterator:
+    """
+    Yield func(seed, chunk_index, chunk_count, level) for every chunk, in chunk order.
+    Work is spread over a process pool when workers > 1, with at most workers * 2 chunks in flight.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    if workers <= 1:
+        for chunk_index, chunk_count in _chunks(count, chunk_size):
+            yield func(seed, chunk_index, chunk_count, level)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque()
+        for chunk_index, chunk_count in _chunks(count, chunk_size):
+            pending.append(pool.apply_async(func, (seed, chunk_index, chunk_count, level)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def run_generate(count: int, output: str = None, workers: int = 1, seed: int = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, level: int = 1, db: str = None) -> None:
+    """
+    CLI entry point for bulk generation: writes to output (or stdout), or saves to the character database db,
+    and reports throughput on stderr.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+    if db:
+        elapsed = save_characters(count, db, workers, seed, chunk_size, level)
+    elif output:
+        with open(output, "w", encoding="utf-8") as out:
+            elapsed = generate_characters(count, out, workers, seed, chunk_size, level)
+    else:
+        elapsed = generate_characters(count, sys.stdout, workers, seed, chunk_size, level)
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"Generated {count} characters in {elapsed:.2f}s ({rate:,.0f} chars/sec, seed {seed}, {workers} workers)"
+          + (f"; saved to {db}" if db else ""), file=sys.stderr)
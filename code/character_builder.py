@@ -0,0 +1,210 @@
+"""
+Headless character building for the D&D character creator project.
+Builds a fully populated charGen from a declarative spec without any prompts, running the same
+background, class, and species logic as the interactive creation process in character_creation.py.
+"""
+
+from __future__ import annotations
+
+import random
+
+from character_creation import charGen
+from misc.stats import ABILITY_NAMES, roll_ability_scores
+from misc.backgrounds import BACKGROUND_DICT, build_background
+from misc.feats import FIGHTING_STYLE_FEATS
+from misc.invocations import ELDRITCH_INVOCATIONS, invocation_prereqs_met
+from misc.skills import SKILLS_DICT
+from species.species import LINEAGE_MAP, build_species, get_lineage_options
+from species.species_dict import SPECIES_DATA, traits
+from classes.class_selection import build_class
+from classes.class_progression import get_class_progression
+from classes.class_utils import (
+    AVAILABLE_CLASSES,
+    get_available_skills,
+    get_available_spell_levels,
+    handle_class_feature_spells,
+    subclass_feature,
+)
+from equipment.weapons_dict import SIMPLE_WEAPONS_DICT, MARTIAL_WEAPONS_DICT
+from spells.spell_set import SpellSet
+from spells.spells_utils import get_spell_dicts, filter_spells_by_class_and_known
+
+
+def build_character(spec: dict, rng=None) -> charGen:
+    """
+    Build a character from a spec dictionary, in the same order as charGen.make_character().
+
+    Spec keys:
+        - 'name', 'player_name', 'alignment', 'gender', 'age', 'level': Basic details (optional).
+        - 'ability_scores': Dict of all six ability scores. Rolled (4d6 drop lowest) if omitted.
+        - 'background': Key into BACKGROUND_DICT.
+        - 'ability_increases': Background ability increases, e.g. {'Wisdom': 2, 'Charisma': 1}.
+            Defaults to +1 to all three.
+        - 'background_equipment_option': Index of the background equipment option (default 0).
+        - 'class': Key into AVAILABLE_CLASSES.
+        - 'skills', 'equipment_option', 'spells', 'invocations', 'weapon_mastery', 'fighting_style',
+          'divine_order', 'primal_order', 'extra_cantrip', 'subclass': Class choices, see build_class().
+        - 'species': Key into SPECIES_DATA.
+        - 'lineage': Lineage/ancestry/legacy option, for species that have one.
+        - 'species_skills': Skills for skill-granting traits, e.g. {'Keen Senses': 'Perception'}.
+
+    Args:
+        spec (dict): The character spec.
+        rng (random.Random, optional): Random number stream for rolled ability scores, e.g. a misc.rng.RollStream.
+            Defaults to the global random module.
+
+    Returns:
+        charGen: The fully populated character.
+
+    Raises:
+        ValueError: If any part of the spec is not a legal choice.
+    """
+    character = charGen(
+        name=spec.get('name', ''),
+        player_name=spec.get('player_name', ''),
+        level=spec.get('level', 1),
+        alignment=spec.get('alignment', 'N/A'),
+        gender=spec.get('gender', 'N/A'),
+        age=spec.get('age', 18),
+        rng=rng,
+    )
+    # Ability scores
+    ability_scores = spec.get('ability_scores')
+    if ability_scores is None:
+        ability_scores = roll_ability_scores(rng)
+    elif set(ability_scores) != set(ABILITY_NAMES):
+        raise ValueError(f"Ability scores must be given for exactly: {', '.join(ABILITY_NAMES)}")
+    character.ability_scores = {name: ability_scores[name] for name in ABILITY_NAMES}
+    # Background
+    character.apply_background(build_background(
+        spec['background'],
+        spec.get('ability_increases'),
+        spec.get('background_equipment_option', 0),
+    ))
+    character.calculate_ability_modifiers()
+    # Class
+    choices = dict(spec)
+    choices['spells'] = {int(lvl): names for lvl, names in spec.get('spells', {}).items()}
+    character.apply_class(build_class(
+        spec['class'],
+        choices,
+        current_level=character.level,
+        already_proficient=getattr(character, 'skills', []),
+        known_spells=getattr(character, 'known_spells', {}),
+        character=character,
+    ))
+    # Species
+    character.apply_species(
+        build_species(spec['species'], spec.get('lineage')),
+        skill_choices=spec.get('species_skills', {}),
+    )
+    character.calculate_skills()
+    return character
+
+
+def random_spec(rng: random.Random = None, level: int = 1) -> dict:
+    """
+    Generate a random but legal spec for build_character().
+    Every choice is drawn from rng; ability scores are left out so build_character() rolls them.
+
+    Args:
+        rng (random.Random, optional): Random number generator to draw choices from. Defaults to a new unseeded one.
+        level (int, optional): The character's level. Defaults to 1.
+
+    Returns:
+        dict: A spec dictionary accepted by build_character().
+    """
+    if rng is None:
+        rng = random.Random()
+    spec = {'level': level}
+    # Background
+    bg_name = rng.choice(list(BACKGROUND_DICT))
+    bg_data = BACKGROUND_DICT[bg_name]
+    spec['background'] = bg_name
+    bg_abilities = bg_data.get('Ability Scores', [])
+    if len(bg_abilities) == 3 and rng.random() < 0.5:
+        plus_two, plus_one = rng.sample(bg_abilities, 2)
+        spec['ability_increases'] = {plus_two: 2, plus_one: 1}
+    spec['background_equipment_option'] = rng.randrange(len(bg_data.get('Equipment', [[]])))
+    skills = list(bg_data.get('Skill Proficiencies', []))
+
+    # Class
+    class_name = rng.choice(list(AVAILABLE_CLASSES))
+    class_data = AVAILABLE_CLASSES[class_name][0]
+    progression = get_class_progression(class_name)
+    class_features = [feature for _, feature in progression.features_through(level)]
+    spec['class'] = class_name
+    available_skills, num_skills = get_available_skills(class_data, skills)
+    spec['skills'] = rng.sample(available_skills, min(num_skills, len(available_skills)))
+    skills.extend(spec['skills'])
+    spec['equipment_option'] = rng.randrange(len(class_data.get('starting_equipment', [[]])))
+    if class_name in ('Barbarian', 'Fighter', 'Paladin', 'Ranger') and 'Weapon Mastery' in class_features:
+        spec['weapon_mastery'] = rng.sample(sorted(set(SIMPLE_WEAPONS_DICT) | set(MARTIAL_WEAPONS_DICT)),
+                                            progression.resource('weapon_mastery', level, 2))
+    if class_name == 'Fighter' and any("Fighting Style" in f for f in class_features):
+        spec['fighting_style'] = rng.choice(list(FIGHTING_STYLE_FEATS))
+    extra_cantrip = False
+    if class_name == 'Cleric' and 'Divine Order' in class_features:
+        spec['divine_order'] = rng.choice(['Protector', 'Thaumaturge'])
+        extra_cantrip = spec['divine_order'] == 'Thaumaturge'
+    if class_name == 'Druid' and 'Primal Order' in class_features:
+        spec['primal_order'] = rng.choice(['Magician', 'Warden'])
+        extra_cantrip = spec['primal_order'] == 'Magician'
+    if subclass_feature(class_name) in class_features:
+        spec['subclass'] = rng.choice(list(AVAILABLE_CLASSES[class_name][3]))
+
+    # Spells
+    spellcasting = progression.spellcasting(level)
+    spec['spells'] = {}
+    if spellcasting:
+        spell_dicts = get_spell_dicts()
+        feature_spells = handle_class_feature_spells(class_name, class_data, class_features)
+        num_cantrips = spellcasting.get('cantrips_known', 0)
+        if num_cantrips:
+            cantrips = list(filter_spells_by_class_and_known(spell_dicts[0], class_name, exclude_spells=feature_spells.get(0, {})))
+            picked = rng.sample(cantrips, min(num_cantrips, len(cantrips)))
+            if extra_cantrip:
+                spec['extra_cantrip'] = picked.pop()
+            spec['spells'][0] = picked
+        num_spells = spellcasting.get('spells_known', spellcasting.get('spells_prepared', 0))
+        leveled = []
+        # A few spells are listed at two levels; each name is offered once
+        taken = SpellSet()
+        for spell_level in get_available_spell_levels(class_name, spellcasting):
+            available = filter_spells_by_class_and_known(spell_dicts.get(spell_level, {}), class_name, taken,
+                                                         exclude_spells=feature_spells.get(spell_level, {}))
+            leveled.extend((spell_level, name) for name in available)
+            taken |= SpellSet(available)
+        for spell_level, name in rng.sample(leveled, min(num_spells, len(leveled))):
+            spec['spells'].setdefault(spell_level, []).append(name)
+
+    # Eldritch Invocations (cantrip prerequisites cannot be met at creation, so none are assumed known)
+    num_invocations = progression.resource('eldritch_invocations', level, 0)
+    if num_invocations:
+        spec['invocations'] = []
+        candidates = list(ELDRITCH_INVOCATIONS)
+        rng.shuffle(candidates)
+        for inv_name in candidates:
+            if len(spec['invocations']) >= num_invocations:
+                break
+            if invocation_prereqs_met(inv_name, level, set(), set(spec['invocations'])):
+                spec['invocations'].append(inv_name)
+
+    # Species
+    species_name = rng.choice(list(SPECIES_DATA))
+    spec['species'] = species_name
+    species_traits = SPECIES_DATA[species_name][traits]
+    for trait in species_traits:
+        if trait in LINEAGE_MAP:
+            spec['lineage'] = rng.choice(list(get_lineage_options(trait)))
+    spec['species_skills'] = {}
+    if 'Keen Senses' in species_traits:
+        keen = [s for s in ("Insight", "Perception", "Survival") if s not in skills]
+        if keen:
+            spec['species_skills']['Keen Senses'] = rng.choice(keen)
+            skills.append(spec['species_skills']['Keen Senses'])
+    if 'Skillful' in species_traits:
+        remaining = [s for s in SKILLS_DICT if s not in skills]
+        if remaining:
+            spec['species_skills']['Skillful'] = rng.choice(remaining)
+    return spec
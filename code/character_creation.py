@@ -13,9 +13,12 @@ from misc.backgrounds_utils import parse_equipment_items
 from species.species import main as species_select_main
 from species.species_utils import handle_special_skill_traits
 from classes.class_selection import select_class
+from classes import multiclass
 from misc.feats_utils import parse_feat
-from equipment.weapons_dict import SIMPLE_WEAPONS_DICT, MARTIAL_WEAPONS_DICT
-from equipment.armor_dict import LIGHT_ARMOR_DICT, MEDIUM_ARMOR_DICT, HEAVY_ARMOR_DICT, SHIELD_DICT
+from equipment.inventory import Inventory
+from equipment.item_catalog import lookup_item
+from spells.spell_set import SpellSet
+from misc.derived_stats import DerivedStats, derived
 
 PROFICIENCY_BONUS: dict[str, str] = {
     "<4": "+2",
@@ -37,11 +40,28 @@ def get_proficiency_bonus(level: int) -> int:
     else:
         return 2
 
-class charGen:
+def _modifier(ability):
+    """A derived attribute holding one ability's modifier (0 without ability scores)."""
+    return derived('modifiers')(lambda self: self.modifiers.get(ability, 0))
+
+
+def _passive(skill):
+    """A derived attribute holding a skill's passive score (10 + the skill value), or None without skill scores."""
+    def passive(self):
+        value = self.skill_scores.get(skill)
+        return None if value is None else 10 + value[0]
+    return derived('skill_scores')(passive)
+
+
+class charGen(DerivedStats):
     """
     Character generator class for D&D 5e.
     Stores all relevant character information and provides methods for creation.
 
+    Modifiers, skill scores, passive scores, Armor Class, HP, and spellcasting modifier and save DC are derived
+    attributes (see misc/derived_stats.py): computed when first read, cached, and recomputed only after an input
+    they depend on (ability scores, skills, equipment, feats, hit dice, ...) changes.
+
     Main output format is via __str__, which prints a detailed character sheet.
     Use as_dict() for a dictionary representation suitable for export or further processing.
     """
@@ -59,6 +79,7 @@ class charGen:
         gender: str = "N/A",
         age: int = 18,
         class_hit_die: str = None,  # New field
+        rng=None,
     ):
         self.name = name
         self.species = species
@@ -72,9 +93,12 @@ class charGen:
         self.gender = gender
         self.age = age
         self.class_hit_die = class_hit_die  # Store hit die
+        # Random number stream for this character's rolls (None uses the global random module)
+        self.rng = rng
         self.proficiency_bonus = get_proficiency_bonus(self.level)
-        self.inventory = []
-        self.equipment = []
+        # Structured inventories (see equipment/inventory.py): armor, weapons, and ammunition, and everything else
+        self.inventory = Inventory()
+        self.equipment = Inventory()
         self.gold_pieces = 0
         self.silver_pieces = 0
         self.copper_pieces = 0
@@ -86,6 +110,18 @@ class charGen:
         }
         # Feats (always a list of dicts, e.g. {"feat": "Fighting Style", "fighting_style": "Archery"})
         self.feats = []
+        # Levels in each class ({class_name: level}), more than one when multiclassed (see level_up.py)
+        self.classes = {}
+        # Subclass chosen in each class, for subclasses that grant spellcasting (e.g. Eldritch Knight)
+        self.subclasses = {}
+        # Spell slots by spell level, with Warlock Pact Magic slots kept separate
+        self.spell_slots = {}
+        self.pact_slots = {}
+        # Proficient skills
+        self.skills = []
+        self.spellcasting_ability = None
+        # The hit points rolled (or taken as average) for each level's hit die, before modifiers
+        self.hit_point_dice = []
 
     def as_dict(self):
         """
@@ -104,11 +140,101 @@ class charGen:
             "Age": self.age,
             "Ability Scores": self.ability_scores if self.ability_scores else {},
             "Species Traits": getattr(self, 'species_traits', []),
-            "Skill Scores": getattr(self, 'skill_scores', {}),
+            "Skill Scores": self.skill_scores,
             "Proficiencies": self.proficiencies,
             "Class Hit Die": self.class_hit_die,  # Add to dict
         }
 
+    @property
+    def spell_loadout(self) -> SpellSet:
+        """
+        Every spell the character has, known or granted by class features, as a hashable SpellSet.
+        Characters with equal loadouts have the same spells, so rosters can be grouped or deduplicated by it.
+        """
+        feature_spells = getattr(self, 'class_feature_spells', {}) or {}
+        return SpellSet.from_known_spells(getattr(self, 'known_spells', {})) | SpellSet(
+            name for spells in feature_spells.values() for name in spells
+        )
+
+    @property
+    def caster_level(self) -> int:
+        """The combined caster level used for multiclass spell slots (0 for non-casters)."""
+        return multiclass.caster_level(self.classes or {self.class_name: self.level}, self.subclasses)
+
+    def has_feat(self, feat_name: str) -> bool:
+        """Return True if the character has a feat (feats are dicts, or names in older characters)."""
+        return any((feat.get('feat') if isinstance(feat, dict) else feat) == feat_name for feat in self.feats)
+
+    @derived('ability_scores')
+    def modifiers(self) -> dict:
+        """Ability modifiers by ability name ({} without ability scores)."""
+        return {name: ability_modifier(score) for name, score in (self.ability_scores or {}).items()}
+
+    str_mod = _modifier('Strength')
+    dex_mod = _modifier('Dexterity')
+    con_mod = _modifier('Constitution')
+    int_mod = _modifier('Intelligence')
+    wis_mod = _modifier('Wisdom')
+    cha_mod = _modifier('Charisma')
+
+    @derived('ability_scores', 'proficiency_bonus', 'skills')
+    def skill_scores(self) -> dict:
+        """Skill name -> (value, is_proficient) ({} without ability scores)."""
+        if not self.ability_scores:
+            return {}
+        return calculate_skill_scores(self.ability_scores, self.proficiency_bonus, self.skills)
+
+    passive_perception = _passive('Perception')
+    passive_insight = _passive('Insight')
+    passive_investigation = _passive('Investigation')
+
+    @derived('equipment', 'modifiers', 'class_name')
+    def armor_class(self) -> int:
+        """Armor Class from the equipped armor and shield, with Barbarian and Monk Unarmored Defense."""
+        equipped_armor = None
+        shield_equipped = False
+        for entry in self.equipment.equipped():
+            record = entry.record
+            if record is None:
+                continue
+            if record.is_body_armor and equipped_armor is None:
+                equipped_armor = record.name
+            elif record.is_shield:
+                shield_equipped = True
+        class_name = (self.class_name or '').lower()
+        return calc_ac(
+            equipped_armor=equipped_armor,
+            dex_mod=self.dex_mod,
+            con_mod=self.con_mod,
+            wis_mod=self.wis_mod,
+            barbarian=class_name == 'barbarian',
+            monk=class_name == 'monk',
+            shield=shield_equipped
+        )
+
+    @derived('hit_point_dice', 'modifiers', 'feats')
+    def hp(self):
+        """
+        Hit points: each level's hit die plus the Constitution modifier (and 2 for Tough), at least 1 per level.
+        None before the character has a class hit die.
+        """
+        if not self.hit_point_dice:
+            return None
+        con_mod = self.con_mod
+        tough = self.has_feat('Tough')
+        return sum(max(1, calc_hp(die_value, con_mod, 1, tough)) for die_value in self.hit_point_dice)
+
+    @derived('spellcasting_ability', 'modifiers')
+    def spellcasting_modifier(self):
+        """The spellcasting ability's modifier, or None for non-casters."""
+        return self.modifiers.get(self.spellcasting_ability) if self.spellcasting_ability else None
+
+    @derived('spellcasting_modifier', 'proficiency_bonus')
+    def spell_save_dc(self):
+        """8 + spellcasting modifier + proficiency bonus, or None for non-casters."""
+        modifier = self.spellcasting_modifier
+        return None if modifier is None else 8 + modifier + self.proficiency_bonus
+
 
     def __str__(self):
         char_dict = self.as_dict()
@@ -119,31 +245,12 @@ class charGen:
         max_key_len = max(len(k) for k in main_keys)
         lines = [f"{k + ':':<{max_key_len+2}} {char_dict[k]}" for k in main_keys]
         # Print HP just after Class Hit Die
-        lines.insert(main_keys.index("Class Hit Die") + 1, f"{'HP:':<{max_key_len+2}} {getattr(self, 'hp', 'N/A')}")
-        # --- Armor Class Calculation and Display ---
-        # Find first equipped armor in equipment list
-        equipped_armor = None
-        for item in getattr(self, 'equipment', []):
-            base = item.split(' x ')[0] if ' x ' in item else item
-            if base in LIGHT_ARMOR_DICT or base in MEDIUM_ARMOR_DICT or base in HEAVY_ARMOR_DICT:
-                equipped_armor = base
-                break
-        # Detect shield
-        shield_equipped = any((item.split(' x ')[0] if ' x ' in item else item) in SHIELD_DICT for item in getattr(self, 'equipment', []))
-        # Detect class features for monk/barbarian
-        is_monk = getattr(self, 'class_name', '').lower() == 'monk'
-        is_barbarian = getattr(self, 'class_name', '').lower() == 'barbarian'
-        # Calculate AC
-        ac_val = calc_ac(
-            equipped_armor=equipped_armor,
-            dex_mod=getattr(self, 'dex_mod', 0),
-            con_mod=getattr(self, 'con_mod', 0),
-            wis_mod=getattr(self, 'wis_mod', 0),
-            barbarian=is_barbarian,
-            monk=is_monk,
-            shield=shield_equipped
-        )
-        lines.insert(main_keys.index("Class Hit Die") + 2, f"{'Armor Class:':<{max_key_len+2}} {ac_val}")
+        hp = self.hp
+        lines.insert(main_keys.index("Class Hit Die") + 1, f"{'HP:':<{max_key_len+2}} {'N/A' if hp is None else hp}")
+        lines.insert(main_keys.index("Class Hit Die") + 2, f"{'Armor Class:':<{max_key_len+2}} {self.armor_class}")
+        if len(self.classes) > 1:
+            class_levels = " / ".join(f"{name} {level}" for name, level in self.classes.items())
+            lines.insert(main_keys.index("Class") + 1, f"{'Multiclass:':<{max_key_len+2}} {class_levels}")
 
         # Print Feats Section
         lines.append("Feats:")
@@ -193,9 +300,7 @@ class charGen:
                 simple_all = True
             elif w.lower() in ["martial weapons", "all martial weapons", "martial weapon proficiency"]:
                 martial_all = True
-            elif w in SIMPLE_WEAPONS_DICT:
-                simple_weapons.add(w)
-            elif w in MARTIAL_WEAPONS_DICT:
+            elif getattr(lookup_item(w), 'subcategory', None) == 'martial':
                 martial_weapons.add(w)
             else:
                 simple_weapons.add(w)
@@ -235,15 +340,7 @@ class charGen:
         lines.append("Ability Scores:")
         abilities = char_dict["Ability Scores"]
         saving_throw_profs = getattr(self, 'saving_throw_proficiencies', [])
-        # Map for ability to modifier attribute
-        mod_map = {
-            'Strength': getattr(self, 'str_mod', None),
-            'Dexterity': getattr(self, 'dex_mod', None),
-            'Constitution': getattr(self, 'con_mod', None),
-            'Intelligence': getattr(self, 'int_mod', None),
-            'Wisdom': getattr(self, 'wis_mod', None),
-            'Charisma': getattr(self, 'cha_mod', None),
-        }
+        mod_map = self.modifiers
         if abilities:
             ability_key_len = max(len(k) for k in abilities)
             for subk, subv in abilities.items():
@@ -263,6 +360,10 @@ class charGen:
                 mod_str = f"+{value}" if value > 0 else str(value)
                 prof_mark = " (P)" if proficient else ""
                 lines.append(f"  {skill + ':':<{skill_key_len+3}} {mod_str}{prof_mark}")
+            lines.append("Passive Scores:")
+            for label, score in (("Perception", self.passive_perception), ("Insight", self.passive_insight),
+                                 ("Investigation", self.passive_investigation)):
+                lines.append(f"  {label + ':':<{skill_key_len+3}} {score}")
         else:
             lines.append("  None")
 
@@ -275,7 +376,7 @@ class charGen:
             lines.append("  None")
 
         lines.append("Inventory:")
-        inventory = getattr(self, 'inventory', []) or [None]
+        inventory = self.inventory
         weapon_mastery = set()
         if hasattr(self, 'class_special_choices') and self.class_special_choices:
             for k, v in self.class_special_choices.items():
@@ -284,55 +385,33 @@ class charGen:
                         weapon_mastery.add(item)
                 elif isinstance(v, str):
                     weapon_mastery.add(v)
-        for item in inventory:
-            if item:
-                base = item.split(' x ')[0] if ' x ' in item else item
-                mark = " (M)" if base in weapon_mastery else ""
-                lines.append(f"  - {item}{mark}")
-            else:
-                lines.append("  None")
+        for entry in inventory:
+            mark = " (M)" if entry.item_id in weapon_mastery else ""
+            lines.append(f"  - {entry.label}{mark}")
+        if not inventory:
+            lines.append("  None")
 
         lines.append("Equipment:")
-        equipment = getattr(self, 'equipment', []) or [None]
+        equipment = self.equipment
         weapon_profs = self.proficiencies.get('weapons', set())
         armor_profs = self.proficiencies.get('armor', set())
-        # Determine equipped armor for (E) marker
-        equipped_armor = None
-        for item in equipment:
-            if item:
-                base = item.split(' x ')[0] if ' x ' in item else item
-                if base in LIGHT_ARMOR_DICT or base in MEDIUM_ARMOR_DICT or base in HEAVY_ARMOR_DICT:
-                    equipped_armor = base
-                    break
-        for item in equipment:
-            if item:
-                base = item.split(' x ')[0] if ' x ' in item else item
-                mark = ""
-                if base in weapon_mastery:
-                    mark += " (M)"
-                is_prof = False
-                if (
-                    base in weapon_profs or
-                    ("Simple Weapons" in weapon_profs and base in SIMPLE_WEAPONS_DICT) or
-                    ("Martial Weapons" in weapon_profs and base in MARTIAL_WEAPONS_DICT)
-                ):
-                    is_prof = True
-                if (
-                    base in armor_profs or
-                    ("Light Armor" in armor_profs and base in LIGHT_ARMOR_DICT) or
-                    ("Medium Armor" in armor_profs and base in MEDIUM_ARMOR_DICT) or
-                    ("Heavy Armor" in armor_profs and base in HEAVY_ARMOR_DICT) or
-                    ("Shields" in armor_profs and base in SHIELD_DICT)
-                ):
-                    is_prof = True
-                if is_prof:
-                    mark += " (P)"
-                # Add (E) marker if this is the equipped armor
-                if base == equipped_armor:
-                    mark += " (E)"
-                lines.append(f"  - {item}{mark}")
-            else:
-                lines.append("  None")
+        for entry in equipment:
+            record = entry.record
+            mark = ""
+            if entry.item_id in weapon_mastery:
+                mark += " (M)"
+            is_prof = entry.item_id in weapon_profs or entry.item_id in armor_profs
+            if record is not None and record.proficiency is not None:
+                covering = weapon_profs if record.category == 'weapon' else armor_profs
+                is_prof = is_prof or record.proficiency in covering
+            if is_prof:
+                mark += " (P)"
+            # Add (E) marker if this is equipped armor
+            if entry.equipped and record is not None and record.is_body_armor:
+                mark += " (E)"
+            lines.append(f"  - {entry.label}{mark}")
+        if not equipment:
+            lines.append("  None")
 
         lines.append("Currency:")
         gp = getattr(self, 'gold_pieces', 0)
@@ -350,16 +429,23 @@ class charGen:
         else:
             lines.append("  None")
 
-        if hasattr(self, 'spellcasting_ability') and self.spellcasting_ability:
+        if getattr(self, 'spellcasting_ability', None) or self.spell_slots or self.pact_slots:
             lines.append("Spellcasting:")
-            lines.append(f"  Ability: {self.spellcasting_ability}")
-            mod = getattr(self, 'spellcasting_modifier', None)
+            if getattr(self, 'spellcasting_ability', None):
+                lines.append(f"  Ability: {self.spellcasting_ability}")
+            mod = self.spellcasting_modifier
             if mod is not None:
                 mod_str = f"+{mod}" if mod > 0 else str(mod)
                 lines.append(f"  Modifier: {mod_str}")
-            dc = getattr(self, 'spell_save_dc', None)
+            dc = self.spell_save_dc
             if dc is not None:
                 lines.append(f"  Save DC: {dc}")
+            if self.spell_slots:
+                slots = ", ".join(f"{level}: {count}" for level, count in sorted(self.spell_slots.items()))
+                lines.append(f"  Spell Slots (by level): {slots}")
+            if self.pact_slots:
+                slots = ", ".join(f"{count} level {level}" for level, count in self.pact_slots.items())
+                lines.append(f"  Pact Slots: {slots}")
 
         lines.append("Spell List:")
         # Combine known_spells and class_feature_spells for display
@@ -427,8 +513,10 @@ class charGen:
         Add equipment, inventory, and currency from a source dict (background, class, etc).
         Modifies self.equipment, self.inventory, self.gold_pieces, self.silver_pieces, self.copper_pieces in place.
         """
-        self.equipment.extend(source.get('equipment', []))
-        self.inventory.extend(source.get('inventory', []))
+        self.equipment.extend(source.get('equipment', ()))
+        self.inventory.extend(source.get('inventory', ()))
+        # Wear the first armor and shield gained, if none is worn yet
+        self.equipment.auto_equip()
         self.gold_pieces += source.get('gold_pieces', 0)
         self.silver_pieces += source.get('silver_pieces', 0)
         self.copper_pieces += source.get('copper_pieces', 0)
@@ -448,6 +536,16 @@ class charGen:
         Equipment and currency are parsed and merged with the character's inventory and currency.
         """
         bg_info = select_background()
+        if bg_info:
+            self.apply_background(bg_info)
+            print(f"Background selected: {self.background}")
+        else:
+            print("No background selected.")
+
+    def apply_background(self, bg_info: dict) -> None:
+        """
+        Save a background's details (as returned by select_background or build_background) to the character instance.
+        """
         if bg_info:
             self.background = bg_info.get('Name', '') or next(iter(bg_info.keys()), '')
             self.background_details = bg_info
@@ -458,11 +556,11 @@ class charGen:
                 if parsed_feat:
                     # Always store as dict for consistency
                     if isinstance(parsed_feat, dict):
-                        self.feats.append(parsed_feat)
+                        self.feats.append({'feat': bg_info['Feat'], **parsed_feat})
                     elif isinstance(parsed_feat, str):
                         self.feats.append({'feat': parsed_feat})
             # Skills
-            self.skills = bg_info.get('Skill Proficiencies', [])
+            self.skills = list(bg_info.get('Skill Proficiencies', []))
             # Equipment, inventory, currency
             self.add_items_from_source(bg_info)
             # Proficiencies
@@ -473,9 +571,6 @@ class charGen:
                 for k, v in asi.items():
                     if k in self.ability_scores:
                         self.ability_scores[k] += v
-            print(f"Background selected: {self.background}")
-        else:
-            print("No background selected.")
             
     def choose_class(self):
         """
@@ -488,25 +583,29 @@ class charGen:
         known_spells = getattr(self, 'known_spells', {})
         # Pass self as the character instance to select_class so that add_feat can prompt and update feats/fighting_styles
         result = select_class(current_level=self.level, already_proficient=already_proficient, known_spells=known_spells, character=self)
+        if result:
+            self.apply_class(result)
+            print(f"Class selected: {self.class_name}")
+        else:
+            print("No class selected.")
+
+    def apply_class(self, result: dict) -> None:
+        """
+        Save the result of select_class or build_class to the character instance.
+        """
         if result:
             self.class_name = result['class_name']
             self.class_hit_die = result.get('class_hit_die')  # <-- Set hit die here
+            self.classes = {self.class_name: self.level}
+            self.subclasses = {self.class_name: result['subclass']} if result.get('subclass') else {}
+            self.spell_slots = dict(multiclass.spell_slots(self.classes, self.subclasses))
+            self.pact_slots = dict(multiclass.pact_slots(self.classes))
             # Save Eldritch Invocations if present
             self.new_eldritch_invocations = result.get('new_eldritch_invocations', [])
             # Save spellcasting ability if present
             self.spellcasting_ability = result.get('spellcasting_ability')
             # Save saving throw proficiencies if present
             self.saving_throw_proficiencies = result.get('saving_throws', [])
-            # Set spellcasting modifier if ability and scores are present
-            if self.spellcasting_ability and self.ability_scores and self.spellcasting_ability in self.ability_scores:
-                self.spellcasting_modifier = ability_modifier(self.ability_scores[self.spellcasting_ability])
-            else:
-                self.spellcasting_modifier = None
-            # Set spell save DC if spellcasting modifier is available
-            if self.spellcasting_modifier is not None:
-                self.spell_save_dc = 8 + self.spellcasting_modifier + self.proficiency_bonus
-            else:
-                self.spell_save_dc = None
             # Add chosen class skills to self.skills, avoiding duplicates
             for skill in result['chosen_skills']:
                 if skill not in self.skills:
@@ -532,7 +631,7 @@ class charGen:
                         parsed = parse_feat(feat)
                         if parsed:
                             if isinstance(parsed, dict):
-                                self.feats.append(parsed)
+                                self.feats.append({'feat': feat, **parsed})
                             elif isinstance(parsed, str):
                                 self.feats.append({'feat': parsed})
             # If extra cantrips were granted (e.g. Thaumaturge), add them to known_spells
@@ -562,22 +661,14 @@ class charGen:
                     self.known_spells[level_key][spell_name] = spell_data
             # Store class feature-granted spells
             self.class_feature_spells = result.get('class_feature_spells', {})
-            # Calculate HP after class and ability scores are set
-            # Extract hit die as int (e.g., from 'd12' to 12)
+            # Hit points come from the hit die (e.g. 'd12' -> 12), taken at its maximum for every level
             hit_die_val = None
             if self.class_hit_die:
                 try:
-                    hit_die_val = int(self.class_hit_die.lstrip('dD'))
+                    hit_die_val = int(str(self.class_hit_die).lstrip('dD'))
                 except Exception:
                     hit_die_val = None
-            con_mod = getattr(self, 'con_mod', 0)
-            self.hp = calc_hp(hit_die_val, con_mod, self.level) if hit_die_val else None
-            if 'Tough' in self.feats:
-                # If the Tough feat is present, increase HP by 2 per level'
-                self.hp = calc_hp(hit_die_val, con_mod, self.level, tough=True) if hit_die_val else None
-            print(f"Class selected: {self.class_name}")
-        else:
-            print("No class selected.")
+            self.hit_point_dice = [hit_die_val] * self.level if hit_die_val else []
     
     def choose_species(self):
         """
@@ -585,6 +676,16 @@ class charGen:
         Saves the species and its traits to the character instance.
         """
         result = species_select_main()
+        if result and isinstance(result, dict):
+            self.apply_species(result)
+        else:
+            print("No species selected.")
+
+    def apply_species(self, result: dict, skill_choices: dict = None) -> None:
+        """
+        Save the result of species selection (or build_species) to the character instance.
+        skill_choices (e.g. {'Keen Senses': 'Perception'}) answers skill-granting traits instead of prompting.
+        """
         if result and isinstance(result, dict):
             self.species = result.get('species', '')
             self.species_traits = result.get('species_traits', {})
@@ -598,7 +699,7 @@ class charGen:
             else:
                 self.skills = []
                 skills_before = set()
-            updated_skills = handle_special_skill_traits(self.species_traits, self.skills)
+            updated_skills = handle_special_skill_traits(self.species_traits, self.skills, skill_choices)
             # If a skill was added, update the trait name to include the skill
             keen_skills = ["Insight", "Perception", "Survival"]
             if "Keen Senses" in self.species_traits:
@@ -616,42 +717,29 @@ class charGen:
                         self.species_traits[idx] = f"Skillful - {skill}"
                         break
             self.skills = updated_skills
-        else:
-            print("No species selected.")
     
     def determine_ability_scores(self):
         """
         Roll ability scores using the standard method and save them to the character instance.
         """
         if self.ability_scores is None:
-            self.ability_scores = interactive_ability_assignment()
+            self.ability_scores = interactive_ability_assignment(self.rng)
         else:
             print(self.ability_scores)
 
     def calculate_ability_modifiers(self):
         """
-        Calculates and stores ability modifiers as attributes based on self.ability_scores.
+        Recalculate the ability modifiers (str_mod, ..., cha_mod) and everything derived from them on next read.
+        Changes to self.ability_scores are tracked, so this is only needed after changing them in an untracked way.
         """
-        abilities = self.ability_scores or {}
-        self.str_mod = ability_modifier(abilities.get('Strength', 0))
-        self.dex_mod = ability_modifier(abilities.get('Dexterity', 0))
-        self.con_mod = ability_modifier(abilities.get('Constitution', 0))
-        self.int_mod = ability_modifier(abilities.get('Intelligence', 0))
-        self.wis_mod = ability_modifier(abilities.get('Wisdom', 0))
-        self.cha_mod = ability_modifier(abilities.get('Charisma', 0))
+        self.invalidate('ability_scores')
 
     def calculate_skills(self):
         """
-        Determine skills for the character based on class and background.
-        Calculates skill values using ability scores and proficiency bonus.
+        Recalculate the skill scores from the ability scores, proficiency bonus, and proficient skills on next read.
+        Changes to those are tracked, so this is only needed after changing them in an untracked way.
         """
-        if not hasattr(self, 'skills'):
-            self.skills = []
-        self.skill_scores = calculate_skill_scores(
-            self.ability_scores or {},
-            self.proficiency_bonus,
-            self.skills
-        )
+        self.invalidate('ability_scores', 'skills')
 
 if __name__ == "__main__":
     # Simulate a level 2 Warlock
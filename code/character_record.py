@@ -0,0 +1,316 @@
+"""
+character_record.py
+-------------------
+Compact character records for holding very large rosters in memory.
+
+A CharacterRecord stores a charGen in a fixed set of __slots__:
+    - names and other text fields as interned strings
+    - ability scores and hit dice packed into bytes
+    - feats, known spells, and inventory items as integer IDs into shared catalogs, packed into bytes
+    - proficient skills as a tuple of interned strings
+    - every other list or dict (class features, traits, proficiencies, background details, ...) as the ID of a
+      shared, deduplicated copy, so characters with the same features or background share one copy
+
+Conversion is lossless: CharacterRecord.from_character(character).to_character() has the same attributes as
+character, apart from its random number stream (pass rng to to_character()) and derived values, which are
+recomputed when read. Catalog IDs are only meaningful within the process that assigned them.
+
+Functions:
+    to_records(characters): Returns a list of CharacterRecords for the characters.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+
+from character_creation import charGen
+from equipment.inventory import Inventory
+from misc.stats import ABILITY_NAMES
+
+
+class SharedCatalog:
+    """
+    Append-only table of shared values, each with a small integer ID (its index in the table) and the key it
+    was added under.
+    """
+
+    __slots__ = ('name', '_ids', '_keys', '_values')
+
+    def __init__(self, name: str):
+        self.name = name
+        self._ids = {}
+        self._keys = []
+        self._values = []
+
+    def add(self, key, value=None) -> int:
+        """
+        Return the ID of key, adding value (or key itself) under a new ID the first time key is seen.
+
+        Raises:
+            ValueError: If key is already in the catalog with a different value.
+        """
+        item_id = self._ids.get(key)
+        if item_id is None:
+            item_id = self._ids[key] = len(self._values)
+            self._keys.append(key)
+            self._values.append(key if value is None else value)
+        elif value is not None:
+            stored = self._values[item_id]
+            if stored is not value and stored != value:
+                raise ValueError(f"{self.name} catalog already has a different value for {key!r}")
+        return item_id
+
+    def key(self, item_id: int):
+        """Return the key an ID was added under."""
+        return self._keys[item_id]
+
+    def __getitem__(self, item_id: int):
+        return self._values[item_id]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"SharedCatalog({self.name!r}, {len(self._values)} entries)"
+
+
+# (spell level key, spell name) -> spell data, shared with the spell catalog; (level key, None) marks a level
+# with no spells
+SPELL_IDS = SharedCatalog('spell')
+# Frozen feat dicts
+FEAT_IDS = SharedCatalog('feat')
+# Item and container names
+ITEM_IDS = SharedCatalog('item')
+# Frozen copies of every other list and dict
+SHARED_VALUES = SharedCatalog('value')
+
+# Tags for frozen containers (frozen values are hashable, so equal values share one catalog entry)
+_DICT, _LIST, _TUPLE, _SET, _FROZENSET, _INVENTORY, _BOOL, _FLOAT = (
+    'dict', 'list', 'tuple', 'set', 'frozenset', 'Inventory', 'bool', 'float')
+
+
+def _freeze(value):
+    """Return a hashable copy of a value made of dicts, lists, tuples, sets, Inventories, and scalars."""
+    if value is None or type(value) is str or type(value) is int:
+        return value
+    if isinstance(value, dict):
+        return _DICT, tuple((_freeze(key), _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _LIST, tuple(_freeze(item) for item in value)
+    if isinstance(value, tuple):
+        return _TUPLE, tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return _SET if isinstance(value, set) else _FROZENSET, frozenset(_freeze(item) for item in value)
+    if isinstance(value, Inventory):
+        return _INVENTORY, tuple(
+            (entry.item_id, entry.quantity, entry.equipped, entry.container) for entry in value)
+    # bool and float are tagged so they don't compare equal to (and share an entry with) equal ints
+    if isinstance(value, bool):
+        return _BOOL, value
+    if isinstance(value, float):
+        return _FLOAT, value
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, int):
+        return int(value)
+    raise TypeError(f"Can't store a {type(value).__name__} in a CharacterRecord")
+
+
+def _thaw(frozen):
+    """Return a new mutable value from a _freeze() result."""
+    if type(frozen) is not tuple:
+        return frozen
+    tag, data = frozen
+    if tag == _DICT:
+        return {_thaw(key): _thaw(item) for key, item in data}
+    if tag == _LIST:
+        return [_thaw(item) for item in data]
+    if tag == _TUPLE:
+        return tuple(_thaw(item) for item in data)
+    if tag == _SET:
+        return {_thaw(item) for item in data}
+    if tag == _FROZENSET:
+        return frozenset(_thaw(item) for item in data)
+    if tag == _INVENTORY:
+        return Inventory(data)
+    return data
+
+
+def _share(value):
+    """Return the SHARED_VALUES ID of a value."""
+    return SHARED_VALUES.add(_freeze(value))
+
+
+def _pack_scores(values):
+    """Return the values as bytes if they are all ints from 0 to 255, else None."""
+    if all(type(value) is int and 0 <= value <= 255 for value in values):
+        return bytes(values)
+    return None
+
+
+def _pack_inventory(inventory):
+    """Return (item ID, quantity, equipped, container ID or -1) for each entry, packed as C ints."""
+    packed = array('i')
+    for entry in inventory:
+        container = -1 if entry.container is None else ITEM_IDS.add(entry.container)
+        packed.extend((ITEM_IDS.add(entry.item_id), entry.quantity, entry.equipped, container))
+    return packed.tobytes()
+
+
+def _unpack_inventory(packed):
+    inventory = Inventory()
+    values = memoryview(packed).cast('i')
+    for index in range(0, len(values), 4):
+        item_id, quantity, equipped, container = values[index:index + 4]
+        inventory.add(ITEM_IDS[item_id], quantity, bool(equipped), None if container < 0 else ITEM_IDS[container])
+    return inventory
+
+
+def _pack_spells(known_spells):
+    """Return the SPELL_IDS of a known_spells dict ({level key: {spell name: spell data}}), packed as C ints."""
+    packed = array('I')
+    for level_key, spells in known_spells.items():
+        if not spells:
+            packed.append(SPELL_IDS.add((level_key, None), False))
+        for spell_name, spell_data in spells.items():
+            packed.append(SPELL_IDS.add((level_key, spell_name), spell_data))
+    return packed.tobytes()
+
+
+def _unpack_spells(packed):
+    known_spells = {}
+    for spell_id in memoryview(packed).cast('I'):
+        level_key, spell_name = SPELL_IDS.key(spell_id)
+        spells = known_spells.setdefault(level_key, {})
+        if spell_name is not None:
+            spells[spell_name] = SPELL_IDS[spell_id]
+    return known_spells
+
+
+# Text fields, stored as interned strings
+_STRING_FIELDS = ('name', 'species', 'class_name', 'background', 'alignment', 'player_name', 'gender',
+                  'class_hit_die', 'spellcasting_ability')
+# Numeric fields, stored as they are
+_NUMBER_FIELDS = ('level', 'experience_points', 'age', 'proficiency_bonus',
+                  'gold_pieces', 'silver_pieces', 'copper_pieces')
+# Lists and dicts, stored as SHARED_VALUES IDs (None for attributes the character doesn't have)
+_SHARED_FIELDS = ('proficiencies', 'classes', 'subclasses', 'spell_slots', 'pact_slots',
+                  'background_details', 'species_traits', 'class_features', 'class_special_choices',
+                  'class_feature_spells', 'new_eldritch_invocations', 'saving_throw_proficiencies',
+                  'class_resources')
+# Fields packed into bytes or tuples
+_PACKED_FIELDS = ('skills', 'ability_scores', 'hit_point_dice', 'feats', 'known_spells', 'equipment', 'inventory')
+# Attributes not stored at all: the random number stream
+_SKIPPED = frozenset({'rng'})
+_KNOWN_FIELDS = frozenset(_STRING_FIELDS + _NUMBER_FIELDS + _SHARED_FIELDS + _PACKED_FIELDS) | _SKIPPED
+
+
+class CharacterRecord:
+    """
+    A charGen stored compactly (see the module docstring). Records are meant to be kept and converted back,
+    not changed; convert to a charGen to edit a character.
+
+    Attributes:
+        ability_scores (bytes, int, or None): The six scores in ABILITY_NAMES order, or the SHARED_VALUES ID of
+            ability scores that don't fit that layout.
+        hit_point_dice (bytes or int): Each level's hit die value, or a SHARED_VALUES ID if any is over 255.
+        skills (tuple): The proficient skills.
+        feats (bytes): FEAT_IDS of the feats, in order, as C unsigned ints.
+        known_spells (bytes or None): SPELL_IDS of the known spells, grouped by level, as C unsigned ints.
+        equipment (bytes), inventory (bytes): (ITEM_IDS item, quantity, equipped, ITEM_IDS container or -1)
+            for each entry, as C ints.
+        extras (int or None): SHARED_VALUES ID of a dict of any other attributes the character has.
+    """
+
+    __slots__ = _STRING_FIELDS + _NUMBER_FIELDS + _SHARED_FIELDS + _PACKED_FIELDS + ('extras',)
+
+    @classmethod
+    def from_character(cls, character: charGen) -> CharacterRecord:
+        """
+        Return the record of a character.
+
+        Raises:
+            TypeError: If the character has an attribute value that can't be stored (e.g. an object other than
+                a dict, list, tuple, set, Inventory, or scalar).
+            ValueError: If a known spell's data differs from the data recorded for that spell earlier.
+        """
+        attributes = vars(character)
+        record = cls.__new__(cls)
+        for field in _STRING_FIELDS:
+            value = attributes.get(field)
+            setattr(record, field, sys.intern(value) if type(value) is str else value)
+        for field in _NUMBER_FIELDS:
+            setattr(record, field, attributes.get(field))
+        for field in _SHARED_FIELDS:
+            value = attributes.get(field)
+            setattr(record, field, None if value is None else _share(value))
+
+        scores = attributes.get('ability_scores')
+        packed = None
+        if scores is not None and list(scores) == ABILITY_NAMES:
+            packed = _pack_scores(scores.values())
+        record.ability_scores = packed if packed is not None or scores is None else _share(scores)
+        dice = attributes.get('hit_point_dice', [])
+        packed = _pack_scores(dice)
+        record.hit_point_dice = packed if packed is not None else _share(dice)
+        record.skills = tuple(sys.intern(skill) for skill in attributes.get('skills', ()))
+        record.feats = array('I', (FEAT_IDS.add(_freeze(feat)) for feat in attributes.get('feats', ()))).tobytes()
+        known_spells = attributes.get('known_spells')
+        record.known_spells = None if known_spells is None else _pack_spells(known_spells)
+        record.equipment = _pack_inventory(attributes.get('equipment', ()))
+        record.inventory = _pack_inventory(attributes.get('inventory', ()))
+
+        derived_names = getattr(type(character), '_derived_names', frozenset())
+        extras = {name: value for name, value in attributes.items()
+                  if name not in _KNOWN_FIELDS and name not in derived_names}
+        record.extras = _share(extras) if extras else None
+        return record
+
+    def to_character(self, rng=None) -> charGen:
+        """
+        Return a new charGen with the record's attributes.
+
+        Args:
+            rng (random.Random, optional): Random number stream for the character. Defaults to None.
+        """
+        character = charGen(level=self.level, rng=rng)
+        for field in _STRING_FIELDS + _NUMBER_FIELDS:
+            setattr(character, field, getattr(self, field))
+        for field in _SHARED_FIELDS:
+            item_id = getattr(self, field)
+            if item_id is not None:
+                setattr(character, field, _thaw(SHARED_VALUES[item_id]))
+
+        scores = self.ability_scores
+        if type(scores) is bytes:
+            character.ability_scores = dict(zip(ABILITY_NAMES, scores))
+        elif scores is not None:
+            character.ability_scores = _thaw(SHARED_VALUES[scores])
+        dice = self.hit_point_dice
+        character.hit_point_dice = list(dice) if type(dice) is bytes else _thaw(SHARED_VALUES[dice])
+        character.skills = list(self.skills)
+        character.feats = [_thaw(FEAT_IDS[feat_id]) for feat_id in memoryview(self.feats).cast('I')]
+        if self.known_spells is not None:
+            character.known_spells = _unpack_spells(self.known_spells)
+        character.equipment = _unpack_inventory(self.equipment)
+        character.inventory = _unpack_inventory(self.inventory)
+        if self.extras is not None:
+            for name, value in _thaw(SHARED_VALUES[self.extras]).items():
+                setattr(character, name, value)
+        return character
+
+    def __eq__(self, other):
+        if isinstance(other, CharacterRecord):
+            return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CharacterRecord({self.name!r}, {self.species!r}, {self.class_name!r}, level {self.level})"
+
+
+def to_records(characters) -> list:
+    """Return a list of CharacterRecords for an iterable of characters."""
+    return [CharacterRecord.from_character(character) for character in characters]
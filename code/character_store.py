@@ -0,0 +1,478 @@
+"""
+character_store.py
+------------------
+SQLite persistence for characters.
+
+CharacterStore saves charGen objects to a local SQLite database and loads them back unchanged (apart from the
+random number stream, which is passed to load()). The database runs in WAL mode, so readers don't block the
+writer, and every statement is a fixed parameterized query that sqlite3 prepares once per connection. Batches are
+written with executemany in one transaction. Attributes without a column or table of their own are stored
+pickled, so only open databases from a trusted source.
+
+Schema:
+    characters           id, name, player_name, class_name, species, background, level (each indexed except
+                         background), and data: the remaining attributes, pickled (background details as
+                         the build_background() choices they're rebuilt from, where possible)
+    spells, feats, items id, name: one row per distinct spell, feat, or item
+    character_spells     (character_id, position) -> level key, spell_id, and data if it differs from the catalog
+    character_feats      (character_id, position) -> feat_id, and data if it differs from ORIGIN_FEATS
+    character_items      (character_id, position) -> equipment or inventory, item_id, quantity, equipped, container
+
+Functions:
+    prompt_load_character(path=DEFAULT_DB_PATH): Prompts for a saved character and prints its sheet.
+"""
+
+from __future__ import annotations
+
+import pickle
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+
+from character_creation import charGen
+from misc.backgrounds import BACKGROUND_DICT, build_background
+from misc.feats import ORIGIN_FEATS
+from spells.spells_utils import get_spell_dicts
+
+DEFAULT_DB_PATH = Path("characters.db")
+DEFAULT_BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    species TEXT NOT NULL,
+    background TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS characters_name ON characters (name);
+CREATE INDEX IF NOT EXISTS characters_player_name ON characters (player_name);
+CREATE INDEX IF NOT EXISTS characters_class_name ON characters (class_name, level);
+CREATE INDEX IF NOT EXISTS characters_species ON characters (species);
+CREATE INDEX IF NOT EXISTS characters_level ON characters (level);
+
+CREATE TABLE IF NOT EXISTS spells (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS feats (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+
+CREATE TABLE IF NOT EXISTS character_spells (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    level_key TEXT NOT NULL,
+    spell_id INTEGER REFERENCES spells (id),
+    data BLOB,
+    PRIMARY KEY (character_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS character_spells_spell ON character_spells (spell_id);
+
+CREATE TABLE IF NOT EXISTS character_feats (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    feat_id INTEGER REFERENCES feats (id),
+    data BLOB,
+    PRIMARY KEY (character_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS character_feats_feat ON character_feats (feat_id);
+
+CREATE TABLE IF NOT EXISTS character_items (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    location TEXT NOT NULL,
+    item_id INTEGER NOT NULL REFERENCES items (id),
+    quantity INTEGER NOT NULL,
+    equipped INTEGER NOT NULL,
+    container TEXT,
+    PRIMARY KEY (character_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS character_items_item ON character_items (item_id);
+"""
+
+# Columns of the characters table that can be searched with find() and count()
+SEARCH_COLUMNS = ('name', 'player_name', 'class_name', 'species', 'background', 'level')
+# Attributes stored in their own columns or tables rather than in the data blob
+_STORED_APART = frozenset(SEARCH_COLUMNS) | {'feats', 'known_spells', 'equipment', 'inventory', 'rng'}
+_LOOKUP_TABLES = ('spells', 'feats', 'items')
+# Key in the data blob replacing background_details that build_background() rebuilds exactly
+_BACKGROUND_CHOICES = '__background_choices__'
+
+_INSERT_CHARACTER = ("INSERT INTO characters (id, name, player_name, class_name, species, background, "
+                     "level, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+_INSERT_SPELL = ("INSERT INTO character_spells (character_id, position, level_key, spell_id, data) "
+                 "VALUES (?, ?, ?, ?, ?)")
+_INSERT_FEAT = "INSERT INTO character_feats (character_id, position, feat_id, data) VALUES (?, ?, ?, ?)"
+_INSERT_ITEM = ("INSERT INTO character_items (character_id, position, location, item_id, quantity, equipped, "
+                "container) VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+def _dumps(value):
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _loads(data):
+    return pickle.loads(data)
+
+
+@lru_cache(maxsize=None)
+def _built_background(name, increases, option):
+    """Return build_background()'s details for these choices, and the details pickled."""
+    details = build_background(name, None if increases is None else dict(increases), option)
+    return details, _dumps(details)
+
+
+def _background_choices(background, details):
+    """
+    Return the (name, ability increases, equipment option) that build_background() rebuilds details from, or None
+    if it doesn't rebuild them exactly.
+    """
+    if not isinstance(details, dict):
+        return None
+    name = background
+    equipment = details.get('Equipment') or []
+    try:
+        increases = details.get('Ability Score Increases')
+        option = equipment.index(details.get('Selected Equipment')) if equipment else 0
+        choices = (name, None if increases is None else tuple(increases.items()), option)
+        if name in BACKGROUND_DICT and _built_background(*choices)[0] == details:
+            return choices
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return None
+
+
+def _spell_level(level_key):
+    """Return the spell catalog level for a known_spells key ('Cantrips', '1', ...), or None."""
+    if level_key == 'Cantrips':
+        return 0
+    return int(level_key) if str(level_key).isdigit() else None
+
+
+class CharacterStore:
+    """
+    A SQLite database of characters.
+
+    Example:
+        with CharacterStore("characters.db") as store:
+            character_id = store.save(character)
+            same_character = store.load(character_id)
+            fighters = store.find(class_name='Fighter', level=5)
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        """
+        Open (creating if needed) a character database.
+
+        Args:
+            path (str or Path, optional): Database file, or ":memory:". Defaults to characters.db.
+        """
+        self.path = path
+        # Transactions are managed explicitly (BEGIN IMMEDIATE ... COMMIT) rather than by the sqlite3 module
+        self._connection = sqlite3.connect(str(path), isolation_level=None, cached_statements=64)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.execute("PRAGMA cache_size = -65536")
+        self._connection.executescript(_SCHEMA)
+        self._lookup_ids = {}
+        self._next_ids = {}
+        for table in _LOOKUP_TABLES:
+            self._load_lookup(table)
+
+    def _load_lookup(self, table):
+        ids = self._lookup_ids[table] = {name: table_id for table_id, name in
+                                         self._connection.execute(f"SELECT id, name FROM {table}")}
+        self._next_ids[table] = max(ids.values(), default=0) + 1
+
+    def _lookup_id(self, table, name, new_names):
+        """Return the ID of a spell, feat, or item name, reserving the next ID for names not yet stored."""
+        ids = self._lookup_ids[table]
+        table_id = ids.get(name)
+        if table_id is None:
+            table_id = ids[name] = self._next_ids[table]
+            self._next_ids[table] += 1
+            new_names[table].append((table_id, name))
+        return table_id
+
+    def save(self, character: charGen, character_id: int = None) -> int:
+        """
+        Save a character, replacing the one stored under character_id if given.
+
+        Returns:
+            int: The character's ID.
+        """
+        return self.save_many([character], None if character_id is None else [character_id])[0]
+
+    def save_many(self, characters, character_ids=None, batch_size: int = DEFAULT_BATCH_SIZE) -> list:
+        """
+        Save characters in batches, each written with executemany in one transaction.
+
+        Args:
+            characters (iterable): charGen objects.
+            character_ids (list, optional): IDs to save the characters under, replacing those characters.
+                Defaults to new IDs.
+            batch_size (int, optional): Characters per transaction.
+
+        Returns:
+            list: The characters' IDs, in order.
+        """
+        characters = list(characters)
+        saved_ids = []
+        for start in range(0, len(characters), batch_size):
+            batch = characters[start:start + batch_size]
+            ids = None if character_ids is None else list(character_ids[start:start + batch_size])
+            saved_ids.extend(self._save_batch(batch, ids))
+        return saved_ids
+
+    def _save_batch(self, characters, character_ids):
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Another connection may have added spells, feats, or items since they were last read
+            for table in _LOOKUP_TABLES:
+                if connection.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0] != self._next_ids[table]:
+                    self._load_lookup(table)
+            if character_ids is None:
+                first_id = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM characters").fetchone()[0]
+                character_ids = list(range(first_id, first_id + len(characters)))
+            else:
+                connection.executemany("DELETE FROM characters WHERE id = ?", ((i,) for i in character_ids))
+            rows, spell_rows, feat_rows, item_rows = [], [], [], []
+            new_names = {table: [] for table in _LOOKUP_TABLES}
+            for character_id, character in zip(character_ids, characters):
+                rows.append(self._character_row(character_id, character))
+                self._spell_rows(character_id, character, spell_rows, new_names)
+                self._feat_rows(character_id, character, feat_rows, new_names)
+                self._item_rows(character_id, character, item_rows, new_names)
+            for table, names in new_names.items():
+                connection.executemany(f"INSERT INTO {table} (id, name) VALUES (?, ?)", names)
+            connection.executemany(_INSERT_CHARACTER, rows)
+            connection.executemany(_INSERT_SPELL, spell_rows)
+            connection.executemany(_INSERT_FEAT, feat_rows)
+            connection.executemany(_INSERT_ITEM, item_rows)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            for table in _LOOKUP_TABLES:
+                self._load_lookup(table)
+            raise
+        return character_ids
+
+    @staticmethod
+    def _character_row(character_id, character):
+        attributes = vars(character)
+        derived_names = type(character)._derived_names
+        data = {name: value for name, value in attributes.items()
+                if name not in _STORED_APART and name not in derived_names}
+        known_spells = attributes.get('known_spells')
+        if known_spells is not None and not any(known_spells.values()):
+            # Known spells with no spells in them have no rows to be rebuilt from
+            data['known_spells'] = known_spells
+        choices = _background_choices(character.background, data.get('background_details'))
+        if choices is not None:
+            del data['background_details']
+            data[_BACKGROUND_CHOICES] = choices
+        return (character_id, character.name, character.player_name, character.class_name, character.species,
+                character.background, character.level, _dumps(data))
+
+    def _spell_rows(self, character_id, character, rows, new_names):
+        known_spells = getattr(character, 'known_spells', None)
+        if not known_spells or not any(known_spells.values()):
+            return
+        catalog = get_spell_dicts()
+        position = 0
+        for level_key, spells in known_spells.items():
+            if not spells:
+                rows.append((character_id, position, level_key, None, None))
+                position += 1
+            level_spells = catalog.get(_spell_level(level_key), {})
+            for spell_name, spell_data in spells.items():
+                stored = level_spells.get(spell_name)
+                data = None if stored is spell_data or stored == spell_data else _dumps(spell_data)
+                rows.append((character_id, position, level_key,
+                             self._lookup_id('spells', spell_name, new_names), data))
+                position += 1
+
+    def _feat_rows(self, character_id, character, rows, new_names):
+        for position, feat in enumerate(character.feats):
+            name = feat.get('feat') if isinstance(feat, dict) else None
+            if type(name) is not str:
+                rows.append((character_id, position, None, _dumps(feat)))
+                continue
+            details = {key: value for key, value in feat.items() if key != 'feat'}
+            data = None if ORIGIN_FEATS.get(name) == details else _dumps(details)
+            rows.append((character_id, position, self._lookup_id('feats', name, new_names), data))
+
+    def _item_rows(self, character_id, character, rows, new_names):
+        position = 0
+        for location in ('equipment', 'inventory'):
+            for entry in getattr(character, location):
+                rows.append((character_id, position, location, self._lookup_id('items', entry.item_id, new_names),
+                             entry.quantity, int(entry.equipped), entry.container))
+                position += 1
+
+    def load(self, character_id: int, rng=None) -> charGen:
+        """
+        Load a character.
+
+        Raises:
+            KeyError: If there is no character with that ID.
+        """
+        return self.load_many([character_id], rng)[0]
+
+    def load_many(self, character_ids, rng=None) -> list:
+        """
+        Load characters by ID, in the order given.
+
+        Args:
+            character_ids (iterable): Character IDs.
+            rng (random.Random, optional): Random number stream for the characters. Defaults to None.
+
+        Raises:
+            KeyError: If any ID is not in the store.
+        """
+        character_ids = list(character_ids)
+        names = {table: {table_id: name for name, table_id in ids.items()}
+                 for table, ids in self._lookup_ids.items()}
+        characters = {}
+        connection = self._connection
+        # Chunked to stay under SQLite's limit on query parameters
+        for start in range(0, len(character_ids), 500):
+            chunk = character_ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for character_id, name, player_name, class_name, species, background, level, data in connection.execute(
+                    f"SELECT id, name, player_name, class_name, species, background, level, data "
+                    f"FROM characters WHERE id IN ({marks})", chunk):
+                character = charGen(name=name, player_name=player_name, class_name=class_name, species=species,
+                                    background=background, level=level, rng=rng)
+                attributes = _loads(data)
+                choices = attributes.pop(_BACKGROUND_CHOICES, None)
+                if choices is not None:
+                    # A fresh copy of the rebuilt details, as each character has its own
+                    attributes['background_details'] = _loads(_built_background(*choices)[1])
+                for attribute, value in attributes.items():
+                    setattr(character, attribute, value)
+                character.feats = []
+                characters[character_id] = character
+            self._load_children(chunk, marks, characters, names)
+        missing = [character_id for character_id in character_ids if character_id not in characters]
+        if missing:
+            raise KeyError(missing[0])
+        return [characters[character_id] for character_id in character_ids]
+
+    def _load_children(self, chunk, marks, characters, names):
+        connection = self._connection
+        catalog = get_spell_dicts()
+        for character_id, level_key, spell_id, data in connection.execute(
+                f"SELECT character_id, level_key, spell_id, data FROM character_spells "
+                f"WHERE character_id IN ({marks}) ORDER BY character_id, position", chunk):
+            character = characters[character_id]
+            if not hasattr(character, 'known_spells'):
+                character.known_spells = {}
+            spells = character.known_spells.setdefault(level_key, {})
+            if spell_id is not None:
+                spell_name = self._name(names, 'spells', spell_id)
+                spells[spell_name] = (catalog[_spell_level(level_key)][spell_name] if data is None
+                                      else _loads(data))
+        for character_id, feat_id, data in connection.execute(
+                f"SELECT character_id, feat_id, data FROM character_feats "
+                f"WHERE character_id IN ({marks}) ORDER BY character_id, position", chunk):
+            if feat_id is None:
+                feat = _loads(data)
+            else:
+                name = self._name(names, 'feats', feat_id)
+                feat = {'feat': name, **(ORIGIN_FEATS[name] if data is None else _loads(data))}
+            characters[character_id].feats.append(feat)
+        for character_id, location, item_id, quantity, equipped, container in connection.execute(
+                f"SELECT character_id, location, item_id, quantity, equipped, container FROM character_items "
+                f"WHERE character_id IN ({marks}) ORDER BY character_id, position", chunk):
+            getattr(characters[character_id], location).add(
+                self._name(names, 'items', item_id), quantity, bool(equipped), container)
+
+    def _name(self, names, table, table_id):
+        """Return a spell, feat, or item name by ID, rereading the table if another connection added it."""
+        name = names[table].get(table_id)
+        if name is None:
+            self._load_lookup(table)
+            names[table] = {value: name for name, value in self._lookup_ids[table].items()}
+            name = names[table][table_id]
+        return name
+
+    def _where(self, criteria):
+        unknown = set(criteria) - set(SEARCH_COLUMNS)
+        if unknown:
+            raise KeyError(f"Can't search characters by {', '.join(sorted(unknown))}")
+        if not criteria:
+            return "", []
+        return " WHERE " + " AND ".join(f"{column} = ?" for column in criteria), list(criteria.values())
+
+    def find(self, limit: int = None, **criteria) -> list:
+        """
+        Return summaries of the characters matching every criterion (column=value for SEARCH_COLUMNS), in ID order.
+
+        Returns:
+            list: Dicts with 'id' and the SEARCH_COLUMNS.
+        """
+        where, parameters = self._where(criteria)
+        query = f"SELECT id, {', '.join(SEARCH_COLUMNS)} FROM characters{where} ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        columns = ('id',) + SEARCH_COLUMNS
+        return [dict(zip(columns, row)) for row in self._connection.execute(query, parameters)]
+
+    def count(self, **criteria) -> int:
+        """Return how many characters match every criterion (column=value for SEARCH_COLUMNS)."""
+        where, parameters = self._where(criteria)
+        return self._connection.execute(f"SELECT COUNT(*) FROM characters{where}", parameters).fetchone()[0]
+
+    def delete(self, character_id: int) -> None:
+        """Delete a character (and its spells, feats, and items)."""
+        self._connection.execute("DELETE FROM characters WHERE id = ?", (character_id,))
+
+    def __len__(self):
+        return self.count()
+
+    def __contains__(self, character_id):
+        return self._connection.execute("SELECT 1 FROM characters WHERE id = ?", (character_id,)).fetchone() is not None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def prompt_load_character(path=DEFAULT_DB_PATH):
+    """
+    Prompt for one of the characters saved in the database at path and print its character sheet.
+
+    Returns:
+        charGen or None: The loaded character, or None if there are no saved characters.
+    """
+    from InquirerPy import inquirer
+    # Opening a CharacterStore creates the database, so check first rather than leave an empty one behind
+    if not Path(path).exists():
+        print(f"No saved characters in {path}.")
+        return None
+    with CharacterStore(path) as store:
+        summaries = store.find()
+        if not summaries:
+            print(f"No saved characters in {path}.")
+            return None
+        character_id = inquirer.fuzzy(
+            message="Choose a character to load:",
+            choices=[{
+                "name": f"{row['name'] or '(unnamed)'} - {row['species']} {row['class_name']} {row['level']}"
+                        + (f" ({row['player_name']})" if row['player_name'] else ""),
+                "value": row['id'],
+            } for row in summaries],
+        ).execute()
+        character = store.load(character_id)
+    print(f"\nCharacter Sheet:\n{character}")
+    return character
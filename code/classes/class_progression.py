@@ -0,0 +1,107 @@
+"""
+Compiled class progression tables.
+A ClassProgression is built once from a class's *_LEVELS table and stores, for every level 1-20, the features
+gained at that level, the ordered features gained at or below it, each per-level resource (rages, sorcery points,
+invocations, ...), and the spellcasting row, in tuples indexed by level, so every level query is O(1).
+"""
+
+from functools import lru_cache
+
+MAX_LEVEL = 20
+
+
+class ClassProgression:
+    """
+    Per-level progression of one class.
+
+    Attributes:
+        class_name (str): The class name.
+        resource_names (tuple): Names of the per-level resources in the class table (e.g. 'rages_per_day').
+    """
+
+    def __init__(self, class_name, class_levels):
+        """
+        Compile a class's level table.
+
+        Args:
+            class_name (str): The class name.
+            class_levels (dict): {level: {'features': [...], 'spellcasting': {...}, <resource>: value, ...}}.
+        """
+        self.class_name = class_name
+        features_at = [()]
+        features_through = [()]
+        spellcasting = [None]
+        resources = {}
+        gained = []
+        seen = set()
+        for level in range(1, MAX_LEVEL + 1):
+            row = class_levels.get(level, {})
+            level_features = tuple(row.get('features', []))
+            features_at.append(level_features)
+            for feature in level_features:
+                if feature not in seen:
+                    seen.add(feature)
+                    gained.append((level, feature))
+            features_through.append(tuple(gained))
+            spellcasting.append(row.get('spellcasting'))
+            for key, value in row.items():
+                if key not in ('features', 'spellcasting'):
+                    resources.setdefault(key, [None] * level)
+            # Resources keep their last value on levels that don't list them
+            for key, values in resources.items():
+                values.append(row.get(key, values[-1]))
+        self._features_at = tuple(features_at)
+        self._features_through = tuple(features_through)
+        self._spellcasting = tuple(spellcasting)
+        self._resources = {key: tuple(values) for key, values in resources.items()}
+        self.resource_names = tuple(self._resources)
+
+    @staticmethod
+    def _check_level(level):
+        if not 1 <= level <= MAX_LEVEL:
+            raise ValueError(f"Level must be between 1 and {MAX_LEVEL}, got {level}")
+
+    def features_at(self, level):
+        """Return the features gained at a level, in table order."""
+        self._check_level(level)
+        return self._features_at[level]
+
+    def features_through(self, level=MAX_LEVEL):
+        """
+        Return (level, feature) pairs for every feature gained at or below a level, in the order first gained,
+        each feature listed once.
+        """
+        self._check_level(level)
+        return self._features_through[level]
+
+    def spellcasting(self, level):
+        """Return the spellcasting row for a level, or None if the class has no spellcasting at that level."""
+        self._check_level(level)
+        return self._spellcasting[level]
+
+    def resource(self, name, level, default=None):
+        """
+        Return a resource's value at a level (e.g. 'rages_per_day', 'sorcery_points', 'eldritch_invocations'),
+        or default if the class doesn't have it yet.
+        """
+        self._check_level(level)
+        values = self._resources.get(name)
+        value = None if values is None else values[level]
+        return default if value is None else value
+
+    def resources(self, level):
+        """Return {resource name: value} for every resource the class has at a level."""
+        self._check_level(level)
+        return {name: values[level] for name, values in self._resources.items() if values[level] is not None}
+
+
+@lru_cache(maxsize=None)
+def get_class_progression(class_name):
+    """
+    Return the compiled progression for a class in AVAILABLE_CLASSES, compiling it on first use.
+
+    Raises:
+        KeyError: If the class is unknown.
+    """
+    from .class_utils import AVAILABLE_CLASSES
+    return ClassProgression(class_name, AVAILABLE_CLASSES[class_name][1])
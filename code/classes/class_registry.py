@@ -0,0 +1,121 @@
+"""
+Lazy registry of the supported D&D classes.
+Knows each class's module and the names of its data constants, and imports a class module the first time that
+class's data is looked up, so listing or choosing classes does not load every class's data.
+"""
+
+import importlib
+from collections.abc import Mapping
+
+# Class name -> (module, constant prefix, {subclass name: constant name})
+# A class module defines <PREFIX>_CLASS, <PREFIX>_LEVELS, and <PREFIX>_FEATURES.
+CLASS_MODULES = {
+    'Barbarian': ('barbarian', 'BARBARIAN', {
+        'Path of the Berserker': 'PATH_OF_THE_BERSERKER',
+        'Path of the Wild Heart': 'PATH_OF_THE_WILD_HEART',
+        'Path of the World Tree': 'PATH_OF_THE_WORLD_TREE',
+        'Path of the Zealot': 'PATH_OF_THE_ZEALOT',
+    }),
+    'Bard': ('bard', 'BARD', {
+        'College of Dance': 'COLLEGE_OF_DANCE',
+        'College of Glamour': 'COLLEGE_OF_GLAMOUR',
+        'College of Lore': 'COLLEGE_OF_LORE',
+        'College of Valor': 'COLLEGE_OF_VALOR',
+    }),
+    'Cleric': ('cleric', 'CLERIC', {
+        'Life Domain': 'LIFE_DOMAIN',
+        'Light Domain': 'LIGHT_DOMAIN',
+        'War Domain': 'WAR_DOMAIN',
+    }),
+    'Druid': ('druid', 'DRUID', {
+        'Circle of the Land': 'CIRCLE_OF_THE_LAND',
+        'Circle of the Moon': 'CIRCLE_OF_THE_MOON',
+        'Circle of the Sea': 'CIRCLE_OF_THE_SEA',
+        'Circle of the Stars': 'CIRCLE_OF_THE_STARS',
+    }),
+    'Fighter': ('fighter', 'FIGHTER', {
+        'Battle Master': 'BATTLE_MASTER',
+        'Champion': 'CHAMPION',
+        'Eldritch Knight': 'ELDRITCH_KNIGHT',
+        'Psi Warrior': 'PSI_WARRIOR',
+    }),
+    'Monk': ('monk', 'MONK', {
+        'Warrior of Mercy': 'WARRIOR_OF_MERCY',
+        'Way of Shadow': 'WAY_OF_SHADOW',
+        'Way of the Elements': 'WAY_OF_THE_ELEMENTS',
+        'Way of the Open Hand': 'WAY_OF_THE_OPEN_HAND',
+    }),
+    'Paladin': ('paladin', 'PALADIN', {
+        'Oath of Devotion': 'OATH_OF_DEVOTION',
+        'Oath of the Ancients': 'OATH_OF_THE_ANCIENTS',
+        'Oath of Vengeance': 'OATH_OF_VENGEANCE',
+    }),
+    'Ranger': ('ranger', 'RANGER', {
+        'Beast Master': 'BEAST_MASTER',
+        'Fey Wanderer': 'FEY_WANDERER',
+        'Gloom Stalker': 'GLOOM_STALKER',
+        'Hunter': 'HUNTER',
+    }),
+    'Rogue': ('rogue', 'ROGUE', {
+        'Arcane Trickster': 'ARCANE_TRICKSTER',
+        'Assassin': 'ASSASSIN',
+        'Soulknife': 'SOULKNIFE',
+        'Thief': 'THIEF',
+    }),
+    'Sorcerer': ('sorcerer', 'SORCERER', {
+        'Aberrant Sorcery': 'ABERRANT_SORCERY',
+        'Clockwork Sorcery': 'CLOCKWORK_SORCERY',
+        'Draconic Sorcery': 'DRACONIC_SORCERY',
+        'Wild Magic Sorcery': 'WILD_MAGIC_SORCERY',
+    }),
+    'Warlock': ('warlock', 'WARLOCK', {
+        'Archfey Patron': 'ARCHFEY_PATRON',
+        'Celestial Patron': 'CELESTIAL_PATRON',
+        'Fiend Patron': 'FIEND_PATRON',
+        'Great Old One Patron': 'GREAT_OLD_ONE_PATRON',
+    }),
+}
+
+
+class LazyClassRegistry(Mapping):
+    """
+    Read-only {class_name: (class_data, class_levels, class_features, subclass_dicts)} mapping that imports
+    each class module the first time that class is accessed.
+    Iterating over the class names or checking membership does not load anything.
+    """
+
+    def __init__(self, class_modules):
+        self._class_modules = class_modules
+        self._loaded = {}
+
+    def __getitem__(self, class_name):
+        entry = self._loaded.get(class_name)
+        if entry is None:
+            if class_name not in self._class_modules:
+                raise KeyError(class_name)
+            module_name, prefix, subclasses = self._class_modules[class_name]
+            module = importlib.import_module(f".{module_name}", __package__)
+            entry = self._loaded[class_name] = (
+                getattr(module, f"{prefix}_CLASS"),
+                getattr(module, f"{prefix}_LEVELS"),
+                getattr(module, f"{prefix}_FEATURES"),
+                {name: getattr(module, constant) for name, constant in subclasses.items()},
+            )
+        return entry
+
+    def __iter__(self):
+        return iter(self._class_modules)
+
+    def __len__(self):
+        return len(self._class_modules)
+
+    def __contains__(self, class_name):
+        return class_name in self._class_modules
+
+    def loaded_classes(self):
+        """Return the classes that have been loaded so far."""
+        return sorted(self._loaded)
+
+    def subclass_names(self, class_name):
+        """Return a class's subclass names without loading the class."""
+        return list(self._class_modules[class_name][2])
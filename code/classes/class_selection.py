@@ -18,6 +18,7 @@ import re
 from InquirerPy import inquirer
 
 # Local imports
+from .class_progression import MAX_LEVEL, get_class_progression
 from .class_utils import (
     AVAILABLE_CLASSES,
     browse_class_features_prompt,
@@ -83,7 +84,7 @@ def select_class(current_level=1, already_proficient=None, known_spells=None, kn
         dict: A dictionary containing the following keys:
             - 'class_name': Name of the chosen class.
             - 'chosen_skills': List of chosen skill proficiencies.
-            - 'class_features': List of class features at the current level.
+            - 'class_features': List of class features gained at or below the current level.
             - 'equipment': List of equipped items.
             - 'inventory': List of other items.
             - 'gold_pieces': Number of gold pieces.
@@ -91,16 +92,61 @@ def select_class(current_level=1, already_proficient=None, known_spells=None, kn
             - 'copper_pieces': Number of copper pieces.
             - 'new_spells': List of (spell_level, spell_name, spell_data) tuples for all newly learned spells.
     """
+    class_name = choose_class(AVAILABLE_CLASSES)[0]
+    return setup_class(class_name, current_level, already_proficient, known_spells, known_invocations, character)
+
+def build_class(class_name, choices, current_level=1, already_proficient=None, known_spells=None, known_invocations=None, character=None):
+    """
+    Non-interactive counterpart of select_class: sets up a class from a dictionary of choices without prompting.
+
+    Args:
+        class_name (str): Key into AVAILABLE_CLASSES.
+        choices (dict): The class choices. Supported keys:
+            - 'skills': List of chosen skill proficiencies (required unless the choice is automatic).
+            - 'equipment_option': Index of the starting equipment option (default 0).
+            - 'spells': Dict of {spell_level: [spell_name, ...]} to learn (0 for cantrips).
+            - 'invocations': List of Eldritch Invocations to learn, in order.
+            - 'weapon_mastery', 'divine_order', 'primal_order', 'extra_cantrip', 'fighting_style', 'subclass': Feature choices.
+        current_level, already_proficient, known_spells, known_invocations, character: As for select_class.
+
+    Returns:
+        dict: The same dictionary select_class returns.
+
+    Raises:
+        ValueError: If the class is unknown or any choice is not legal for it.
+    """
+    if class_name not in AVAILABLE_CLASSES:
+        raise ValueError(f"Unknown class: {class_name}")
+    return setup_class(class_name, current_level, already_proficient, known_spells, known_invocations, character, choices=choices)
+
+def setup_class(class_name, current_level=1, already_proficient=None, known_spells=None, known_invocations=None, character=None, choices=None):
+    """
+    Sets up the chosen class: skills, equipment, features, spells, and invocations.
+    Prompts for each decision, unless choices is a dict (see build_class), in which case nothing is prompted.
+
+    Returns:
+        dict: See select_class.
+    """
     if already_proficient is None:
         already_proficient = []
     if known_spells is None:
         known_spells = {}
     if known_invocations is None:
         known_invocations = {}
-    class_name, class_data, class_levels, class_hit_die = choose_class(AVAILABLE_CLASSES)
-    chosen_skills = choose_proficiencies(class_data, already_proficient)
-    equipment, inventory, gold_pieces, silver_pieces, copper_pieces = organize_equipment(class_data)
-    class_features = class_levels[current_level].get('features', [])
+    class_data, _, class_features_dict, _ = AVAILABLE_CLASSES[class_name]
+    class_hit_die = class_data.get('hit_die', None)
+    if class_hit_die is not None:
+        class_hit_die = f"d{class_hit_die}"
+    if choices is None:
+        chosen_skills = choose_proficiencies(class_data, already_proficient)
+        equipment_option = None
+    else:
+        chosen_skills = choose_proficiencies(class_data, already_proficient, chosen_skills=choices.get('skills', []))
+        equipment_option = choices.get('equipment_option', 0)
+    equipment, inventory, gold_pieces, silver_pieces, copper_pieces = organize_equipment(class_data, equipment_option)
+    progression = get_class_progression(class_name)
+    # A character created above level 1 has every feature up to its level
+    class_features = [feature for _, feature in progression.features_through(current_level)]
     new_spells = []
     extra_choices = {}
     spellcasting_ability = None
@@ -121,14 +167,14 @@ def select_class(current_level=1, already_proficient=None, known_spells=None, kn
     class_feature_spells = handle_class_feature_spells(class_name, class_data, class_features)
 
     # Spellcasting feature spell learning
-    if current_level in class_levels:
-        spellcasting = class_levels[current_level].get('spellcasting')
+    if 1 <= current_level <= MAX_LEVEL:
+        spellcasting = progression.spellcasting(current_level)
         # Handle all class-specific feature choices in class_utils
-        extra_choices = handle_class_feature_choices(class_name, class_data, class_features, known_spells, character=character)
+        extra_choices = handle_class_feature_choices(class_name, class_data, class_features, known_spells, character=character,
+                                                     choices=choices, current_level=current_level)
         if spellcasting:
             # Try to extract spellcasting ability from the Spellcasting feature description
-            features_dict = AVAILABLE_CLASSES[class_name][2]
-            spellcasting_desc = features_dict.get('Spellcasting')
+            spellcasting_desc = class_features_dict.get('Spellcasting')
             # Ensure spellcasting_desc is a string for regex
             if isinstance(spellcasting_desc, (set, list)):
                 spellcasting_desc = next((s for s in spellcasting_desc if isinstance(s, str)), None)
@@ -137,11 +183,12 @@ def select_class(current_level=1, already_proficient=None, known_spells=None, kn
                 if match:
                     spellcasting_ability = match.group(1)
             # Use known_spells only
-            new_spells = learn_spell(class_name, spellcasting, known_spells, class_feature_spells)
+            chosen_spells = None if choices is None else choices.get('spells', {})
+            new_spells = learn_spell(class_name, spellcasting, known_spells, class_feature_spells, chosen_spells=chosen_spells)
     
     # Eldritch invocation
-    if current_level in class_levels:
-        eldritch_invocations = class_levels[current_level].get('eldritch_invocations', 0)
+    if 1 <= current_level <= MAX_LEVEL:
+        eldritch_invocations = progression.resource('eldritch_invocations', current_level, 0)
         if eldritch_invocations > 0:
             # Gather known cantrips for prerequisite checking
             cantrips = set()
@@ -153,7 +200,8 @@ def select_class(current_level=1, already_proficient=None, known_spells=None, kn
                 eldritch_invocations,
                 known_invocations_set,
                 character_level=current_level,
-                known_cantrips=cantrips
+                known_cantrips=cantrips,
+                chosen_invocations=None if choices is None else choices.get('invocations', [])
             )
     
     return {
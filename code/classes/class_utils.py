@@ -3,6 +3,9 @@ Class utilities for the D&D character creator.
 Handles class-specific feature choices, class and subclass browsing UI, table display utilities, and integration with spell, feat, and equipment logic.
 """
 
+# Standard library imports
+from functools import lru_cache
+
 # 3rd-party imports
 from InquirerPy import inquirer
 from prettytable import PrettyTable, ALL
@@ -10,144 +13,74 @@ from prettytable import PrettyTable, ALL
 # Local imports
 from misc.feats_utils import add_feat
 from misc.feats import FIGHTING_STYLE_FEATS
-from misc.invocations import ELDRITCH_INVOCATIONS, choose_invocation, add_invocation
+from misc.invocations import ELDRITCH_INVOCATIONS, choose_invocation, add_invocation, invocation_prereqs_met
+from misc.alias_sampler import AliasSampler
 from equipment.weapons_dict import SIMPLE_WEAPONS_DICT, MARTIAL_WEAPONS_DICT
-from spells.spells import add_class_spell
-from .barbarian import (
-    BARBARIAN_CLASS, BARBARIAN_LEVELS, BARBARIAN_FEATURES,
-    PATH_OF_THE_BERSERKER, PATH_OF_THE_WILD_HEART, 
-    PATH_OF_THE_WORLD_TREE, PATH_OF_THE_ZEALOT
-)
-from .bard import (
-    BARD_CLASS, BARD_LEVELS, BARD_FEATURES,
-    COLLEGE_OF_DANCE, COLLEGE_OF_GLAMOUR, COLLEGE_OF_LORE, 
-    COLLEGE_OF_VALOR
-)
-from .cleric import (
-    CLERIC_CLASS, CLERIC_LEVELS, CLERIC_FEATURES,
-    LIFE_DOMAIN, LIGHT_DOMAIN, WAR_DOMAIN
-)
-from .druid import (
-    DRUID_CLASS, DRUID_LEVELS, DRUID_FEATURES,
-    CIRCLE_OF_THE_LAND, CIRCLE_OF_THE_MOON, CIRCLE_OF_THE_SEA, 
-    CIRCLE_OF_THE_STARS
-)
-from .fighter import (
-    FIGHTER_CLASS, FIGHTER_LEVELS, FIGHTER_FEATURES,
-    BATTLE_MASTER, CHAMPION, ELDRITCH_KNIGHT, PSI_WARRIOR, 
-    ELDRITCH_KNIGHT_SPELLCASTING
-)
-from .monk import (
-    MONK_CLASS, MONK_LEVELS, MONK_FEATURES,
-    WARRIOR_OF_MERCY, WAY_OF_SHADOW, WAY_OF_THE_ELEMENTS, 
-    WAY_OF_THE_OPEN_HAND
-)
-from .paladin import (
-    PALADIN_CLASS, PALADIN_LEVELS, PALADIN_FEATURES,
-    OATH_OF_DEVOTION, OATH_OF_THE_ANCIENTS, 
-    OATH_OF_VENGEANCE
-)
-from .ranger import (
-    RANGER_CLASS, RANGER_LEVELS, RANGER_FEATURES,
-    BEAST_MASTER, FEY_WANDERER, GLOOM_STALKER,
-    HUNTER, BEAST_OF_THE_LAND, BEAST_OF_THE_SEA,
-    BEAST_OF_THE_SKY, FEYWILD_GIFTS
-)
-from .rogue import (
-    ROGUE_CLASS, ROGUE_LEVELS, ROGUE_FEATURES,
-    ARCANE_TRICKSTER, ARCANE_TRICKSTER_SPELLCASTING,
-    ASSASSIN, SOULKNIFE, SOULKNIFE_ENERGY_DICE, THIEF
-)
-from .sorcerer import (
-    SORCERER_CLASS, SORCERER_LEVELS, SORCERER_FEATURES,
-    ABERRANT_SORCERY, CLOCKWORK_SORCERY, DRACONIC_SORCERY,
-    WILD_MAGIC_SORCERY, WILD_MAGIC_SURGE_TABLE, MANIFESTATIONS_OF_ORDER
-)
-from .warlock import (
-    WARLOCK_CLASS, WARLOCK_LEVELS, WARLOCK_FEATURES,
-    ARCHFEY_PATRON, CELESTIAL_PATRON, FIEND_PATRON,
-    GREAT_OLD_ONE_PATRON
-)
+from spells.spells import add_class_spell, pick_class_spell
+from spells.spell_set import SpellSet
+from .class_registry import CLASS_MODULES, LazyClassRegistry
+from .class_progression import get_class_progression
+from .multiclass import pact_slot_level
 
 # --- AVAILABLE_CLASSES: Central registry of all supported D&D classes and their data ---
-AVAILABLE_CLASSES = {
-    'Barbarian': (BARBARIAN_CLASS, BARBARIAN_LEVELS, BARBARIAN_FEATURES, {
-        'Path of the Berserker': PATH_OF_THE_BERSERKER,
-        'Path of the Wild Heart': PATH_OF_THE_WILD_HEART,
-        'Path of the World Tree': PATH_OF_THE_WORLD_TREE,
-        'Path of the Zealot': PATH_OF_THE_ZEALOT,
-    }),
-    'Bard': (BARD_CLASS, BARD_LEVELS, BARD_FEATURES, {
-        'College of Dance': COLLEGE_OF_DANCE,
-        'College of Glamour': COLLEGE_OF_GLAMOUR,
-        'College of Lore': COLLEGE_OF_LORE,
-        'College of Valor': COLLEGE_OF_VALOR,
-    }),
-    'Cleric': (CLERIC_CLASS, CLERIC_LEVELS, CLERIC_FEATURES, {
-        'Life Domain': LIFE_DOMAIN,
-        'Light Domain': LIGHT_DOMAIN,
-        'War Domain': WAR_DOMAIN,
-    }),
-    'Druid': (DRUID_CLASS, DRUID_LEVELS, DRUID_FEATURES, {
-        'Circle of the Land': CIRCLE_OF_THE_LAND,
-        'Circle of the Moon': CIRCLE_OF_THE_MOON,
-        'Circle of the Sea': CIRCLE_OF_THE_SEA,
-        'Circle of the Stars': CIRCLE_OF_THE_STARS,
-    }),
-    'Fighter': (FIGHTER_CLASS, FIGHTER_LEVELS, FIGHTER_FEATURES, {
-        'Battle Master': BATTLE_MASTER,
-        'Champion': CHAMPION,
-        'Eldritch Knight': ELDRITCH_KNIGHT,
-        'Psi Warrior': PSI_WARRIOR,
-    }),
-    'Monk': (MONK_CLASS, MONK_LEVELS, MONK_FEATURES, {
-        'Warrior of Mercy': WARRIOR_OF_MERCY,
-        'Way of Shadow': WAY_OF_SHADOW,
-        'Way of the Elements': WAY_OF_THE_ELEMENTS,
-        'Way of the Open Hand': WAY_OF_THE_OPEN_HAND,
-    }),
-    'Paladin': (PALADIN_CLASS, PALADIN_LEVELS, PALADIN_FEATURES, {
-        'Oath of Devotion': OATH_OF_DEVOTION,
-        'Oath of the Ancients': OATH_OF_THE_ANCIENTS,
-        'Oath of Vengeance': OATH_OF_VENGEANCE,
-    }),
-    'Ranger': (RANGER_CLASS, RANGER_LEVELS, RANGER_FEATURES, {
-        'Beast Master': BEAST_MASTER,
-        'Fey Wanderer': FEY_WANDERER,
-        'Gloom Stalker': GLOOM_STALKER,
-        'Hunter': HUNTER,
-    }),
-    'Rogue': (ROGUE_CLASS, ROGUE_LEVELS, ROGUE_FEATURES, {
-        'Arcane Trickster': ARCANE_TRICKSTER,
-        'Assassin': ASSASSIN,
-        'Soulknife': SOULKNIFE,
-        'Thief': THIEF,
-    }),
-    'Sorcerer': (SORCERER_CLASS, SORCERER_LEVELS, SORCERER_FEATURES, {
-        'Aberrant Sorcery': ABERRANT_SORCERY,
-        'Clockwork Sorcery': CLOCKWORK_SORCERY,
-        'Draconic Sorcery': DRACONIC_SORCERY,
-        'Wild Magic Sorcery': WILD_MAGIC_SORCERY,
-    }),
-    'Warlock': (WARLOCK_CLASS, WARLOCK_LEVELS, WARLOCK_FEATURES, {
-        'Archfey Patron': ARCHFEY_PATRON,
-        'Celestial Patron': CELESTIAL_PATRON,
-        'Fiend Patron': FIEND_PATRON,
-        'Great Old One Patron': GREAT_OLD_ONE_PATRON
-    })
-}
-
-def handle_class_feature_choices(class_name, class_data, class_features, known_spells, character=None):
+# Each class's module is imported the first time AVAILABLE_CLASSES[name] is looked up
+AVAILABLE_CLASSES = LazyClassRegistry(CLASS_MODULES)
+
+@lru_cache(maxsize=1)
+def wild_magic_surge_sampler():
+    """Return the Wild Magic Surge d100 table sampler (O(1) per roll), building it on first use."""
+    from .sorcerer import WILD_MAGIC_SURGE_TABLE
+    return AliasSampler.from_range_table(WILD_MAGIC_SURGE_TABLE)
+
+def roll_wild_magic_surge(rng=None):
+    """
+    Roll on the Wild Magic Surge table.
+
+    Args:
+        rng (random.Random, optional): Random number generator to use (default: the random module)
+
+    Returns:
+        tuple: (d100 range, effect description)
+    """
+    from .sorcerer import WILD_MAGIC_SURGE_TABLE
+    result = wild_magic_surge_sampler().sample(rng)
+    return result, WILD_MAGIC_SURGE_TABLE[result]
+
+def _required_choice(choices, key, feature_name):
+    """
+    Return choices[key] for a non-interactive build.
+
+    Raises:
+        ValueError: If choices has no value for key.
+    """
+    chosen = choices.get(key)
+    if chosen is None:
+        raise ValueError(f"{feature_name} requires a '{key}' choice.")
+    return chosen
+
+def handle_class_feature_choices(class_name, class_data, class_features, known_spells, character=None, choices=None,
+                                 current_level=1):
     """
     Handles class-specific feature choices (e.g., Fighting Style, Divine Domain).
     This function should only update known_spells directly if a feature grants a spell.
     All spells (user-chosen and feature-granted) are managed in known_spells.
+    If choices is a dict, the choices are read from it instead of prompting
+    (keys: 'weapon_mastery', 'divine_order', 'primal_order', 'extra_cantrip', 'fighting_style', 'subclass').
+    current_level sets how many weapons Weapon Mastery applies to, from the class's weapon_mastery column.
+
+    Raises:
+        ValueError: If choices is given but leaves out or gives an invalid choice for one of the class's features.
     """
     extra_choices = {}
     
     # Barbarian, Fighter, & Paladin: Weapon Mastery
     if class_name in ('Barbarian', 'Fighter', 'Paladin', 'Ranger') and 'Weapon Mastery' in class_features:
-        weapon_mastery = choose_weapon_mastery(num_choices=2)
+        # Classes whose table has no Weapon Mastery column master 2 weapons
+        num_choices = get_class_progression(class_name).resource('weapon_mastery', current_level, 2)
+        if choices is None:
+            weapon_mastery = choose_weapon_mastery(num_choices=num_choices)
+        else:
+            weapon_mastery = validate_weapon_mastery(choices.get('weapon_mastery'), num_choices=num_choices)
         extra_choices['weapon_mastery'] = weapon_mastery
         
     # Cleric: Divine Order
@@ -164,7 +97,12 @@ def handle_class_feature_choices(class_name, class_data, class_features, known_s
             }
         }
         feature_desc = CLERIC_FEATURES.get('Divine Order', '')
-        handle_order_feature(class_name, class_data, known_spells, extra_choices, 'Divine Order', options, feature_desc)
+        if choices is None:
+            handle_order_feature(class_name, class_data, known_spells, extra_choices, 'Divine Order', options, feature_desc)
+        else:
+            handle_order_feature(class_name, class_data, known_spells, extra_choices, 'Divine Order', options,
+                                 chosen=_required_choice(choices, 'divine_order', 'Divine Order'),
+                                 extra_cantrip=choices.get('extra_cantrip'))
     
     # Druid: Primal Order
     if class_name == 'Druid' and 'Primal Order' in class_features:
@@ -180,8 +118,21 @@ def handle_class_feature_choices(class_name, class_data, class_features, known_s
             }
         }
         feature_desc = DRUID_FEATURES.get('Primal Order', '')
-        handle_order_feature(class_name, class_data, known_spells, extra_choices, 'Primal Order', options, feature_desc)
+        if choices is None:
+            handle_order_feature(class_name, class_data, known_spells, extra_choices, 'Primal Order', options, feature_desc)
+        else:
+            handle_order_feature(class_name, class_data, known_spells, extra_choices, 'Primal Order', options,
+                                 chosen=_required_choice(choices, 'primal_order', 'Primal Order'),
+                                 extra_cantrip=choices.get('extra_cantrip'))
     
+    # Subclass (level 3), recorded for subclasses that grant spellcasting (e.g. Eldritch Knight)
+    feature_name = subclass_feature(class_name)
+    if feature_name in class_features:
+        if choices is None:
+            extra_choices['subclass'] = choose_subclass(class_name)
+        else:
+            extra_choices['subclass'] = validate_subclass(class_name, _required_choice(choices, 'subclass', feature_name))
+
     # Fighter: Fighting Style feat
     feats_gained = []
     if class_name == 'Fighter' and any("Fighting Style" in f for f in class_features):
@@ -197,7 +148,8 @@ def handle_class_feature_choices(class_name, class_data, class_features, known_s
         feat_result = add_feat(
             character=character,  # Pass character instance for proper feat handling
             feat_name='Fighting Style',
-            available_fighting_styles=available_fighting_styles
+            available_fighting_styles=available_fighting_styles,
+            fighting_style=None if choices is None else _required_choice(choices, 'fighting_style', 'Fighting Style')
         )
         if feat_result and isinstance(feat_result, dict) and feat_result.get('feat') == 'Fighting Style' and feat_result.get('fighting_style'):
             feats_gained.append(feat_result)
@@ -231,6 +183,48 @@ def choose_weapon_mastery(num_choices=2):
         ).execute()
     return selected
 
+def validate_weapon_mastery(selected, num_choices=2):
+    """
+    Non-interactive counterpart of choose_weapon_mastery: checks a list of chosen weapons.
+    Returns the list of chosen weapon names.
+
+    Raises:
+        ValueError: If the selection is not exactly num_choices distinct simple or martial weapons.
+    """
+    selected = list(selected or [])
+    if len(set(selected)) != num_choices:
+        raise ValueError(f"You must select exactly {num_choices} weapons for Weapon Mastery.")
+    for weapon in selected:
+        if weapon not in SIMPLE_WEAPONS_DICT and weapon not in MARTIAL_WEAPONS_DICT:
+            raise ValueError(f"{weapon} is not a simple or martial weapon.")
+    return selected
+
+def subclass_feature(class_name):
+    """Return the name of the feature that grants a class its subclass (e.g. 'Fighter Subclass' at level 3)."""
+    return f"{class_name} Subclass"
+
+def choose_subclass(class_name):
+    """
+    Prompt the user to select a subclass for a class.
+    Returns the chosen subclass name.
+    """
+    return inquirer.select(
+        message=f"Choose your {class_name} subclass:",
+        choices=list(AVAILABLE_CLASSES[class_name][3])
+    ).execute()
+
+def validate_subclass(class_name, subclass):
+    """
+    Non-interactive counterpart of choose_subclass: checks a chosen subclass.
+    Returns the subclass name.
+
+    Raises:
+        ValueError: If subclass is not one of the class's subclasses.
+    """
+    if subclass not in AVAILABLE_CLASSES[class_name][3]:
+        raise ValueError(f"{subclass} is not a {class_name} subclass.")
+    return subclass
+
 def choose_divine_order():
     """
     Prompt the user to select a Divine Order for Cleric: Protector or Thaumaturge.
@@ -250,38 +244,47 @@ def choose_extra_cantrip(class_name, known_cantrips):
     Prompt the user to select an extra cantrip (for Thaumaturge Divine Order).
     Returns (spell_name, spell_data) tuple.
     """
-    spell_name, spell_data = add_class_spell(class_name, 0, set(known_cantrips))
+    spell_name, spell_data = add_class_spell(class_name, 0, SpellSet.coerce(known_cantrips))
     return spell_name, spell_data
 
-def handle_order_feature(class_name, class_data, known_spells, extra_choices, feature_name, options, feature_desc=None):
+def handle_order_feature(class_name, class_data, known_spells, extra_choices, feature_name, options, feature_desc=None, chosen=None, extra_cantrip=None):
     """
     Generic handler for order-like features (e.g., Divine Order, Primal Order).
     options: dict of {option_name: {'proficiencies': {'weapons': [], 'armor': [], 'tools': []}, 'extra_cantrip': bool}}
     feature_desc: string description of the feature to display before prompting.
+    chosen/extra_cantrip: if chosen is given, it (and extra_cantrip, when the order grants one) is used instead of prompting.
     Adds the chosen order, gained proficiencies, and extra cantrips to extra_choices.
     """
-    if feature_desc:
-        print(f"\n{feature_name}:\n{feature_desc}\n")
-    order_choices = list(options.keys())
-    order = inquirer.select(
-        message=f"Choose your {feature_name}:",
-        choices=order_choices
-    ).execute()
-    chosen = order
+    if chosen is None:
+        if feature_desc:
+            print(f"\n{feature_name}:\n{feature_desc}\n")
+        order_choices = list(options.keys())
+        chosen = inquirer.select(
+            message=f"Choose your {feature_name}:",
+            choices=order_choices
+        ).execute()
+        interactive = True
+    else:
+        if chosen not in options:
+            raise ValueError(f"{chosen} is not a valid {feature_name}.")
+        interactive = False
     extra_choices[feature_name.lower().replace(' ', '_')] = chosen
     gained_profs = {'weapons': set(), 'armor': set(), 'tools': set()}
-    # Add proficiencies if any
+    # Add proficiencies if any (kept on the character, never written back into the shared class data)
     for k in ['weapons', 'armor', 'tools']:
         for prof in options[chosen].get('proficiencies', {}).get(k, []):
-            if prof not in class_data['proficiencies'][k]:
-                class_data['proficiencies'][k].append(prof)
             gained_profs[k].add(prof)
     if any(gained_profs.values()):
         extra_choices['gained_proficiencies'] = gained_profs
     # Handle extra cantrip if needed
     if options[chosen].get('extra_cantrip'):
-        known_cantrips = set(known_spells.get('Cantrips', {}))
-        spell_name, spell_data = choose_extra_cantrip(class_name, known_cantrips)
+        known_cantrips = SpellSet.from_known_spells(known_spells, 'Cantrips')
+        if interactive:
+            spell_name, spell_data = choose_extra_cantrip(class_name, known_cantrips)
+        elif extra_cantrip is None:
+            raise ValueError(f"{chosen} {feature_name} requires an extra cantrip choice.")
+        else:
+            spell_name, spell_data = pick_class_spell(class_name, 0, extra_cantrip, known_cantrips)
         if spell_name:
             if 'Cantrips' not in known_spells:
                 known_spells['Cantrips'] = {}
@@ -492,18 +495,8 @@ def browse_class_features_prompt(class_name: str, class_data: dict, class_levels
         class_features (dict): The class features dictionary for feature descriptions.
         subclass_dicts (dict): Dict of subclass name to subclass feature dicts.
     """
-    # Gather all features in order by level
-    features_by_level = []  # List of (level, feature_name)
-    for lvl in sorted(class_levels.keys()):
-        for feat in class_levels[lvl].get('features', []):
-            features_by_level.append((lvl, feat))
-    # Remove duplicates while preserving order
-    seen = set()
-    ordered_features = []
-    for lvl, feat in features_by_level:
-        if feat not in seen:
-            ordered_features.append((lvl, feat))
-            seen.add(feat)
+    # All features in order by level, without duplicates (precompiled per class)
+    ordered_features = get_class_progression(class_name).features_through()
 
     def print_feature_desc(desc, title=None):
         if title:
@@ -633,25 +626,29 @@ def browse_class_features_prompt(class_name: str, class_data: dict, class_levels
                 # Special: Show subclass spellcasting table if browsing that subclass
                 if (class_name == 'Fighter' or class_name == 'Rogue') and (subclass_choice == 'Eldritch Knight' or subclass_choice == 'Arcane Trickster'):
                     if subclass_choice == 'Eldritch Knight':
-                        subclass_dict = ELDRITCH_KNIGHT_SPELLCASTING
+                        from .fighter import ELDRITCH_KNIGHT_SPELLCASTING as subclass_dict
                     elif subclass_choice == 'Arcane Trickster':
-                        subclass_dict = ARCANE_TRICKSTER_SPELLCASTING
+                        from .rogue import ARCANE_TRICKSTER_SPELLCASTING as subclass_dict
                     display_subclass_spellcasting_table(subclass_dict, subclass_choice)
                 
                 # Special handling for Ranger's Feywild Gifts
                 if class_name == 'Ranger' and subclass_choice == 'Fey Wanderer':
+                    from .ranger import FEYWILD_GIFTS
                     display_dict_table(subclass_choice, FEYWILD_GIFTS, 'Feywild Gifts')
                 
                 # Special handling for Soulknife subclass
                 if class_name == 'Rogue' and subclass_choice == 'Soulknife':
+                    from .rogue import SOULKNIFE_ENERGY_DICE
                     display_dict_table(subclass_choice, SOULKNIFE_ENERGY_DICE, 'Soulknife Energy Dice')
                 
                 # Special handling for Wild Magic Sorcery
                 if class_name == 'Sorcerer' and subclass_choice == 'Wild Magic Sorcery':
+                    from .sorcerer import WILD_MAGIC_SURGE_TABLE
                     display_dict_table(subclass_choice, WILD_MAGIC_SURGE_TABLE, 'Wild Magic Surges')
                 
                 # Special handling for Clockwork Sorcery
                 if class_name == 'Sorcerer' and subclass_choice == 'Clockwork Sorcery':
+                    from .sorcerer import MANIFESTATIONS_OF_ORDER
                     display_dict_table(subclass_choice, MANIFESTATIONS_OF_ORDER, 'Manifestations of Order')
 
                 feature_keys = [k for k in subclass.keys() if k != 'description']
@@ -682,6 +679,7 @@ def browse_class_features_prompt(class_name: str, class_data: dict, class_levels
                                 print_feature_desc(desc, title=f"{subclass_choice} {lvl} - {feat}")
                                 # Special handling: If Beast Master 3 - Primal Companion, prompt to view stat block
                                 if class_name == 'Ranger' and subclass_choice == 'Beast Master' and lvl == 3 and feat == 'Primal Companion':
+                                    from .ranger import BEAST_OF_THE_LAND, BEAST_OF_THE_SEA, BEAST_OF_THE_SKY
                                     beast_options = [
                                         ('Beast of the Land', BEAST_OF_THE_LAND),
                                         ('Beast of the Sea', BEAST_OF_THE_SEA),
@@ -723,22 +721,14 @@ def browse_class_features_prompt(class_name: str, class_data: dict, class_levels
             print_feature_desc(desc, title=selected)
             inquirer.text(message="Press Enter to return.").execute()
 
-def choose_proficiencies(class_data, already_proficient):
+def get_available_skills(class_data, already_proficient):
     """
-    Handles skill proficiency selection for the chosen class.
-
-    Prompts the user to select skill proficiencies based on the class's rules. Supports both "choose any N skills" and
-    fixed skill lists. Ensures the user cannot select skills they are already proficient in.
-
-    Args:
-        class_data (dict): The class data dictionary, including proficiency info.
-        already_proficient (list): List of skills the character is already proficient in.
+    Return the skills a class can choose proficiency in, excluding ones the character already has.
 
     Returns:
-        list: The list of chosen skill proficiencies.
+        tuple: (available_skills, num_skills) where num_skills is how many the class chooses.
     """
     from misc.skills import SKILLS_DICT  # Ensure SKILLS_DICT is available
-    chosen_skills = []
     profs = class_data['proficiencies']
     skills_prof = profs.get('skills', [])
     num_skills = profs.get('skills_choose', 2)
@@ -747,57 +737,82 @@ def choose_proficiencies(class_data, already_proficient):
         available_skills = [s for s in SKILLS_DICT.keys() if s not in already_proficient]
     else:
         available_skills = [s for s in skills_prof if s not in already_proficient]
-    if not available_skills:
-        print("No available skill proficiencies to choose from.")
-    elif len(available_skills) <= num_skills:
-        chosen_skills = available_skills.copy()
-        print(f"Automatically selected: {', '.join(chosen_skills)}")
-    else:
+    return available_skills, num_skills
+
+def choose_proficiencies(class_data, already_proficient, chosen_skills=None):
+    """
+    Handles skill proficiency selection for the chosen class.
+
+    Prompts the user to select skill proficiencies based on the class's rules. Supports both "choose any N skills" and
+    fixed skill lists. Ensures the user cannot select skills they are already proficient in.
+
+    Args:
+        class_data (dict): The class data dictionary, including proficiency info.
+        already_proficient (list): List of skills the character is already proficient in.
+        chosen_skills (list, optional): Skills to choose instead of prompting. Ignored when the choice is automatic.
+
+    Returns:
+        list: The list of chosen skill proficiencies.
+
+    Raises:
+        ValueError: If chosen_skills is given and is not a valid selection.
+    """
+    available_skills, num_skills = get_available_skills(class_data, already_proficient)
+    if not available_skills or len(available_skills) <= num_skills:
+        # Nothing to choose: take every available skill
+        if chosen_skills is None:
+            if not available_skills:
+                print("No available skill proficiencies to choose from.")
+            else:
+                print(f"Automatically selected: {', '.join(available_skills)}")
+        return available_skills.copy()
+    if chosen_skills is not None:
+        if len(set(chosen_skills)) != num_skills or any(s not in available_skills for s in chosen_skills):
+            raise ValueError(f"You must select exactly {num_skills} skills from: {', '.join(available_skills)}")
+        return list(chosen_skills)
+    chosen_skills = inquirer.checkbox(
+        message=f"Choose {num_skills} skill proficiencies:",
+        choices=available_skills,
+        validate=lambda result: (len(result) == num_skills) or (f"You must select exactly {num_skills} skills.")
+    ).execute()
+    while len(chosen_skills) != num_skills:
+        print(f"You must select exactly {num_skills} skills.")
         chosen_skills = inquirer.checkbox(
             message=f"Choose {num_skills} skill proficiencies:",
             choices=available_skills,
             validate=lambda result: (len(result) == num_skills) or (f"You must select exactly {num_skills} skills.")
         ).execute()
-        while len(chosen_skills) != num_skills:
-            print(f"You must select exactly {num_skills} skills.")
-            chosen_skills = inquirer.checkbox(
-                message=f"Choose {num_skills} skill proficiencies:",
-                choices=available_skills,
-                validate=lambda result: (len(result) == num_skills) or (f"You must select exactly {num_skills} skills.")
-            ).execute()
     return chosen_skills
 
-def organize_equipment(class_data):
+def organize_equipment(class_data, equipment_option=None):
     """
     Handles equipment, inventory, and currency selection and organization for the chosen class.
 
     Prompts the user to choose between equipment options if multiple are available, parses the selected items,
-    and sorts them into equipment, inventory, and currency. Handles item quantities and recognizes armor, weapons,
-    and ammunition using the relevant dictionaries.
+    and sorts them into equipment, inventory, and currency with the shared parser in equipment.equipment_parser,
+    which handles item quantities, plurals, and coins and recognizes armor, weapons, and ammunition.
 
     Args:
         class_data (dict): The class data dictionary, including starting equipment info.
+        equipment_option (int, optional): Index of the equipment option to take instead of prompting.
 
     Returns:
         tuple: (equipment, inventory, gold_pieces, silver_pieces, copper_pieces)
-            - equipment (list): List of equipped items (with quantities if >1).
-            - inventory (list): List of other items.
+            - equipment (Inventory): Armor, weapons, and ammunition, with their quantities.
+            - inventory (Inventory): Other items.
             - gold_pieces (int): Number of gold pieces.
             - silver_pieces (int): Number of silver pieces.
             - copper_pieces (int): Number of copper pieces.
     """
-    from collections import Counter
-    import re
-    from equipment.armor_dict import HEAVY_ARMOR_DICT, LIGHT_ARMOR_DICT, MEDIUM_ARMOR_DICT, SHIELD_DICT
-    from equipment.weapons_dict import AMMUNITION_DICT, MARTIAL_WEAPONS_DICT, SIMPLE_WEAPONS_DICT
-    equipment = []
-    inventory = []
-    gold_pieces = 0
-    silver_pieces = 0
-    copper_pieces = 0
+    from equipment.equipment_parser import parse_equipment_option
+    selected_items = []
     if class_data and 'starting_equipment' in class_data:
         equip_choices = class_data['starting_equipment']
-        if len(equip_choices) > 1:
+        if equipment_option is not None:
+            if not 0 <= equipment_option < len(equip_choices):
+                raise ValueError(f"No starting equipment option {equipment_option + 1}")
+            selected_items = equip_choices[equipment_option]
+        elif len(equip_choices) > 1:
             equip_choice = inquirer.select(
                 message="Choose your starting equipment:",
                 choices=[f"Option {i+1}: {', '.join(opt)}" for i, opt in enumerate(equip_choices)]
@@ -806,118 +821,154 @@ def organize_equipment(class_data):
             selected_items = equip_choices[idx]
         else:
             selected_items = equip_choices[0]
-        for item in selected_items:
-            gp_match = re.match(r"(\d+) GP", item)
-            sp_match = re.match(r"(\d+) SP", item)
-            cp_match = re.match(r"(\d+) CP", item)
-            multi_match = re.match(r"(\d+) (.+)", item)
-            if gp_match:
-                gold_pieces += int(gp_match.group(1))
-            elif sp_match:
-                silver_pieces += int(sp_match.group(1))
-            elif cp_match:
-                copper_pieces += int(cp_match.group(1))
-            elif multi_match:
-                count = int(multi_match.group(1))
-                base_item = multi_match.group(2).strip()
-                singular_item = base_item.rstrip('s') if base_item.endswith('s') and not base_item.lower().endswith('ss') else base_item
-                found = False
-                for test_item in (base_item, singular_item):
-                    if test_item in LIGHT_ARMOR_DICT or test_item in MEDIUM_ARMOR_DICT or test_item in HEAVY_ARMOR_DICT or test_item in SHIELD_DICT:
-                        equipment.extend([test_item]*count)
-                        found = True
-                        break
-                    elif test_item in SIMPLE_WEAPONS_DICT or test_item in MARTIAL_WEAPONS_DICT or test_item in AMMUNITION_DICT:
-                        equipment.extend([test_item]*count)
-                        found = True
-                        break
-                if not found:
-                    inventory.extend([base_item]*count)
-            elif item in LIGHT_ARMOR_DICT or item in MEDIUM_ARMOR_DICT or item in HEAVY_ARMOR_DICT or item in SHIELD_DICT:
-                equipment.append(item)
-            elif item in SIMPLE_WEAPONS_DICT or item in MARTIAL_WEAPONS_DICT or item in AMMUNITION_DICT:
-                equipment.append(item)
-            else:
-                inventory.append(item)
-        equip_counter = Counter(equipment)
-        equipment = [f"{name} x {count}" if count > 1 else name for name, count in equip_counter.items()]
-    return equipment, inventory, gold_pieces, silver_pieces, copper_pieces
+    # Each option is parsed once, the first time any character takes it
+    return parse_equipment_option(selected_items).as_tuple()
+
+def get_available_spell_levels(class_name, spellcasting):
+    """
+    Return the sorted list of spell levels a class can learn from its spellcasting row.
+    Warlocks use their pact 'slot_level'; other classes use the keys of 'spell_slots' (e.g. 'Level 1' or '1st').
+    """
+    import re
+    available_levels = []
+    # Warlocks just have global/leveled spell slots vs specific level slots
+    if class_name == 'Warlock':
+        lvl_num = pact_slot_level(spellcasting)
+        if lvl_num > 0:
+            for i in range(1, lvl_num + 1):
+                available_levels.append(i)
+    else:
+        for key in spellcasting.get('spell_slots', {}).keys():
+            match = re.search(r'\d+', str(key))
+            if match:
+                available_levels.append(int(match.group()))
+    return sorted(set(available_levels))
+
+def _has_spell_to_learn(class_name, spell_level, known_spells, exclude_spells):
+    """Return whether the class has a spell of spell_level left to learn that isn't known or excluded."""
+    from spells.spells_utils import get_spell_dicts, filter_spells_by_class_and_known
+    spells = get_spell_dicts().get(spell_level, {})
+    return bool(filter_spells_by_class_and_known(spells, class_name, known_spells, exclude_spells))
 
-def learn_spell(class_name, spellcasting, known_spells, class_feature_spells=None):
+def learn_spell(class_name, spellcasting, known_spells, class_feature_spells=None, chosen_spells=None):
     """
     Handles the spell learning process for a class at a given level.
     Prompts the user to select all required cantrips and leveled spells not already known or granted by features.
+    If chosen_spells ({spell_level: [spell_name, ...]}, 0 for cantrips) is given, those spells are learned instead of prompting.
     Returns a list of (spell_level, spell_name, spell_data) for all newly learned spells.
+
+    Raises:
+        ValueError: If chosen_spells contains a spell the class cannot learn, more spells than it learns, or fewer
+            while the class still has spells left to learn.
     """
     learned_spells = []
     # Prepare set of feature-granted spells for each level
     feature_spells_by_level = {}
     if class_feature_spells:
         for lvl, spells in class_feature_spells.items():
-            feature_spells_by_level[str(lvl)] = set(spells.keys())
+            feature_spells_by_level[str(lvl)] = SpellSet(spells)
             if str(lvl) == '0':
-                feature_spells_by_level['Cantrips'] = set(spells.keys())
+                feature_spells_by_level['Cantrips'] = feature_spells_by_level[str(lvl)]
     # Learn cantrips
     cantrips_to_learn = spellcasting.get('cantrips_known', 0)
     if cantrips_to_learn:
-        known_cantrips = set(known_spells.get('Cantrips', {}))
-        exclude_cantrips = feature_spells_by_level.get('Cantrips', set())
+        known_cantrips = SpellSet.from_known_spells(known_spells, 'Cantrips')
+        exclude_cantrips = feature_spells_by_level.get('Cantrips', SpellSet())
+        chosen_cantrips = None if chosen_spells is None else list(chosen_spells.get(0, []))
         while len(known_cantrips) < cantrips_to_learn:
-            spell_name, spell_data = add_class_spell(class_name, 0, known_cantrips, exclude_cantrips)
+            if chosen_cantrips is None:
+                spell_name, spell_data = add_class_spell(class_name, 0, known_cantrips, exclude_cantrips)
+            elif chosen_cantrips:
+                spell_name, spell_data = pick_class_spell(class_name, 0, chosen_cantrips.pop(0), known_cantrips, exclude_cantrips)
+            elif _has_spell_to_learn(class_name, 0, known_cantrips, exclude_cantrips):
+                raise ValueError(f"Too few cantrips chosen; {class_name} knows {cantrips_to_learn}.")
+            else:
+                # Every cantrip the class can learn is already known
+                break
             if not spell_name:
                 break
             learned_spells.append((0, spell_name, spell_data))
-            known_cantrips.add(spell_name)
+            known_cantrips |= SpellSet([spell_name])
+        if chosen_cantrips:
+            raise ValueError(f"Too many cantrips chosen; {class_name} knows {cantrips_to_learn}.")
     # Learn leveled spells (use 'spells_known' if present, else 'spells_prepared')
+    chosen_leveled = None
+    if chosen_spells is not None:
+        chosen_leveled = [(lvl, name) for lvl, names in sorted(chosen_spells.items()) if lvl != 0 for name in names]
     spells_to_learn = spellcasting.get('spells_known', spellcasting.get('spells_prepared', 0))
     if spells_to_learn:
         # Gather all available spell levels
-        available_levels = []
-        # Warlocks just have global/leveled spell slots vs specific level slots
-        if class_name == 'Warlock':
-            lvl_num = spellcasting.get('slot_level', 0)
-            if lvl_num > 0:
-                for i in range(1, lvl_num + 1):
-                    available_levels.append(i)
-        else:
-            for key in spellcasting.get('spell_slots', {}).keys():
-                try:
-                    lvl_num = int(key.split()[-1])
-                    available_levels.append(lvl_num)
-                except (ValueError, IndexError):
-                    continue
-        available_levels = sorted(set(available_levels))
+        available_levels = get_available_spell_levels(class_name, spellcasting)
         # Gather all known spells across all available levels
-        known_level_spells = set()
-        for lvl in available_levels:
-            known_level_spells.update(known_spells.get(str(lvl), {}))
+        known_level_spells = SpellSet.from_known_spells(known_spells, available_levels)
         # Loop until the total number of known spells matches spells_to_learn
         while len(known_level_spells) < spells_to_learn:
-            # Prompt user to pick a spell level
-            level_choices = [str(lvl) for lvl in available_levels]
-            spell_level_str = inquirer.select(
-                message="Select spell level to learn a new spell:",
-                choices=level_choices
-            ).execute()
-            spell_level = int(spell_level_str)
-            # Filter out already known spells at this level and feature-granted spells
-            known_at_level = set(known_spells.get(str(spell_level), {})) | {name for lvl, name, _ in learned_spells if lvl == spell_level}
-            exclude_at_level = feature_spells_by_level.get(str(spell_level), set())
-            spell_name, spell_data = add_class_spell(class_name, spell_level, known_at_level, exclude_at_level)
+            if chosen_leveled is None:
+                # Prompt user to pick a spell level
+                level_choices = [str(lvl) for lvl in available_levels]
+                spell_level_str = inquirer.select(
+                    message="Select spell level to learn a new spell:",
+                    choices=level_choices
+                ).execute()
+                spell_level = int(spell_level_str)
+                chosen_name = None
+            elif chosen_leveled:
+                spell_level, chosen_name = chosen_leveled.pop(0)
+                if spell_level not in available_levels:
+                    raise ValueError(f"{class_name} cannot learn level {spell_level} spells yet.")
+            elif any(_has_spell_to_learn(class_name, lvl, known_level_spells,
+                                         feature_spells_by_level.get(str(lvl), SpellSet()))
+                     for lvl in available_levels):
+                raise ValueError(f"Too few spells chosen; {class_name} knows {spells_to_learn}.")
+            else:
+                # Every spell the class can learn at its available levels is already known
+                break
+            # Filter out already known spells and feature-granted spells; a few spells are listed at two levels
+            # (e.g. Summon Beast), so spells known at any level are excluded
+            known_at_level = known_level_spells
+            exclude_at_level = feature_spells_by_level.get(str(spell_level), SpellSet())
+            if chosen_name is None:
+                spell_name, spell_data = add_class_spell(class_name, spell_level, known_at_level, exclude_at_level)
+            else:
+                spell_name, spell_data = pick_class_spell(class_name, spell_level, chosen_name, known_at_level, exclude_at_level)
             if not spell_name:
                 break
             learned_spells.append((spell_level, spell_name, spell_data))
-            known_level_spells.add(spell_name)
+            known_level_spells |= SpellSet([spell_name])
+    if chosen_leveled:
+        raise ValueError(f"Too many spells chosen; {class_name} knows {spells_to_learn}.")
     return learned_spells
 
-def learn_invocation(eldritch_invocations, known_invocations, character_level=None, known_cantrips=None):
+def learn_invocation(eldritch_invocations, known_invocations, character_level=None, known_cantrips=None, chosen_invocations=None):
     """
     Handles the process of learning Eldritch Invocations for Warlocks.
     Prompts the user to select invocations from available options, ensuring they are not already known and prerequisites are met.
+    If chosen_invocations is given, those invocations are learned in order instead of prompting.
     Returns a list of newly learned invocations.
+
+    Raises:
+        ValueError: If a chosen invocation is unknown, already known, or has unmet prerequisites, or if too many are
+            chosen, or too few while there are still invocations left to learn.
     """
     known_invocations = set(known_invocations) if not isinstance(known_invocations, set) else known_invocations
     num_to_learn = eldritch_invocations - len(known_invocations)
+    if chosen_invocations is not None:
+        if len(chosen_invocations) > max(num_to_learn, 0):
+            raise ValueError(f"Too many invocations chosen; {max(num_to_learn, 0)} can be learned.")
+        invocations_gained = []
+        for inv_name in chosen_invocations:
+            if inv_name not in ELDRITCH_INVOCATIONS or inv_name in known_invocations:
+                raise ValueError(f"{inv_name} is not an available invocation.")
+            if character_level is not None and not invocation_prereqs_met(inv_name, character_level, known_cantrips or set(), known_invocations):
+                raise ValueError(f"Prerequisites for {inv_name} are not met.")
+            invocations_gained.append(inv_name)
+            known_invocations.add(inv_name)
+        if len(invocations_gained) < num_to_learn and any(
+                name not in known_invocations and (character_level is None or invocation_prereqs_met(
+                    name, character_level, known_cantrips or set(), known_invocations))
+                for name in ELDRITCH_INVOCATIONS):
+            raise ValueError(f"Too few invocations chosen; {num_to_learn} can be learned.")
+        return invocations_gained
     if num_to_learn <= 0:
         return []
     invocations_gained = []
@@ -0,0 +1,194 @@
+"""
+Multiclass spellcasting.
+Each class's caster type (full, half, or third caster, or Warlock Pact Magic) is derived once from its *_LEVELS
+spellcasting block by matching its slot table against the multiclass Spellcaster table, and each class's
+contribution to the combined caster level is precomputed for every class level, so the spell slots of any
+mix of classes are a few table lookups.
+"""
+
+import importlib
+import re
+from functools import lru_cache
+
+from .class_progression import MAX_LEVEL, get_class_progression
+
+# Multiclass Spellcaster table: combined caster level -> {spell level: slots}
+MULTICLASS_SPELL_SLOTS = tuple(
+    {spell_level: count for spell_level, count in enumerate(row, start=1)}
+    for row in (
+        (),
+        (2,),
+        (3,),
+        (4, 2),
+        (4, 3),
+        (4, 3, 2),
+        (4, 3, 3),
+        (4, 3, 3, 1),
+        (4, 3, 3, 2),
+        (4, 3, 3, 3, 1),
+        (4, 3, 3, 3, 2),
+        (4, 3, 3, 3, 2, 1),
+        (4, 3, 3, 3, 2, 1),
+        (4, 3, 3, 3, 2, 1, 1),
+        (4, 3, 3, 3, 2, 1, 1),
+        (4, 3, 3, 3, 2, 1, 1, 1),
+        (4, 3, 3, 3, 2, 1, 1, 1),
+        (4, 3, 3, 3, 2, 1, 1, 1, 1),
+        (4, 3, 3, 3, 3, 1, 1, 1, 1),
+        (4, 3, 3, 3, 3, 2, 1, 1, 1),
+        (4, 3, 3, 3, 3, 2, 2, 1, 1),
+    )
+)
+
+# Caster type -> (class levels per caster level, caster level for a class level when multiclassing)
+# Half casters round up and third casters round down.
+CASTER_TYPES = {
+    'full': (1, lambda level: level),
+    'half': (2, lambda level: -(-level // 2)),
+    'third': (3, lambda level: level // 3),
+}
+
+# Subclasses that add spellcasting to a class without it: (class, subclass) -> (module, table constant)
+SUBCLASS_SPELLCASTING = {
+    ('Fighter', 'Eldritch Knight'): ('fighter', 'ELDRITCH_KNIGHT_SPELLCASTING'),
+    ('Rogue', 'Arcane Trickster'): ('rogue', 'ARCANE_TRICKSTER_SPELLCASTING'),
+}
+
+_ORDINAL_KEY = re.compile(r'^(\d+)(?:st|nd|rd|th)$')
+
+
+def pact_slot_level(spellcasting):
+    """
+    Return the level of a Warlock spellcasting row's Pact Magic slots as an int, or 0 if the row has none.
+    The table writes some slot levels with a note, e.g. '5 (see Mystic Arcanum)'; only the leading number counts.
+    """
+    slot_level = (spellcasting or {}).get('slot_level', 0)
+    if isinstance(slot_level, int):
+        return slot_level
+    match = re.match(r'\s*(\d+)', str(slot_level))
+    return int(match.group(1)) if match else 0
+
+
+def spell_slots_from_row(spellcasting):
+    """
+    Return a spellcasting row's leveled slots as {spell_level: count}.
+    Rows key slots under 'spell_slots' ('Level 1' or '1st') or, in subclass tables, directly ('1st': 2).
+    Warlock Pact Magic rows give 'spell_slots' as a count and return {slot_level: count}.
+    """
+    if not spellcasting:
+        return {}
+    slots = spellcasting.get('spell_slots')
+    if isinstance(slots, int):
+        slot_level = pact_slot_level(spellcasting)
+        return {slot_level: slots} if slot_level and slots else {}
+    result = {}
+    if slots is None:
+        for key, count in spellcasting.items():
+            match = _ORDINAL_KEY.match(str(key))
+            if match and count:
+                result[int(match.group(1))] = count
+        return result
+    for key, count in slots.items():
+        match = re.search(r'\d+', str(key))
+        if match and count:
+            result[int(match.group())] = count
+    return result
+
+
+def _spellcasting_rows(class_name, subclass=None):
+    """Return the spellcasting row for each class level 0-20 (None where there is none)."""
+    table = SUBCLASS_SPELLCASTING.get((class_name, subclass))
+    if table is not None:
+        module_name, constant = table
+        rows = getattr(importlib.import_module(f".{module_name}", __package__), constant)
+        return tuple(rows.get(level) for level in range(MAX_LEVEL + 1))
+    progression = get_class_progression(class_name)
+    return (None,) + tuple(progression.spellcasting(level) for level in range(1, MAX_LEVEL + 1))
+
+
+@lru_cache(maxsize=None)
+def _caster_profile(class_name, subclass=None):
+    """
+    Return (caster type, own slots by class level, caster level contribution by class level) for a class.
+    The caster type is the one whose levels per caster level best reproduce the class's own slot table.
+    """
+    rows = _spellcasting_rows(class_name, subclass)
+    own_slots = tuple(spell_slots_from_row(row) for row in rows)
+    if any(isinstance(row.get('spell_slots'), int) for row in rows if row):
+        return 'pact', own_slots, (0,) * (MAX_LEVEL + 1)
+    casting_levels = [level for level, slots in enumerate(own_slots) if slots]
+    if not casting_levels:
+        return None, own_slots, (0,) * (MAX_LEVEL + 1)
+
+    def matches(levels_per_caster_level):
+        # Single-class tables round partial caster levels up
+        return sum(own_slots[level] == MULTICLASS_SPELL_SLOTS[-(-level // levels_per_caster_level)]
+                   for level in casting_levels)
+
+    caster_type = max(CASTER_TYPES, key=lambda name: matches(CASTER_TYPES[name][0]))
+    contribution = CASTER_TYPES[caster_type][1]
+    return caster_type, own_slots, tuple(contribution(level) for level in range(MAX_LEVEL + 1))
+
+
+def caster_type(class_name, subclass=None):
+    """Return a class's caster type: 'full', 'half', 'third', 'pact' (Warlock), or None."""
+    return _caster_profile(class_name, subclass)[0]
+
+
+def caster_level(classes, subclasses=None):
+    """
+    Return the combined caster level for the multiclass Spellcaster table.
+
+    Args:
+        classes (dict): {class_name: class level}.
+        subclasses (dict, optional): {class_name: subclass name}, for subclasses that grant spellcasting.
+
+    Returns:
+        int: The combined caster level (Warlock levels don't count; they use Pact Magic).
+    """
+    subclasses = subclasses or {}
+    return sum(_caster_profile(name, subclasses.get(name))[2][level] for name, level in classes.items())
+
+
+def spell_slots(classes, subclasses=None):
+    """
+    Return the leveled spell slots (not Pact Magic) for a mix of classes.
+    A character with one spellcasting class uses that class's own table; with several, the multiclass table
+    at their combined caster level.
+
+    Args:
+        classes (dict): {class_name: class level}.
+        subclasses (dict, optional): {class_name: subclass name}, for subclasses that grant spellcasting.
+
+    Returns:
+        dict: {spell_level: slots}. Shared between callers; copy it before modifying.
+    """
+    subclasses = subclasses or {}
+    casters = []
+    for name, level in classes.items():
+        profile = _caster_profile(name, subclasses.get(name))
+        if profile[0] not in (None, 'pact') and profile[1][level]:
+            casters.append((profile, level))
+    if not casters:
+        return {}
+    if len(casters) == 1:
+        profile, level = casters[0]
+        return profile[1][level]
+    return MULTICLASS_SPELL_SLOTS[min(MAX_LEVEL, sum(profile[2][level] for profile, level in casters))]
+
+
+def pact_slots(classes):
+    """
+    Return Pact Magic slots as {slot_level: slots}, kept separate from leveled spell slots.
+
+    Args:
+        classes (dict): {class_name: class level}.
+
+    Returns:
+        dict: {slot_level: slots}, empty without Pact Magic. Shared between callers; copy it before modifying.
+    """
+    for name, level in classes.items():
+        profile = _caster_profile(name)
+        if profile[0] == 'pact':
+            return profile[1][level]
+    return {}
@@ -0,0 +1,177 @@
+"""
+equipment_parser.py
+-------------------
+The one parser for starting-equipment strings ("2 Daggers", "20 Arrows", "Leather Armor", "15 GP").
+Each string is matched once by a single compiled pattern, item names are resolved through a name table built
+once from the item catalog (exact names, plurals, and known misspellings), and results are memoized per string.
+A whole equipment option is parsed once into a StartingEquipment, so choosing it again does no parsing.
+
+Functions:
+    resolve_item_name(name): Returns the catalog name for an item name, plural, or alias, or None.
+    parse_item(text): Returns the ParsedItem for one equipment string.
+    parse_equipment_option(items): Returns the StartingEquipment for a list of equipment strings.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from equipment.inventory import Inventory
+from equipment.item_catalog import get_item_catalog, normalize_item_name
+
+# Amount and coin ("15 GP", "32GP"), a count and an item ("2 Daggers"), or just an item
+_ITEM_GRAMMAR = re.compile(
+    r"\s*(?:(?P<coins>\d+)\s*(?P<coin>[GSC]P)\b.*"
+    r"|(?P<count>\d+)\s+(?P<counted>\S.*?)"
+    r"|(?P<item>.*?))\s*",
+    re.IGNORECASE,
+)
+
+# Spellings in the equipment lists that differ from the catalog's
+ITEM_ALIASES = {
+    "Caligrapher's Supplies": "Calligrapher's Supplies",
+    "Carpeter's Tools": "Carpenter's Tools",
+    'Gaming Set (any)': 'Gaming Set',
+    'Pouces': 'Pouch',
+    "Thieve's Tools": "Thieves' Tools",
+    "Traveler's Cothes": "Traveler's Clothes",
+}
+
+
+def _plurals(name):
+    """Return the plural spellings of an item name (its last word pluralized)."""
+    forms = [name + 's', name + 'es']
+    if name.endswith('y'):
+        forms.append(name[:-1] + 'ies')
+    return forms
+
+
+@lru_cache(maxsize=1)
+def _name_table():
+    """Return {normalized name, plural, or alias: catalog name}; exact names take precedence over plurals."""
+    table = {}
+    catalog = get_item_catalog()
+    for record in catalog:
+        table[normalize_item_name(record.name)] = record.name
+    for alias, name in ITEM_ALIASES.items():
+        table.setdefault(normalize_item_name(alias), name)
+    for record in catalog:
+        for plural in _plurals(record.name):
+            table.setdefault(normalize_item_name(plural), record.name)
+    return table
+
+
+def resolve_item_name(name: str):
+    """
+    Return the catalog name for an item name in any case, plural, or known misspelling.
+
+    Returns:
+        str: The catalog name, or None if the item is not in the catalog.
+    """
+    return _name_table().get(normalize_item_name(name))
+
+
+class ParsedItem:
+    """
+    One parsed equipment string. Results are shared between callers and must not be modified.
+
+    Attributes:
+        kind (str): 'gold_pieces', 'silver_pieces', or 'copper_pieces' for coins, 'equipment' for armor, weapons,
+            and ammunition, or 'inventory' for everything else.
+        name (str): The item's catalog name, or the name as written for items outside the catalog (None for coins).
+        quantity (int): The number of items or coins.
+    """
+
+    __slots__ = ('kind', 'name', 'quantity')
+
+    def __init__(self, kind, name, quantity):
+        self.kind = kind
+        self.name = name
+        self.quantity = quantity
+
+    def __repr__(self):
+        return f"ParsedItem({self.kind!r}, {self.name!r}, {self.quantity})"
+
+
+_COIN_KINDS = {'gp': 'gold_pieces', 'sp': 'silver_pieces', 'cp': 'copper_pieces'}
+
+
+@lru_cache(maxsize=None)
+def parse_item(text: str) -> ParsedItem:
+    """
+    Parse one equipment string, e.g. "2 Daggers" -> ParsedItem('equipment', 'Dagger', 2).
+
+    Args:
+        text (str): The equipment string.
+
+    Returns:
+        ParsedItem: The parsed item (shared; do not modify).
+    """
+    match = _ITEM_GRAMMAR.fullmatch(text)
+    if match['coin']:
+        return ParsedItem(_COIN_KINDS[match['coin'].lower()], None, int(match['coins']))
+    if match['counted']:
+        quantity, written = int(match['count']), match['counted']
+    else:
+        quantity, written = 1, match['item']
+    name = resolve_item_name(written)
+    if name is None:
+        return ParsedItem('inventory', written, quantity)
+    kind = 'equipment' if get_item_catalog().get(name).is_equipment else 'inventory'
+    return ParsedItem(kind, name, quantity)
+
+
+class StartingEquipment:
+    """
+    A parsed equipment option: its equipment and inventory as (name, quantity) pairs, with duplicates merged,
+    and its coins. Shared between callers; inventories() returns fresh Inventory objects to give a character.
+
+    Attributes:
+        equipment (tuple): (name, quantity) pairs of armor, weapons, and ammunition.
+        inventory (tuple): (name, quantity) pairs of everything else.
+        gold_pieces (int), silver_pieces (int), copper_pieces (int): The coins in the option.
+    """
+
+    __slots__ = ('equipment', 'inventory', 'gold_pieces', 'silver_pieces', 'copper_pieces')
+
+    def __init__(self, parsed_items):
+        totals = {'equipment': {}, 'inventory': {}, 'gold_pieces': 0, 'silver_pieces': 0, 'copper_pieces': 0}
+        for item in parsed_items:
+            if item.name is None:
+                totals[item.kind] += item.quantity
+            else:
+                items = totals[item.kind]
+                items[item.name] = items.get(item.name, 0) + item.quantity
+        self.equipment = tuple(totals['equipment'].items())
+        self.inventory = tuple(totals['inventory'].items())
+        self.gold_pieces = totals['gold_pieces']
+        self.silver_pieces = totals['silver_pieces']
+        self.copper_pieces = totals['copper_pieces']
+
+    def inventories(self):
+        """Return new (equipment, inventory) Inventory objects holding the option's items."""
+        return Inventory(self.equipment), Inventory(self.inventory)
+
+    def as_tuple(self):
+        """Return (equipment, inventory, gold_pieces, silver_pieces, copper_pieces), with new Inventory objects."""
+        equipment, inventory = self.inventories()
+        return equipment, inventory, self.gold_pieces, self.silver_pieces, self.copper_pieces
+
+
+@lru_cache(maxsize=None)
+def _parse_option(items: tuple) -> StartingEquipment:
+    return StartingEquipment(parse_item(item) for item in items)
+
+
+def parse_equipment_option(items) -> StartingEquipment:
+    """
+    Parse an equipment option (a list of equipment strings), once per distinct option.
+
+    Args:
+        items (list or tuple): The option's equipment strings.
+
+    Returns:
+        StartingEquipment: The parsed option (shared; do not modify).
+    """
+    return _parse_option(tuple(items))
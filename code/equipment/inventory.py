@@ -0,0 +1,254 @@
+"""
+inventory.py
+------------
+Structured character inventories.
+An Inventory holds one InventoryEntry per item and container, with the item's quantity and whether it is equipped,
+so adding, removing, and merging items are dict operations, rendering needs no string parsing, and an inventory
+serializes to plain lists and dicts.
+
+Items are identified by name (the catalog's spelling for catalog items), which stays stable across runs.
+
+Functions:
+    item_label(item_id, quantity): Returns the display label for a quantity of an item (e.g. "Handaxe x 4").
+"""
+
+from __future__ import annotations
+
+from equipment.item_catalog import lookup_item
+
+
+def item_label(item_id: str, quantity: int) -> str:
+    """Return the display label for a quantity of an item, e.g. "Handaxe x 4" (just the name for one)."""
+    return f"{item_id} x {quantity}" if quantity > 1 else item_id
+
+
+def _canonical_id(item_id):
+    """Return the catalog's spelling of an item name, or the name itself for items outside the catalog."""
+    record = lookup_item(item_id)
+    return item_id if record is None else record.name
+
+
+class InventoryEntry:
+    """
+    A quantity of one item in one container.
+
+    Attributes:
+        item_id (str): The item's name (the catalog's spelling for catalog items).
+        quantity (int): How many the character has.
+        equipped (bool): Whether the item is worn or wielded.
+        container (str): The container it is carried in (e.g. 'Quiver'), or None.
+        record (ItemRecord): The item's catalog record, or None for items outside the catalog.
+    """
+
+    __slots__ = ('item_id', 'quantity', 'equipped', 'container', 'record')
+
+    def __init__(self, item_id, quantity=1, equipped=False, container=None, record=None):
+        self.item_id = item_id
+        self.quantity = quantity
+        self.equipped = equipped
+        self.container = container
+        self.record = record
+
+    @property
+    def label(self) -> str:
+        """The display label, e.g. "Handaxe x 4"."""
+        return item_label(self.item_id, self.quantity)
+
+    def as_dict(self) -> dict:
+        """Return the entry as a JSON-serializable dict."""
+        return {
+            'item': self.item_id,
+            'quantity': self.quantity,
+            'equipped': self.equipped,
+            'container': self.container,
+        }
+
+    def __repr__(self):
+        return (f"InventoryEntry({self.item_id!r}, {self.quantity}, equipped={self.equipped}, "
+                f"container={self.container!r})")
+
+
+class Inventory:
+    """
+    Items keyed by (item_id, container), in the order first added.
+
+    Adding an item already in the same container adds to its quantity; iteration yields InventoryEntry objects.
+    A change listener set with set_change_listener() is called after every add, remove, and equip.
+    """
+
+    __slots__ = ('_entries', '_quantities', '_on_change')
+
+    def __init__(self, items=()):
+        """
+        Args:
+            items (iterable, optional): Entries, item names, or (item name, quantity) pairs to add.
+        """
+        self._entries = {}
+        # item_id -> quantity across all containers
+        self._quantities = {}
+        self._on_change = None
+        self.extend(items)
+
+    def set_change_listener(self, callback) -> None:
+        """Call callback() after every change to the inventory (None to stop)."""
+        self._on_change = callback
+
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
+
+    def add(self, item_id: str, quantity: int = 1, equipped: bool = False, container: str = None) -> InventoryEntry:
+        """
+        Add a quantity of an item, merging it with the same item in the same container.
+
+        Args:
+            item_id (str): The item name; catalog items are stored under the catalog's spelling.
+            quantity (int, optional): How many to add. Defaults to 1.
+            equipped (bool, optional): Whether the item is equipped. Defaults to False.
+            container (str, optional): The container it goes in. Defaults to None.
+
+        Returns:
+            InventoryEntry: The entry holding the item.
+
+        Raises:
+            ValueError: If quantity is less than 1.
+        """
+        if quantity < 1:
+            raise ValueError(f"Cannot add {quantity} of {item_id}")
+        record = lookup_item(item_id)
+        if record is not None:
+            item_id = record.name
+        key = (item_id, container)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = InventoryEntry(item_id, quantity, equipped, container, record)
+        else:
+            entry.quantity += quantity
+            entry.equipped = entry.equipped or equipped
+        self._quantities[item_id] = self._quantities.get(item_id, 0) + quantity
+        self._changed()
+        return entry
+
+    def remove(self, item_id: str, quantity: int = 1, container: str = None) -> None:
+        """
+        Remove a quantity of an item from a container, dropping its entry when none are left.
+
+        Raises:
+            KeyError: If the item is not in that container.
+            ValueError: If there are fewer than quantity of it.
+        """
+        item_id = _canonical_id(item_id)
+        key = (item_id, container)
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(item_id)
+        if quantity > entry.quantity:
+            raise ValueError(f"Only {entry.quantity} of {item_id} to remove")
+        entry.quantity -= quantity
+        if not entry.quantity:
+            del self._entries[key]
+        self._quantities[item_id] -= quantity
+        if not self._quantities[item_id]:
+            del self._quantities[item_id]
+        self._changed()
+
+    def extend(self, items) -> None:
+        """Add entries, item names, or (item name, quantity) pairs."""
+        for item in items:
+            if isinstance(item, InventoryEntry):
+                self.add(item.item_id, item.quantity, item.equipped, item.container)
+            elif isinstance(item, str):
+                self.add(item)
+            else:
+                self.add(*item)
+
+    def merge(self, other: Inventory) -> None:
+        """Add every entry of another inventory to this one."""
+        self.extend(other)
+
+    def get(self, item_id: str, container: str = None):
+        """Return the entry for an item in a container, or None."""
+        return self._entries.get((_canonical_id(item_id), container))
+
+    def quantity(self, item_id: str) -> int:
+        """Return how many of an item there are, across all containers."""
+        return self._quantities.get(_canonical_id(item_id), 0)
+
+    def equip(self, item_id: str, equipped: bool = True, container: str = None) -> None:
+        """
+        Equip (or unequip) an item in a container.
+
+        Raises:
+            KeyError: If the item is not in that container.
+        """
+        entry = self.get(item_id, container)
+        if entry is None:
+            raise KeyError(item_id)
+        entry.equipped = equipped
+        self._changed()
+
+    def equipped(self) -> list:
+        """Return the equipped entries."""
+        return [entry for entry in self._entries.values() if entry.equipped]
+
+    def auto_equip(self) -> None:
+        """Equip the first body armor and the first shield, unless one of that kind is already equipped."""
+        armor = shield = None
+        for entry in self._entries.values():
+            record = entry.record
+            if record is None:
+                continue
+            if record.is_body_armor:
+                if entry.equipped:
+                    armor = False
+                elif armor is None:
+                    armor = entry
+            elif record.is_shield:
+                if entry.equipped:
+                    shield = False
+                elif shield is None:
+                    shield = entry
+        for entry in (armor, shield):
+            if entry:
+                entry.equipped = True
+        self._changed()
+
+    def labels(self) -> list:
+        """Return the display label of every entry, e.g. ["Handaxe x 4", "Shield"]."""
+        return [entry.label for entry in self._entries.values()]
+
+    def to_list(self) -> list:
+        """Return the inventory as a JSON-serializable list of entry dicts."""
+        return [entry.as_dict() for entry in self._entries.values()]
+
+    @classmethod
+    def from_list(cls, data) -> Inventory:
+        """Rebuild an inventory from to_list() output."""
+        inventory = cls()
+        for entry in data:
+            inventory.add(entry['item'], entry.get('quantity', 1), entry.get('equipped', False), entry.get('container'))
+        return inventory
+
+    def __reduce__(self):
+        # Copies and pickles hold just the entries: no catalog records and no change listener
+        return self.from_list, (self.to_list(),)
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, item_id):
+        return _canonical_id(item_id) in self._quantities
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self.to_list() == other.to_list()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Inventory({self.labels()!r})"
@@ -0,0 +1,152 @@
+"""
+item_catalog.py
+---------------
+One catalog of every item in the equipment dicts.
+Each item name maps, after normalization (case, spacing, and apostrophe style), to an ItemRecord with its
+category, subcategory, the proficiency that covers it, and its stats, so classifying an item is a single dict
+lookup instead of a membership test against each armor and weapon dict.
+
+A new item dict joins the catalog by adding a line to ITEM_SOURCES.
+
+Functions:
+    normalize_item_name(name): Returns the lookup key for an item name.
+    get_item_catalog(): Returns the shared ItemCatalog, building it on first use.
+    lookup_item(name): Returns an item's ItemRecord, or None if it is not in the catalog.
+"""
+
+from __future__ import annotations
+
+import importlib
+from functools import lru_cache
+
+# (module, dict constant, category, subcategory, proficiency that covers the whole dict)
+# Subcategory None takes each item's 'type' (e.g. "Artisan's Tools").
+ITEM_SOURCES = (
+    ('armor_dict', 'LIGHT_ARMOR_DICT', 'armor', 'light', 'Light Armor'),
+    ('armor_dict', 'MEDIUM_ARMOR_DICT', 'armor', 'medium', 'Medium Armor'),
+    ('armor_dict', 'HEAVY_ARMOR_DICT', 'armor', 'heavy', 'Heavy Armor'),
+    ('armor_dict', 'SHIELD_DICT', 'armor', 'shield', 'Shields'),
+    ('weapons_dict', 'SIMPLE_WEAPONS_DICT', 'weapon', 'simple', 'Simple Weapons'),
+    ('weapons_dict', 'MARTIAL_WEAPONS_DICT', 'weapon', 'martial', 'Martial Weapons'),
+    ('weapons_dict', 'AMMUNITION_DICT', 'ammunition', 'ammunition', None),
+    ('tools', 'TOOLS_DICT', 'tool', None, None),
+    ('misc_dict', 'ADVENTURING_GEAR_DICT', 'gear', 'adventuring gear', None),
+    ('misc_dict', 'EQUIPMENT_PACKS_DICT', 'gear', 'pack', None),
+)
+
+# Categories that go in a character's equipment rather than their inventory
+EQUIPMENT_CATEGORIES = frozenset({'armor', 'weapon', 'ammunition'})
+
+# Armor subcategories worn on the body (a shield is carried alongside)
+BODY_ARMOR = frozenset({'light', 'medium', 'heavy'})
+
+
+def normalize_item_name(name: str) -> str:
+    """Return the catalog key for an item name: casefolded, single-spaced, with straight apostrophes."""
+    return " ".join(name.replace("’", "'").split()).casefold()
+
+
+class ItemRecord:
+    """
+    One catalog item.
+
+    Attributes:
+        name (str): The item's name as written in its dict.
+        category (str): 'armor', 'weapon', 'ammunition', 'tool', or 'gear'.
+        subcategory (str): e.g. 'light', 'shield', 'simple', 'martial', "Artisan's Tools", 'pack'.
+        proficiency (str): The proficiency covering every item of the subcategory (e.g. 'Martial Weapons'), or None.
+        stats (dict): The item's entry in its source dict.
+        is_equipment (bool): True for armor, shields, weapons, and ammunition.
+        is_body_armor (bool): True for light, medium, and heavy armor (not shields).
+        is_shield (bool): True for shields.
+    """
+
+    __slots__ = ('name', 'category', 'subcategory', 'proficiency', 'stats', 'is_equipment', 'is_body_armor', 'is_shield')
+
+    def __init__(self, name, category, subcategory, proficiency, stats):
+        self.name = name
+        self.category = category
+        self.subcategory = subcategory
+        self.proficiency = proficiency
+        self.stats = stats
+        # Precomputed flags for the common classification checks
+        self.is_equipment = category in EQUIPMENT_CATEGORIES
+        self.is_body_armor = category == 'armor' and subcategory in BODY_ARMOR
+        self.is_shield = category == 'armor' and subcategory == 'shield'
+
+    def __repr__(self):
+        return f"ItemRecord({self.name!r}, {self.category!r}, {self.subcategory!r})"
+
+
+class ItemCatalog:
+    """
+    {normalized name: ItemRecord} over the dicts in ITEM_SOURCES.
+
+    Raises:
+        ValueError: On building, if two dicts define the same item.
+    """
+
+    def __init__(self, sources=ITEM_SOURCES):
+        self._items = {}
+        # Names exactly as written in the dicts, so the usual lookup skips normalizing
+        self._exact = {}
+        for module_name, constant, category, subcategory, proficiency in sources:
+            items = getattr(importlib.import_module(f".{module_name}", __package__), constant)
+            for name, stats in items.items():
+                key = normalize_item_name(name)
+                if key in self._items:
+                    raise ValueError(f"{name} in {constant} is already in the catalog")
+                self._items[key] = self._exact[name] = ItemRecord(
+                    name, category, subcategory or stats.get('type'), proficiency, stats)
+
+    def get(self, name, default=None):
+        """Return the ItemRecord for an item name, or default if it is not in the catalog."""
+        record = self._exact.get(name)
+        if record is None:
+            record = self._items.get(normalize_item_name(name), default)
+        return record
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def in_category(self, category, subcategory=None):
+        """Return the names of every item in a category (and subcategory), in catalog order."""
+        return [item.name for item in self._items.values()
+                if item.category == category and (subcategory is None or item.subcategory == subcategory)]
+
+
+# Exact item names -> ItemRecord for the shared catalog, filled when it is built, so lookup_item() usually costs one
+# dict lookup
+_records_by_name = {}
+
+
+@lru_cache(maxsize=1)
+def get_item_catalog() -> ItemCatalog:
+    """
+    Return the shared ItemCatalog, building it on first use.
+
+    Returns:
+        ItemCatalog: The item catalog.
+    """
+    catalog = ItemCatalog()
+    _records_by_name.update(catalog._exact)
+    return catalog
+
+
+def lookup_item(name: str):
+    """
+    Return the ItemRecord for an item name, or None if it is not in the catalog (or name is empty).
+
+    Args:
+        name (str): The item name, in any case or spacing.
+    """
+    record = _records_by_name.get(name)
+    if record is None and name:
+        record = get_item_catalog().get(name)
+    return record
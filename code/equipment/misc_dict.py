@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+ADVENTURING_GEAR_DICT: dict[str, dict] = {
+    'Bedroll': {
+        'weight': 7,
+        'cost': 1,
+    },
+    'Costume': {
+        'weight': 4,
+        'cost': 5,
+    },
+    'Crowbar': {
+        'weight': 5,
+        'cost': 2,
+    },
+    'Fine Clothes': {
+        'weight': 6,
+        'cost': 15,
+    },
+    "Healer's Kit": {
+        'weight': 3,
+        'cost': 5,
+    },
+    'Holy Symbol': {
+        'weight': 1,
+        'cost': 5,
+    },
+    'Hooded Lantern': {
+        'weight': 2,
+        'cost': 5,
+    },
+    'Iron Pot': {
+        'weight': 10,
+        'cost': 2,
+    },
+    'Lamp': {
+        'weight': 1,
+        'cost': 0.5,
+    },
+    'Manacles': {
+        'weight': 6,
+        'cost': 2,
+    },
+    'Mirror': {
+        'weight': 0.5,
+        'cost': 5,
+    },
+    'Perfume': {
+        'weight': 0,
+        'cost': 5,
+    },
+    'Pouch': {
+        'weight': 1,
+        'cost': 0.5,
+    },
+    'Quiver': {
+        'weight': 1,
+        'cost': 1,
+    },
+    'Robe': {
+        'weight': 4,
+        'cost': 1,
+    },
+    'Shovel': {
+        'weight': 5,
+        'cost': 2,
+    },
+    "Traveler's Clothes": {
+        'weight': 4,
+        'cost': 2,
+    },
+}
+
+EQUIPMENT_PACKS_DICT: dict[str, dict] = {
+    "Burglar's Pack": {
+        'weight': 42,
+        'cost': 16,
+    },
+    "Diplomat's Pack": {
+        'weight': 39,
+        'cost': 39,
+    },
+    "Dungeoneer's Pack": {
+        'weight': 55,
+        'cost': 12,
+    },
+    "Entertainer's Pack": {
+        'weight': 58.5,
+        'cost': 40,
+    },
+    "Explorer's Pack": {
+        'weight': 55,
+        'cost': 10,
+    },
+    "Priest's Pack": {
+        'weight': 29,
+        'cost': 33,
+    },
+    "Scholar's Pack": {
+        'weight': 22,
+        'cost': 40,
+    },
+}
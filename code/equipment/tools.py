@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+TOOLS_DICT: dict[str, dict] = {
+    "Alchemist's Supplies": {
+        'type': "Artisan's Tools",
+        'ability': 'Intelligence',
+        'weight': 8,
+        'cost': 50,
+    },
+    "Brewer's Supplies": {
+        'type': "Artisan's Tools",
+        'ability': 'Intelligence',
+        'weight': 9,
+        'cost': 20,
+    },
+    "Calligrapher's Supplies": {
+        'type': "Artisan's Tools",
+        'ability': 'Dexterity',
+        'weight': 5,
+        'cost': 10,
+    },
+    "Carpenter's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Strength',
+        'weight': 6,
+        'cost': 8,
+    },
+    "Cartographer's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Wisdom',
+        'weight': 6,
+        'cost': 15,
+    },
+    "Cobbler's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Dexterity',
+        'weight': 5,
+        'cost': 5,
+    },
+    "Cook's Utensils": {
+        'type': "Artisan's Tools",
+        'ability': 'Wisdom',
+        'weight': 8,
+        'cost': 1,
+    },
+    "Glassblower's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Intelligence',
+        'weight': 5,
+        'cost': 30,
+    },
+    "Jeweler's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Intelligence',
+        'weight': 2,
+        'cost': 25,
+    },
+    "Leatherworker's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Dexterity',
+        'weight': 5,
+        'cost': 5,
+    },
+    "Mason's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Strength',
+        'weight': 8,
+        'cost': 10,
+    },
+    "Painter's Supplies": {
+        'type': "Artisan's Tools",
+        'ability': 'Wisdom',
+        'weight': 5,
+        'cost': 10,
+    },
+    "Potter's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Intelligence',
+        'weight': 3,
+        'cost': 10,
+    },
+    "Smith's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Strength',
+        'weight': 8,
+        'cost': 20,
+    },
+    "Tinker's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Dexterity',
+        'weight': 10,
+        'cost': 50,
+    },
+    "Weaver's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Dexterity',
+        'weight': 5,
+        'cost': 1,
+    },
+    "Woodcarver's Tools": {
+        'type': "Artisan's Tools",
+        'ability': 'Dexterity',
+        'weight': 5,
+        'cost': 1,
+    },
+    'Disguise Kit': {
+        'type': 'Other Tools',
+        'ability': 'Charisma',
+        'weight': 3,
+        'cost': 25,
+    },
+    'Forgery Kit': {
+        'type': 'Other Tools',
+        'ability': 'Dexterity',
+        'weight': 5,
+        'cost': 15,
+    },
+    'Gaming Set': {
+        'type': 'Other Tools',
+        'ability': 'Wisdom',
+        'weight': 0,
+        'cost': 1,
+    },
+    'Herbalism Kit': {
+        'type': 'Other Tools',
+        'ability': 'Intelligence',
+        'weight': 3,
+        'cost': 5,
+    },
+    'Musical Instrument': {
+        'type': 'Other Tools',
+        'ability': 'Charisma',
+        'weight': 3,
+        'cost': 30,
+    },
+    "Navigator's Tools": {
+        'type': 'Other Tools',
+        'ability': 'Wisdom',
+        'weight': 2,
+        'cost': 25,
+    },
+    "Poisoner's Kit": {
+        'type': 'Other Tools',
+        'ability': 'Intelligence',
+        'weight': 2,
+        'cost': 50,
+    },
+    "Thieves' Tools": {
+        'type': 'Other Tools',
+        'ability': 'Dexterity',
+        'weight': 1,
+        'cost': 25,
+    },
+}
@@ -0,0 +1,83 @@
+"""
+weapons_utils.py
+----------------
+Helper functions for D&D 5e weapons.
+Weapon damage strings from weapons_dict are rolled through the compiled dice expressions in misc.dice_expressions.
+
+Functions:
+    get_weapon(weapon_name): Returns the weapon's data from SIMPLE_WEAPONS_DICT or MARTIAL_WEAPONS_DICT.
+    weapon_damage_expression(weapon_name, ability_modifier=0, two_handed=False, great_weapon_fighting=False): Builds the damage dice expression.
+    roll_weapon_damage(weapon_name, ability_modifier=0, two_handed=False, great_weapon_fighting=False, rng=None): Rolls weapon damage.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Tuple
+
+from equipment.weapons_dict import SIMPLE_WEAPONS_DICT, MARTIAL_WEAPONS_DICT
+from misc.dice_expressions import compile_dice, parse_damage_string
+
+_VERSATILE_PATTERN = re.compile(r"Versatile \((\w+)\)")
+
+
+def get_weapon(weapon_name: str) -> dict:
+    """
+    Return the data for a simple or martial weapon.
+
+    Raises:
+        ValueError: If the weapon is unknown
+    """
+    weapon = SIMPLE_WEAPONS_DICT.get(weapon_name) or MARTIAL_WEAPONS_DICT.get(weapon_name)
+    if weapon is None:
+        raise ValueError(f"Unknown weapon: {weapon_name}")
+    return weapon
+
+
+def weapon_damage_expression(weapon_name: str, ability_modifier: int = 0, two_handed: bool = False,
+                             great_weapon_fighting: bool = False) -> Tuple[str, str]:
+    """
+    Build the dice expression for a weapon's damage.
+
+    Args:
+        weapon_name (str): Name of the weapon
+        ability_modifier (int): Ability modifier added to the damage (default: 0)
+        two_handed (bool): Wielding a Versatile weapon in two hands, using its larger damage die
+        great_weapon_fighting (bool): Apply the Great Weapon Fighting style (treat 1s and 2s as 3s) to
+            melee weapons with the Two-Handed property or Versatile weapons held in two hands
+
+    Returns:
+        tuple: (dice expression, damage type), e.g. ("1d10mi3+3", "slashing")
+    """
+    weapon = get_weapon(weapon_name)
+    dice, damage_type = parse_damage_string(weapon['damage'])
+    expression = str(dice)
+    properties = weapon.get('properties', [])
+    versatile = next((m.group(1) for m in map(_VERSATILE_PATTERN.match, properties) if m), None)
+    if two_handed and versatile:
+        expression = versatile
+    if (great_weapon_fighting and 'Melee' in weapon.get('type', '') and 'd' in expression
+            and ('Two-Handed' in properties or (two_handed and versatile))):
+        expression += "mi3"
+    if ability_modifier:
+        expression += f"{ability_modifier:+d}"
+    return expression, damage_type
+
+
+def roll_weapon_damage(weapon_name: str, ability_modifier: int = 0, two_handed: bool = False,
+                       great_weapon_fighting: bool = False, rng=None) -> Tuple[int, str]:
+    """
+    Roll damage for a weapon hit. The damage expression is compiled once and cached.
+
+    Args:
+        weapon_name (str): Name of the weapon
+        ability_modifier (int): Ability modifier added to the damage (default: 0)
+        two_handed (bool): Wielding a Versatile weapon in two hands
+        great_weapon_fighting (bool): Apply the Great Weapon Fighting style
+        rng (random.Random, optional): Random number generator to use
+
+    Returns:
+        tuple: (damage, damage type); damage is never less than 0
+    """
+    expression, damage_type = weapon_damage_expression(weapon_name, ability_modifier, two_handed, great_weapon_fighting)
+    return max(0, compile_dice(expression).roll(rng)), damage_type
@@ -0,0 +1,402 @@
+"""
+Incremental level-up for the D&D character creator project.
+Advances an existing charGen one level at a time by applying only what changes between level N and N+1
+(features, hit points, proficiency bonus, spell slots, new spells and invocations, Ability Score Improvements),
+instead of re-running character creation at the new level. Each level can go to any class, for multiclassing.
+
+plan_level_up() returns the change as a dict without touching the character, so a UI can preview it;
+apply_level_up() applies a plan, prompting for choices unless they are given.
+"""
+
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+
+from character_creation import charGen, get_proficiency_bonus
+from misc.dice_rolling import roll_die
+from misc.invocations import ELDRITCH_INVOCATIONS, invocation_prereqs_met
+from misc.stats import ABILITY_NAMES, calc_hp
+from classes.class_progression import MAX_LEVEL, get_class_progression
+from classes.multiclass import pact_slots, spell_slots
+from classes.class_utils import (AVAILABLE_CLASSES, choose_subclass, get_available_spell_levels, learn_invocation,
+                                 learn_spell, subclass_feature, validate_subclass)
+from spells.spell_set import SpellSet
+from spells.spells_utils import filter_spells_by_class_and_known, get_spell_dicts
+from InquirerPy import inquirer
+
+ASI_FEATURE = 'Ability Score Improvement'
+# 'average' and 'max' are fixed per level; 'roll' rolls the hit die
+HP_METHODS = ('average', 'roll', 'max')
+MAX_ABILITY_SCORE = 20
+
+
+def _spells_known(spellcasting):
+    """Return (cantrips, leveled spells) a spellcasting row allows, counted the way learn_spell counts them."""
+    spellcasting = spellcasting or {}
+    return (spellcasting.get('cantrips_known', 0),
+            spellcasting.get('spells_known', spellcasting.get('spells_prepared', 0)))
+
+
+@lru_cache(maxsize=None)
+def _level_delta(class_name, class_level):
+    """
+    Return the part of a level-up that depends only on the class and the new level in it, so it is worked out
+    once per class and level however many characters advance through it.
+    """
+    progression = get_class_progression(class_name)
+    old_row = progression.spellcasting(class_level - 1) if class_level > 1 else None
+    new_row = progression.spellcasting(class_level)
+    resources = {}
+    for name in progression.resource_names:
+        # Proficiency bonus goes by character level, not class level
+        if name == 'proficiency_bonus':
+            continue
+        old = progression.resource(name, class_level - 1) if class_level > 1 else None
+        new = progression.resource(name, class_level)
+        if old != new:
+            resources[name] = (old, new)
+    old_cantrips, old_spells = _spells_known(old_row)
+    new_cantrips, new_spells = _spells_known(new_row)
+    old_invocations, new_invocations = resources.get('eldritch_invocations', (0, 0))
+    features = progression.features_at(class_level)
+    return {
+        'features': features,
+        'spellcasting': new_row,
+        'resources': resources,
+        'cantrips_to_learn': max(0, new_cantrips - old_cantrips),
+        'spells_to_learn': max(0, new_spells - old_spells),
+        'invocations_to_learn': max(0, (new_invocations or 0) - (old_invocations or 0)),
+        'ability_score_improvement': ASI_FEATURE in features,
+    }
+
+
+def character_classes(character):
+    """Return {class_name: class level} for a character (a single class if it has never multiclassed)."""
+    return dict(getattr(character, 'classes', None) or {character.class_name: character.level})
+
+
+def _hit_die(class_name):
+    """Return a class's hit die size as an int (tables give 12 or 'd12')."""
+    return int(str(AVAILABLE_CLASSES[class_name][0]['hit_die']).lstrip('dD'))
+
+
+def _hit_die_value(hit_die, method, rng=None):
+    """Return the hit die's average (rounded up), its maximum, or a roll of it."""
+    if method == 'average':
+        return hit_die // 2 + 1
+    if method == 'max':
+        return hit_die
+    if method == 'roll':
+        return roll_die(hit_die, rng)
+    raise ValueError(f"Unknown HP method {method!r}; expected one of {', '.join(HP_METHODS)}")
+
+
+def hp_gain(hit_die, con_mod, method='average', tough=False, rng=None):
+    """
+    Hit points gained for one level, via calc_hp: the hit die's average (rounded up), its maximum, or a roll,
+    plus the Constitution modifier (and 2 for Tough), at least 1.
+
+    Args:
+        hit_die (int): The hit die size (e.g. 10 for d10).
+        con_mod (int): The Constitution modifier.
+        method (str, optional): 'average', 'max', or 'roll'. Defaults to 'average'.
+        tough (bool, optional): Whether the character has the Tough feat.
+        rng (random.Random, optional): Random number stream for 'roll'. Defaults to the random module.
+
+    Returns:
+        int: The hit points gained.
+    """
+    return max(1, calc_hp(_hit_die_value(hit_die, method, rng), con_mod, 1, tough))
+
+
+def plan_level_up(character: charGen, hp_method: str = 'average', class_name: str = None) -> dict:
+    """
+    Work out what advancing a character one level changes, without changing the character.
+
+    Args:
+        character (charGen): A character with a class.
+        hp_method (str, optional): 'average', 'max', or 'roll' (HP gain is then unknown until applied).
+        class_name (str, optional): The class to gain a level in; a class the character doesn't have yet
+            multiclasses into it. Defaults to the character's (first) class.
+
+    Returns:
+        dict: The level-up plan:
+            - 'class_name', 'class_level': The class leveled, and its (old, new) level
+            - 'from_level', 'to_level': Character level before and after
+            - 'multiclass': Whether this level adds a new class
+            - 'features': Features gained at the new class level
+            - 'hp_gain': Hit points gained (before any Constitution increase), or None for 'roll'
+            - 'hp_method', 'hit_die'
+            - 'proficiency_bonus': (old, new)
+            - 'spell_slots', 'pact_slots': (old, new), each {spell_level: count}
+            - 'spellcasting': The class's spellcasting row at the new class level, or None
+            - 'cantrips_to_learn', 'spells_to_learn', 'invocations_to_learn': New choices to make
+            - 'resources': {name: (old, new)} for the class's per-level resources that change (rages, sorcery points, ...)
+            - 'ability_score_improvement': Whether the new class level grants an Ability Score Improvement
+
+    Raises:
+        ValueError: If the class is unknown or the character is already at the maximum level.
+    """
+    class_name = class_name or character.class_name
+    if class_name not in AVAILABLE_CLASSES:
+        raise ValueError(f"{class_name or 'The character'} is not a class that can level up")
+    if character.level >= MAX_LEVEL:
+        raise ValueError(f"{character.name or 'The character'} is already level {MAX_LEVEL}")
+    classes = character_classes(character)
+    new_classes = dict(classes)
+    new_classes[class_name] = classes.get(class_name, 0) + 1
+    subclasses = getattr(character, 'subclasses', None)
+    # A shallow copy: the nested per-level values are shared between plans and must not be modified
+    plan = dict(_level_delta(class_name, new_classes[class_name]))
+    plan.update(
+        class_name=class_name,
+        class_level=(classes.get(class_name, 0), new_classes[class_name]),
+        from_level=character.level,
+        to_level=character.level + 1,
+        multiclass=class_name not in classes,
+        hp_method=hp_method,
+        hit_die=_hit_die(class_name),
+        proficiency_bonus=(get_proficiency_bonus(character.level), get_proficiency_bonus(character.level + 1)),
+        spell_slots=(spell_slots(classes, subclasses), spell_slots(new_classes, subclasses)),
+        pact_slots=(pact_slots(classes), pact_slots(new_classes)),
+    )
+    plan['hp_gain'] = None if hp_method == 'roll' else hp_gain(
+        plan['hit_die'], character.con_mod, hp_method, character.has_feat('Tough'))
+    return plan
+
+
+def _apply_ability_increases(character, increases):
+    """
+    Apply an Ability Score Improvement: +2 to one ability or +1 to two, no score above 20.
+
+    Raises:
+        ValueError: If the increases are not a legal Ability Score Improvement.
+    """
+    if sum(increases.values()) != 2 or any(value < 1 for value in increases.values()):
+        raise ValueError("An Ability Score Improvement is +2 to one ability or +1 to two abilities")
+    for ability, value in increases.items():
+        if ability not in ABILITY_NAMES:
+            raise ValueError(f"{ability} is not an ability")
+        if character.ability_scores[ability] + value > MAX_ABILITY_SCORE:
+            raise ValueError(f"{ability} cannot be increased above {MAX_ABILITY_SCORE}")
+    for ability, value in increases.items():
+        character.ability_scores[ability] += value
+
+
+def _prompt_ability_increases(character):
+    """Prompt for an Ability Score Improvement as two +1 increases (choose the same ability twice for +2)."""
+    increases = {}
+    for step in ("first", "second"):
+        choices = [name for name in ABILITY_NAMES
+                   if character.ability_scores[name] + increases.get(name, 0) < MAX_ABILITY_SCORE]
+        if not choices:
+            break
+        ability = inquirer.select(
+            message=f"Ability Score Improvement: choose the {step} ability to increase by 1:",
+            choices=choices
+        ).execute()
+        increases[ability] = increases.get(ability, 0) + 1
+    return increases
+
+
+def apply_level_up(character: charGen, plan: dict = None, choices: dict = None, rng=None) -> dict:
+    """
+    Advance a character one level by applying a level-up plan.
+    Prompts for a subclass, new spells, invocations, and Ability Score Improvements unless choices is given.
+
+    Args:
+        character (charGen): The character to advance.
+        plan (dict, optional): A plan from plan_level_up() for this character at its current level.
+            Defaults to plan_level_up(character).
+        choices (dict, optional): Choices instead of prompts:
+            - 'spells': {spell_level: [spell_name, ...]}, 0 for cantrips
+            - 'invocations': [invocation_name, ...]
+            - 'ability_increases': e.g. {'Strength': 2} or {'Strength': 1, 'Constitution': 1}
+            - 'subclass': The subclass, at the class level that grants one
+        rng (random.Random, optional): Random number stream for rolled hit points. Defaults to character.rng.
+
+    Returns:
+        dict: The plan, with 'hp_gain' set to the hit points actually gained (including any retroactive
+            Constitution increase) and 'subclass', 'new_spells', 'new_invocations', and 'ability_increases' filled in.
+
+    Raises:
+        ValueError: If the plan is for another level or class, or a choice is not legal.
+    """
+    if plan is None:
+        plan = plan_level_up(character)
+    classes = character_classes(character)
+    class_name = plan['class_name']
+    if plan['from_level'] != character.level or plan['class_level'][0] != classes.get(class_name, 0):
+        raise ValueError(f"Level-up plan is for a level {plan['from_level']} character with "
+                         f"{plan['class_level'][0]} {class_name} levels")
+    if rng is None:
+        rng = character.rng
+    result = dict(plan)
+    class_level = plan['class_level'][1]
+
+    # Ability Score Improvement (before HP, so a Constitution increase counts for the new level)
+    old_hp = character.hp or 0
+    increases = {}
+    if plan['ability_score_improvement'] and character.ability_scores:
+        if choices is None:
+            increases = _prompt_ability_increases(character)
+        else:
+            increases = choices.get('ability_increases', {})
+        if increases:
+            _apply_ability_increases(character, increases)
+    result['ability_increases'] = increases
+
+    # Hit points: the new level's hit die; hp is derived from every level's die, so a Constitution modifier
+    # increase also counts for every earlier level
+    character.hit_point_dice.append(_hit_die_value(plan['hit_die'], plan['hp_method'], rng))
+    result['hp_gain'] = character.hp - old_hp
+
+    classes[class_name] = class_level
+    character.classes = classes
+    character.level = plan['to_level']
+    character.proficiency_bonus = plan['proficiency_bonus'][1]
+    # Features of classes multiclassed into are labelled with their class
+    features = plan['features']
+    if class_name != character.class_name:
+        features = [f"{feature} ({class_name})" for feature in features]
+    character.class_features = list(getattr(character, 'class_features', []) or []) + list(features)
+    character.class_resources = {}
+    for name, level in classes.items():
+        resources = get_class_progression(name).resources(level)
+        resources.pop('proficiency_bonus', None)
+        character.class_resources.update(resources)
+    character.spell_slots = dict(plan['spell_slots'][1])
+    character.pact_slots = dict(plan['pact_slots'][1])
+
+    # Subclass; one that grants spellcasting (e.g. Eldritch Knight) adds spell slots from this level on
+    subclass = None
+    if subclass_feature(class_name) in plan['features']:
+        if choices is None:
+            subclass = choose_subclass(class_name)
+        else:
+            subclass = validate_subclass(class_name, choices.get('subclass'))
+        character.subclasses = {**(getattr(character, 'subclasses', None) or {}), class_name: subclass}
+        character.spell_slots = dict(spell_slots(classes, character.subclasses))
+        result['spell_slots'] = (plan['spell_slots'][0], character.spell_slots)
+    result['subclass'] = subclass
+
+    # Spells, learned as the class's new cantrips and spells on top of those already known
+    new_spells = []
+    if plan['cantrips_to_learn'] or plan['spells_to_learn']:
+        if not hasattr(character, 'known_spells'):
+            character.known_spells = {}
+        spellcasting = dict(plan['spellcasting'])
+        spellcasting['cantrips_known'] = len(character.known_spells.get('Cantrips', {})) + plan['cantrips_to_learn']
+        spell_levels = get_available_spell_levels(class_name, spellcasting)
+        spellcasting['spells_known'] = (len(SpellSet.from_known_spells(character.known_spells, spell_levels))
+                                        + plan['spells_to_learn'])
+        chosen_spells = None if choices is None else {int(lvl): names for lvl, names in choices.get('spells', {}).items()}
+        new_spells = learn_spell(class_name, spellcasting, character.known_spells,
+                                 getattr(character, 'class_feature_spells', {}), chosen_spells=chosen_spells)
+        for spell_level, spell_name, spell_data in new_spells:
+            level_key = 'Cantrips' if spell_level == 0 else str(spell_level)
+            character.known_spells.setdefault(level_key, {})[spell_name] = spell_data
+    result['new_spells'] = new_spells
+
+    # Eldritch Invocations (level prerequisites go by Warlock level)
+    new_invocations = []
+    if plan['invocations_to_learn']:
+        known_invocations = list(getattr(character, 'new_eldritch_invocations', []) or [])
+        new_invocations = learn_invocation(
+            len(known_invocations) + plan['invocations_to_learn'],
+            set(known_invocations),
+            character_level=class_level,
+            known_cantrips=set(getattr(character, 'known_spells', {}).get('Cantrips', {})),
+            chosen_invocations=None if choices is None else choices.get('invocations', []),
+        )
+        character.new_eldritch_invocations = known_invocations + new_invocations
+    result['new_invocations'] = new_invocations
+    return result
+
+
+def random_level_up_choices(character: charGen, plan: dict, rng: random.Random = None) -> dict:
+    """
+    Draw random but legal choices for apply_level_up() from rng.
+
+    Args:
+        character (charGen): The character about to level up.
+        plan (dict): The character's plan from plan_level_up().
+        rng (random.Random, optional): Random number generator to draw choices from. Defaults to a new unseeded one.
+
+    Returns:
+        dict: Choices accepted by apply_level_up().
+    """
+    if rng is None:
+        rng = random.Random()
+    choices = {'spells': {}}
+    class_name = plan['class_name']
+    known_spells = getattr(character, 'known_spells', {}) or {}
+    feature_spells = getattr(character, 'class_feature_spells', {}) or {}
+    spell_dicts = get_spell_dicts()
+    if plan['cantrips_to_learn']:
+        cantrips = list(filter_spells_by_class_and_known(
+            spell_dicts[0], class_name, SpellSet.from_known_spells(known_spells, 0), feature_spells.get(0, {})))
+        choices['spells'][0] = rng.sample(cantrips, min(plan['cantrips_to_learn'], len(cantrips)))
+    if plan['spells_to_learn']:
+        spell_levels = get_available_spell_levels(class_name, plan['spellcasting'])
+        # Names are skipped once known or taken at any level, as a few spells are listed at two levels
+        taken = SpellSet.from_known_spells(known_spells, spell_levels)
+        leveled = []
+        for spell_level in spell_levels:
+            if spell_level not in spell_dicts:
+                continue
+            available = filter_spells_by_class_and_known(
+                spell_dicts[spell_level], class_name, taken, feature_spells.get(spell_level, {}))
+            leveled.extend((spell_level, name) for name in available)
+            taken |= SpellSet(available)
+        for spell_level, name in rng.sample(leveled, min(plan['spells_to_learn'], len(leveled))):
+            choices['spells'].setdefault(spell_level, []).append(name)
+    if plan['invocations_to_learn']:
+        known = set(getattr(character, 'new_eldritch_invocations', []) or [])
+        cantrips = set(known_spells.get('Cantrips', {}))
+        candidates = [name for name in ELDRITCH_INVOCATIONS if name not in known]
+        rng.shuffle(candidates)
+        choices['invocations'] = []
+        for name in candidates:
+            if len(choices['invocations']) >= plan['invocations_to_learn']:
+                break
+            if invocation_prereqs_met(name, plan['class_level'][1], cantrips, known):
+                choices['invocations'].append(name)
+                known.add(name)
+    if subclass_feature(class_name) in plan['features']:
+        choices['subclass'] = rng.choice(list(AVAILABLE_CLASSES[class_name][3]))
+    if plan['ability_score_improvement'] and character.ability_scores:
+        open_abilities = [name for name in ABILITY_NAMES if character.ability_scores[name] < MAX_ABILITY_SCORE]
+        two_point = [name for name in open_abilities if character.ability_scores[name] <= MAX_ABILITY_SCORE - 2]
+        if two_point and (len(open_abilities) < 2 or rng.random() < 0.5):
+            choices['ability_increases'] = {rng.choice(two_point): 2}
+        elif len(open_abilities) >= 2:
+            choices['ability_increases'] = dict.fromkeys(rng.sample(open_abilities, 2), 1)
+    return choices
+
+
+def advance_character(character: charGen, target_level: int, rng=None, hp_method: str = 'average',
+                      class_name: str = None) -> list:
+    """
+    Level a character up to target_level one level at a time, with random choices (e.g. for NPCs).
+
+    Args:
+        character (charGen): The character to advance.
+        target_level (int): The level to reach.
+        rng (random.Random, optional): Random number stream for choices and rolled hit points. Defaults to character.rng.
+        hp_method (str, optional): 'average', 'max', or 'roll'. Defaults to 'average'.
+        class_name (str, optional): The class to take the levels in. Defaults to the character's class.
+
+    Returns:
+        list: The applied plan for each level gained.
+    """
+    if not character.level <= target_level <= MAX_LEVEL:
+        raise ValueError(f"Cannot advance a level {character.level} character to level {target_level}")
+    if rng is None:
+        rng = character.rng or random.Random()
+    applied = []
+    while character.level < target_level:
+        plan = plan_level_up(character, hp_method, class_name)
+        applied.append(apply_level_up(character, plan, random_level_up_choices(character, plan, rng), rng))
+    return applied
@@ -1,22 +1,54 @@
 """
 Main entry point for the D&D character creator CLI.
 Presents a menu for species and spell selection, or exit.
+Also provides the 'generate' subcommand for bulk random character generation.
 """
 
+import argparse
+import os
+
 from InquirerPy import inquirer
 
 
-def main():
+def parse_args(argv=None):
+    """
+    Parse command-line arguments. With no subcommand, the interactive menu is shown.
+    """
+    from bulk_generator import DEFAULT_CHUNK_SIZE
+    parser = argparse.ArgumentParser(description="D&D 5e character creator")
+    subparsers = parser.add_subparsers(dest="command")
+    generate = subparsers.add_parser("generate", help="Generate random characters as JSON Lines")
+    generate.add_argument("count", type=int, help="Number of characters to generate")
+    destination = generate.add_mutually_exclusive_group()
+    destination.add_argument("-o", "--output", help="Output file (default: stdout)")
+    destination.add_argument("--db", help="Save the characters to this character database (SQLite) instead")
+    generate.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                          help="Number of worker processes (default: CPU count)")
+    generate.add_argument("--seed", type=int, help="Master seed for reproducible output (default: random)")
+    generate.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                          help=f"Characters per chunk written and flushed at once (default: {DEFAULT_CHUNK_SIZE})")
+    generate.add_argument("--level", type=int, default=1, help="Character level (default: 1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
     Main menu loop for the character creator.
-    Allows the user to select between species, spells, or exit.
+    Allows the user to select between species, spells, spell search, loading a saved character, or exit.
     """
+    args = parse_args(argv)
+    if args.command == "generate":
+        from bulk_generator import run_generate
+        run_generate(args.count, args.output, args.workers, args.seed, args.chunk_size, args.level, args.db)
+        return
     while True:
         choice = inquirer.select(
             message="Main Menu:",
             choices=[
                 {"name": "Species", "value": "species"},
                 {"name": "Spells", "value": "spells"},
+                {"name": "Search Spells", "value": "search_spells"},
+                {"name": "Load Character", "value": "load_character"},
                 {"name": "Exit", "value": "exit"}
             ],
         ).execute()
@@ -27,10 +59,16 @@ def main():
         elif choice == "spells":
             from spells import prompt_and_print_class_spell_list
             prompt_and_print_class_spell_list()
+        elif choice == "search_spells":
+            from spells.spells import prompt_spell_search
+            prompt_spell_search()
+        elif choice == "load_character":
+            from character_store import prompt_load_character
+            prompt_load_character()
         elif choice == "exit":
             print("Goodbye!")
             break
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,4 +1,6 @@
 # __init__.py for misc package
 
 from .stats import *
-from .dice_rolling import *
\ No newline at end of file
+from .dice_rolling import *
+from .dice_probability import *
+from .dice_expressions import *
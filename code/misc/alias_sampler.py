@@ -0,0 +1,159 @@
+"""
+Alias-method sampling for finite distributions.
+An AliasSampler is built once from any set of weighted outcomes (a DiceDistribution, a d100 table, ...);
+after that every draw costs one uniform random number and one table lookup, and batch draws are vectorized
+with NumPy.
+"""
+
+import random
+from functools import lru_cache
+from typing import Dict, Hashable, List, Sequence
+
+from .dice_probability import DiceDistribution, roll_distribution
+from .dice_rolling import np, _numpy_generator
+
+
+class AliasSampler:
+    """
+    Samples from a finite distribution in O(1) per draw using Vose's alias method.
+    """
+
+    __slots__ = ("outcomes", "_probabilities", "_aliases", "_size", "_outcome_array")
+
+    def __init__(self, outcomes: Sequence[Hashable], weights: Sequence[float]):
+        """
+        Build the alias table.
+
+        Args:
+            outcomes (Sequence): The possible outcomes
+            weights (Sequence[float]): Relative weight of each outcome (need not sum to 1)
+
+        Raises:
+            ValueError: If outcomes and weights don't match up, or any weight is negative
+        """
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("Need the same, non-zero number of outcomes and weights")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Weights cannot be negative")
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("At least one weight must be positive")
+        size = len(outcomes)
+        scaled = [weight * size / total for weight in weights]
+        probabilities = [1.0] * size
+        aliases = list(range(size))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Anything left over is 1 up to floating point error
+        self.outcomes = tuple(outcomes)
+        self._probabilities = probabilities
+        self._aliases = aliases
+        self._size = size
+        self._outcome_array = None
+
+    @classmethod
+    def from_distribution(cls, distribution: DiceDistribution) -> "AliasSampler":
+        """
+        Build a sampler for the totals of a dice distribution.
+        """
+        pmf = distribution.pmf
+        return cls(list(pmf), list(pmf.values()))
+
+    @classmethod
+    def from_range_table(cls, table: Dict[str, object]) -> "AliasSampler":
+        """
+        Build a sampler over the keys of a d100 style table keyed by ranges, e.g. "01-04" or "97-00",
+        weighting each key by how many die results it covers. "00" is read as 100.
+
+        Raises:
+            ValueError: If a key is not a number or a range of numbers
+        """
+        def face(text: str) -> int:
+            value = int(text)
+            return 100 if value == 0 and len(text) == 2 else value
+
+        weights = []
+        for key in table:
+            low, _, high = key.partition("-")
+            try:
+                weights.append(face(high or low) - face(low) + 1)
+            except ValueError:
+                raise ValueError(f"Invalid table range: '{key}'") from None
+        return cls(list(table), weights)
+
+    def sample(self, rng=None):
+        """
+        Draw one outcome.
+
+        Args:
+            rng (random.Random, optional): Random number generator to use (default: the random module)
+
+        Returns:
+            The drawn outcome
+        """
+        scaled = (rng or random).random() * self._size
+        index = int(scaled)
+        if scaled - index >= self._probabilities[index]:
+            index = self._aliases[index]
+        return self.outcomes[index]
+
+    def sample_many(self, count: int, rng=None) -> List:
+        """
+        Draw count outcomes as a list, vectorized with NumPy when available.
+
+        Args:
+            count (int): Number of draws
+            rng (random.Random or numpy.random.Generator, optional): Random number generator to use
+        """
+        if np is not None:
+            generator = _numpy_generator(rng)
+            if generator is not None:
+                return self.sample_batch(count, generator).tolist()
+        return [self.sample(rng) for _ in range(count)]
+
+    def sample_batch(self, count: int, rng=None):
+        """
+        Draw count outcomes at once with NumPy.
+
+        Args:
+            count (int): Number of draws
+            rng (numpy.random.Generator or RollStream, optional): Generator to use (default: shared batch generator)
+
+        Returns:
+            numpy.ndarray: The drawn outcomes
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("NumPy is not installed. Please install it with 'pip install numpy'.")
+        generator = _numpy_generator(rng)
+        if generator is None:
+            raise ValueError("Batch draws need a numpy.random.Generator or a RollStream")
+        if self._outcome_array is None:
+            self._outcome_array = (np.asarray(self._probabilities), np.asarray(self._aliases), np.asarray(self.outcomes))
+        probabilities, aliases, outcomes = self._outcome_array
+        scaled = generator.random(count) * self._size
+        indices = scaled.astype(np.intp)
+        indices = np.where(scaled - indices < probabilities[indices], indices, aliases[indices])
+        return outcomes[indices]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"AliasSampler({len(self)} outcomes)"
+
+
+@lru_cache(maxsize=None)
+def ability_score_sampler() -> AliasSampler:
+    """
+    Sampler for a single ability score rolled as 4d6 drop lowest.
+    """
+    return AliasSampler.from_distribution(roll_distribution(4, 6, drop_lowest=1))
@@ -7,7 +7,7 @@ from __future__ import annotations
 
 
 import inquirer
-from misc.backgrounds_utils import parse_equipment_items
+from equipment.equipment_parser import parse_equipment_option
 
 BACKGROUND_DICT: dict[str, dict[str, str | list[str] | list[list[str]]]] = {
     'Acolyte': {
@@ -45,7 +45,7 @@ BACKGROUND_DICT: dict[str, dict[str, str | list[str] | list[list[str]]]] = {
                       ['50 GP']]
     },
     'Criminal': {
-        'name': 'Criminal',
+        'Name': 'Criminal',
         'Description': 'Whether you were a member of a criminal crew or a solo thief who only looked '
         'out for yourself, you know the best ways to slice some purse strings or how to find '
         'alternative means to enter a locked shop.',
@@ -58,7 +58,7 @@ BACKGROUND_DICT: dict[str, dict[str, str | list[str] | list[list[str]]]] = {
                       ['50 GP']]
     },
     'Entertainer': {
-        'name': 'Entertainer',
+        'Name': 'Entertainer',
         'Description': 'You\'ve spent your life on either a literal or proverbial stage, performing '
         'for willing audiences. You have learned how to channel your talent for creation into a '
         'crowd-pleasing art form.',
@@ -200,6 +200,12 @@ BACKGROUND_DICT: dict[str, dict[str, str | list[str] | list[list[str]]]] = {
     }
 }
 
+# Every background's equipment options, parsed once at import so choosing one does no parsing
+BACKGROUND_EQUIPMENT = {
+    name: tuple(parse_equipment_option(option) for option in data.get('Equipment', []))
+    for name, data in BACKGROUND_DICT.items()
+}
+
 def select_background() -> dict[str, str | list[str] | list[list[str]]]:
     """
     Use inquirer to select a background and handle ability score increases.
@@ -245,6 +251,7 @@ def select_background() -> dict[str, str | list[str] | list[list[str]]]:
             continue
 
         # Ability score increase logic
+        ability_increases = None
         ability_scores = bg_info.get('Ability Scores', [])
         if isinstance(ability_scores, list) and len(ability_scores) == 3:
             as_choices = [
@@ -260,7 +267,7 @@ def select_background() -> dict[str, str | list[str] | list[list[str]]]:
             ]
             as_answer = inquirer.prompt(as_question)
             if as_answer['as_method'] == "+1 to all three":
-                bg_info['Ability Score Increases'] = {k: 1 for k in ability_scores}
+                ability_increases = {k: 1 for k in ability_scores}
             else:
                 # Choose +2
                 plus_two_question = [
@@ -283,14 +290,10 @@ def select_background() -> dict[str, str | list[str] | list[list[str]]]:
                 ]
                 plus_one_answer = inquirer.prompt(plus_one_question)
                 plus_one = plus_one_answer['plus_one']
-                bg_info['Ability Score Increases'] = {
-                    plus_two: 2,
-                    plus_one: 1,
-                    [a for a in ability_scores if a not in (plus_two, plus_one)][0]: 0
-                }
-        # Equipment selection and parsing logic
+                ability_increases = {plus_two: 2, plus_one: 1}
+        # Equipment selection
         equipment = bg_info.get('Equipment', [])
-        selected_items = []
+        equipment_option = 0
         if isinstance(equipment, list) and len(equipment) == 2:
             equip_choices = [
                 f"Option 1: {', '.join(equipment[0])}",
@@ -304,41 +307,84 @@ def select_background() -> dict[str, str | list[str] | list[list[str]]]:
                 )
             ]
             equip_answer = inquirer.prompt(equip_question)
-            if equip_answer['equip_choice'] == equip_choices[0]:
-                selected_items = equipment[0]
-            else:
-                selected_items = equipment[1]
-        elif isinstance(equipment, list) and len(equipment) == 1:
-            selected_items = equipment[0]
-        else:
-            selected_items = []
+            if equip_answer['equip_choice'] != equip_choices[0]:
+                equipment_option = 1
+        return build_background(bg_name, ability_increases, equipment_option)
+
+
+def build_background(bg_name: str, ability_increases: dict[str, int] | None = None,
+                     equipment_option: int = 0) -> dict[str, str | list[str] | list[list[str]]]:
+    """
+    Build the full background info for a background without prompting.
+    This is the non-interactive core of select_background().
+
+    Args:
+        bg_name (str): Key into BACKGROUND_DICT.
+        ability_increases (dict, optional): Ability increases, either +1 to all three of the
+            background's abilities or +2 to one and +1 to another. Defaults to +1 to all three.
+        equipment_option (int, optional): Index of the background's equipment option. Defaults to 0.
+
+    Returns:
+        dict: The background's info, including 'Ability Score Increases', parsed equipment,
+            inventory, currency, and proficiencies.
+
+    Raises:
+        ValueError: If the background, ability increases, or equipment option are invalid.
+    """
+    if bg_name not in BACKGROUND_DICT:
+        raise ValueError(f"Unknown background: {bg_name}")
+    bg_info = dict(BACKGROUND_DICT[bg_name])  # Copy to avoid mutating original
+    bg_info['Name'] = bg_name
+
+    # Ability score increases
+    ability_scores = bg_info.get('Ability Scores', [])
+    if isinstance(ability_scores, list) and len(ability_scores) == 3:
+        if ability_increases is None:
+            ability_increases = {k: 1 for k in ability_scores}
+        increases = {k: v for k, v in ability_increases.items() if v}
+        if any(k not in ability_scores for k in increases):
+            raise ValueError(f"{bg_name} can only increase {', '.join(ability_scores)}")
+        if sorted(increases.values()) not in ([1, 1, 1], [1, 2]):
+            raise ValueError("Ability increases must be +1 to all three or +2 to one, +1 to another")
+        bg_info['Ability Score Increases'] = {k: increases.get(k, 0) for k in ability_scores}
+
+    # Equipment selection and parsing logic
+    equipment = bg_info.get('Equipment', [])
+    if isinstance(equipment, list) and equipment:
+        if not 0 <= equipment_option < len(equipment):
+            raise ValueError(f"{bg_name} has no equipment option {equipment_option + 1}")
+        selected_items = equipment[equipment_option]
+        parsed_option = BACKGROUND_EQUIPMENT[bg_name][equipment_option]
+    else:
+        selected_items = []
+        parsed_option = parse_equipment_option(selected_items)
 
-        parsed_equipment, parsed_inventory, gold_pieces, silver_pieces, copper_pieces = parse_equipment_items(selected_items)
-        bg_info['Selected Equipment'] = selected_items
-        bg_info['equipment'] = parsed_equipment
-        bg_info['inventory'] = parsed_inventory
-        bg_info['gold_pieces'] = gold_pieces
-        bg_info['silver_pieces'] = silver_pieces
-        bg_info['copper_pieces'] = copper_pieces
-        # Add proficiencies to return value
-        proficiencies = {'weapons': set(), 'armor': set(), 'tools': set()}
-        # Most backgrounds only grant tool proficiencies
-        tool_profs = bg_info.get('Tool Proficiencies', [])
-        if isinstance(tool_profs, str):
-            proficiencies['tools'].add(tool_profs)
-        elif isinstance(tool_profs, list):
-            proficiencies['tools'].update(tool_profs)
-        # If any background grants weapon/armor profs, add here (future-proof)
-        weapon_profs = bg_info.get('Weapon Proficiencies', [])
-        if isinstance(weapon_profs, str):
-            proficiencies['weapons'].add(weapon_profs)
-        elif isinstance(weapon_profs, list):
-            proficiencies['weapons'].update(weapon_profs)
-        armor_profs = bg_info.get('Armor Proficiencies', [])
-        if isinstance(armor_profs, str):
-            proficiencies['armor'].add(armor_profs)
-        elif isinstance(armor_profs, list):
-            proficiencies['armor'].update(armor_profs)
-        bg_info['proficiencies'] = proficiencies
-        return bg_info
+    parsed_equipment, parsed_inventory, gold_pieces, silver_pieces, copper_pieces = parsed_option.as_tuple()
+    bg_info['Selected Equipment'] = selected_items
+    bg_info['equipment'] = parsed_equipment
+    bg_info['inventory'] = parsed_inventory
+    bg_info['gold_pieces'] = gold_pieces
+    bg_info['silver_pieces'] = silver_pieces
+    bg_info['copper_pieces'] = copper_pieces
+    # Add proficiencies to return value
+    proficiencies = {'weapons': set(), 'armor': set(), 'tools': set()}
+    # Most backgrounds only grant tool proficiencies
+    tool_profs = bg_info.get('Tool Proficiencies', [])
+    if isinstance(tool_profs, str):
+        proficiencies['tools'].add(tool_profs)
+    elif isinstance(tool_profs, list):
+        proficiencies['tools'].update(tool_profs)
+    # If any background grants weapon/armor profs, add here (future-proof)
+    weapon_profs = bg_info.get('Weapon Proficiencies', [])
+    if isinstance(weapon_profs, str):
+        proficiencies['weapons'].add(weapon_profs)
+    elif isinstance(weapon_profs, list):
+        proficiencies['weapons'].update(weapon_profs)
+    armor_profs = bg_info.get('Armor Proficiencies', [])
+    if isinstance(armor_profs, str):
+        proficiencies['armor'].add(armor_profs)
+    elif isinstance(armor_profs, list):
+        proficiencies['armor'].update(armor_profs)
+    bg_info['proficiencies'] = proficiencies
+    return bg_info
 
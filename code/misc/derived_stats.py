@@ -0,0 +1,238 @@
+"""
+derived_stats.py
+----------------
+Cached derived attributes that are invalidated only when their inputs change.
+
+A DerivedStats subclass declares each derived attribute with @derived(<input attribute>, ...). The value is
+computed on first read and stored on the instance, so later reads are ordinary attribute reads. Reassigning an
+input, or mutating it in place, drops the cached values of every attribute that depends on it (directly or
+through other derived attributes), and they are recomputed on their next read.
+
+Inputs assigned as dicts or lists are stored as TrackedDict or TrackedList copies that report in-place changes;
+other inputs can report theirs by providing set_change_listener(callback) (see equipment.inventory.Inventory).
+Derived attributes can't be assigned.
+
+Functions:
+    derived(*depends): Decorator declaring a derived attribute and its inputs.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+
+
+class DerivedAttribute:
+    """
+    Non-data descriptor for a derived attribute: computes the value on first read and caches it in the instance
+    __dict__, where later reads find it directly.
+
+    Attributes:
+        func (callable): Computes the value from the instance.
+        depends (tuple): Names of the attributes the value is computed from.
+    """
+
+    def __init__(self, func, depends):
+        self.func = func
+        self.depends = depends
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
+def derived(*depends):
+    """
+    Declare a cached derived attribute computed from the given input attributes, which can themselves be derived.
+
+    Example:
+        @derived('ability_scores')
+        def modifiers(self): ...
+    """
+    return lambda func: DerivedAttribute(func, depends)
+
+
+class TrackedDict(dict):
+    """A dict that calls a callback after any in-place change."""
+
+    __slots__ = ('_on_change',)
+
+    def __init__(self, data, on_change):
+        super().__init__(data)
+        self._on_change = on_change
+
+    def __reduce__(self):
+        # Copies and pickles are plain dicts; assigning one to an input tracks it again
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._on_change()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._on_change()
+        return self
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._on_change()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._on_change()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._on_change()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._on_change()
+
+
+class TrackedList(list):
+    """A list that calls a callback after any in-place change."""
+
+    __slots__ = ('_on_change',)
+
+    def __init__(self, data, on_change):
+        super().__init__(data)
+        self._on_change = on_change
+
+    def __reduce__(self):
+        # Copies and pickles are plain lists; assigning one to an input tracks it again
+        return list, (list(self),)
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._on_change()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._on_change()
+
+    def __iadd__(self, other):
+        super().__iadd__(other)
+        self._on_change()
+        return self
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._on_change()
+        return self
+
+    def append(self, value):
+        super().append(value)
+        self._on_change()
+
+    def extend(self, values):
+        super().extend(values)
+        self._on_change()
+
+    def insert(self, index, value):
+        super().insert(index, value)
+        self._on_change()
+
+    def remove(self, value):
+        super().remove(value)
+        self._on_change()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._on_change()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._on_change()
+
+    def reverse(self):
+        super().reverse()
+        self._on_change()
+
+
+class DerivedStats:
+    """
+    Mixin that invalidates @derived attributes when their inputs are assigned or changed in place.
+    """
+
+    # input attribute -> derived attributes that depend on it, directly or transitively (set per subclass)
+    _derived_dependents = {}
+    _derived_names = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        direct = {}
+        names = set()
+        for klass in reversed(cls.__mro__):
+            for name, attribute in vars(klass).items():
+                if isinstance(attribute, DerivedAttribute):
+                    names.add(name)
+                    for dependency in attribute.depends:
+                        direct.setdefault(dependency, set()).add(name)
+        dependents = {}
+        for attribute in direct:
+            seen = set()
+            stack = [attribute]
+            while stack:
+                for name in direct.get(stack.pop(), ()):
+                    if name not in seen:
+                        seen.add(name)
+                        stack.append(name)
+            dependents[attribute] = tuple(seen)
+        cls._derived_dependents = dependents
+        cls._derived_names = frozenset(names)
+
+    def __setattr__(self, name, value):
+        if name in self._derived_names:
+            raise AttributeError(f"{name} is derived from other attributes and can't be set")
+        if name in self._derived_dependents:
+            on_change = partial(self.invalidate, name)
+            if isinstance(value, dict):
+                value = TrackedDict(value, on_change)
+            elif isinstance(value, list):
+                value = TrackedList(value, on_change)
+            elif hasattr(value, 'set_change_listener'):
+                value.set_change_listener(on_change)
+            object.__setattr__(self, name, value)
+            self.invalidate(name)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __setstate__(self, state):
+        # Copies and unpickled instances recompute derived values and track their inputs again
+        for name, value in state.items():
+            if name not in self._derived_names:
+                setattr(self, name, value)
+
+    def invalidate(self, *names):
+        """
+        Drop the cached values that depend on the given input attributes, e.g. after changing one in a way that
+        isn't tracked.
+        """
+        cache = self.__dict__
+        for name in names:
+            for dependent in self._derived_dependents.get(name, ()):
+                cache.pop(dependent, None)
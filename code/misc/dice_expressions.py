@@ -0,0 +1,286 @@
+"""
+Dice expression compiler for D&D 5e rolls.
+Compiles expressions such as "2d8+1d6+3", "4d6kh3", "2d6ro<2" or "1d6!" once into a roll closure,
+cached by expression string, so rolling costs one call instead of re-parsing the string every time.
+
+Syntax (case and spaces ignored), terms joined with + or -:
+    N           Flat modifier
+    NdX         Roll N dice with X sides (N defaults to 1)
+Per-dice modifiers, in any order after NdX:
+    khN / klN   Keep the highest / lowest N dice
+    dhN / dlN   Drop the highest / lowest N dice
+    rN, r<N     Reroll any die showing N or lower until it doesn't
+    roN, ro<N   Reroll any die showing N or lower once, keeping the new roll
+    miN / maN   Treat any die lower than N as N / higher than N as N (e.g. Great Weapon Fighting: 2d6mi3)
+    !, !>N      Exploding dice: roll again and add on the highest face (or N and higher)
+"""
+
+import random
+import re
+from functools import lru_cache
+from typing import Callable, Tuple
+
+__all__ = [
+    "MAX_EXPLOSIONS",
+    "CompiledDice",
+    "compile_dice",
+    "roll_expression",
+    "parse_damage_string",
+]
+
+# Maximum number of times a single die can explode, so "!" can't loop forever
+MAX_EXPLOSIONS = 100
+
+_TERM_PATTERN = re.compile(
+    r"([+-])(?:(\d*)d(\d+)((?:kh\d+|kl\d+|dh\d+|dl\d+|ro?<?\d+|mi\d+|ma\d+|!(?:>\d+)?)*)|(\d+))"
+)
+_MODIFIER_PATTERN = re.compile(r"(kh|kl|dh|dl|ro|r|mi|ma|!)(?:>|<)?(\d*)")
+
+# Damage strings look like "1d8 slashing" or "1 piercing"
+_DAMAGE_PATTERN = re.compile(r"^\s*(\S+)\s*(.*?)\s*$")
+
+
+class CompiledDice:
+    """
+    A compiled dice expression. Call roll() (or the object itself) to roll it.
+    """
+
+    __slots__ = ("expression", "min", "max", "dice", "_roll")
+
+    def __init__(self, expression: str, roll: Callable, minimum: int, maximum: int, dice: Tuple[int, int, int] = None):
+        """
+        Initialize a compiled expression. Use compile_dice() rather than creating these directly.
+
+        Args:
+            expression (str): The normalized source expression
+            roll (Callable): Closure taking a random number generator and returning the total
+            minimum (int): Lowest possible total, or None if unbounded
+            maximum (int): Highest possible total, or None if unbounded (exploding dice)
+            dice (tuple, optional): (num_dice, sides, modifier) if the expression is a plain "NdX+M", else None
+        """
+        self.expression = expression
+        self._roll = roll
+        self.min = minimum
+        self.max = maximum
+        self.dice = dice
+
+    def roll(self, rng=None) -> int:
+        """
+        Roll the expression.
+
+        Args:
+            rng (random.Random, optional): Random number generator to use (default: the random module)
+
+        Returns:
+            int: The rolled total
+        """
+        return self._roll(rng or random)
+
+    __call__ = roll
+
+    def __str__(self) -> str:
+        return self.expression
+
+    def __repr__(self) -> str:
+        return f"CompiledDice({self.expression!r})"
+
+
+def _compile_dice_term(num_dice: int, sides: int, modifiers: str) -> Tuple[Callable, int, int]:
+    """
+    Compile one NdX term and its modifiers into a closure.
+
+    Returns:
+        tuple: (roll(rng) -> int, minimum, maximum) where maximum is None for exploding dice.
+
+    Raises:
+        ValueError: If the term or its modifiers are invalid
+    """
+    if num_dice < 1:
+        raise ValueError("Must roll at least 1 die")
+    if sides < 1:
+        raise ValueError("Die must have at least 1 side")
+    keep_start, keep_end = 0, num_dice
+    reroll_at, reroll_once = 0, False
+    low, high = 1, sides
+    explode_at = None
+    for kind, value in _MODIFIER_PATTERN.findall(modifiers):
+        if kind == "!":
+            explode_at = int(value) if value else sides
+            if explode_at <= 1:
+                raise ValueError("Exploding dice must explode on a value above 1")
+            continue
+        amount = int(value)
+        if kind in ("kh", "kl", "dh", "dl"):
+            if amount > num_dice:
+                raise ValueError("Cannot keep or drop more dice than available")
+            if kind == "kh":
+                keep_start, keep_end = num_dice - amount, num_dice
+            elif kind == "kl":
+                keep_start, keep_end = 0, amount
+            elif kind == "dh":
+                keep_start, keep_end = 0, num_dice - amount
+            else:
+                keep_start, keep_end = amount, num_dice
+        elif kind in ("r", "ro"):
+            if kind == "r" and amount >= sides:
+                raise ValueError("Cannot reroll every face of the die")
+            reroll_at, reroll_once = amount, kind == "ro"
+        elif kind == "mi":
+            low = max(low, amount)
+        else:
+            high = min(high, amount)
+    if low > high:
+        raise ValueError("Minimum cannot be greater than maximum")
+    if keep_start >= keep_end:
+        raise ValueError("Cannot drop every die")
+    faces = range(1, sides + 1)
+    kept = keep_end - keep_start
+    keeps_all = kept == num_dice
+    simple_faces = not reroll_at and low == 1 and high == sides and explode_at is None
+
+    if simple_faces:
+        if keeps_all:
+            def roll(rng):
+                return sum(rng.choices(faces, k=num_dice))
+        else:
+            def roll(rng):
+                return sum(sorted(rng.choices(faces, k=num_dice))[keep_start:keep_end])
+    else:
+        def face(rng):
+            value = rng.randint(1, sides)
+            if value <= reroll_at:
+                value = rng.randint(1, sides)
+                if not reroll_once:
+                    while value <= reroll_at:
+                        value = rng.randint(1, sides)
+            return low if value < low else high if value > high else value
+
+        if explode_at is None:
+            def die(rng):
+                return face(rng)
+        else:
+            def die(rng):
+                value = total = face(rng)
+                explosions = 0
+                while value >= explode_at and explosions < MAX_EXPLOSIONS:
+                    value = face(rng)
+                    total += value
+                    explosions += 1
+                return total
+
+        if keeps_all:
+            def roll(rng):
+                return sum([die(rng) for _ in range(num_dice)])
+        else:
+            def roll(rng):
+                return sum(sorted([die(rng) for _ in range(num_dice)])[keep_start:keep_end])
+
+    # Rerolling until the die beats reroll_at raises its lowest face
+    lowest_face = min(max(low, reroll_at + 1), high) if reroll_at and not reroll_once else low
+    maximum = None if explode_at is not None else kept * high
+    return roll, kept * lowest_face, maximum
+
+
+@lru_cache(maxsize=512)
+def compile_dice(expression: str) -> CompiledDice:
+    """
+    Compile a dice expression (see module docstring for syntax). Compiled expressions are cached,
+    so calling this with the same string again is a dictionary lookup.
+
+    Args:
+        expression (str): Dice expression, e.g. "2d8+1d6+3" or "4d6kh3"
+
+    Returns:
+        CompiledDice: The compiled expression
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    text = expression.strip().lower().replace(" ", "")
+    if not text:
+        raise ValueError("Empty dice expression")
+    if text[0] not in "+-":
+        text = "+" + text
+    terms = []
+    # (num_dice, sides) of each dice term without modifiers
+    plain_terms = []
+    constant = minimum = maximum = 0
+    position = 0
+    for match in _TERM_PATTERN.finditer(text):
+        if match.start() != position:
+            break
+        position = match.end()
+        sign = -1 if match.group(1) == "-" else 1
+        if match.group(5) is not None:
+            constant += sign * int(match.group(5))
+            continue
+        num_dice, sides = int(match.group(2) or 1), int(match.group(3))
+        roll, term_min, term_max = _compile_dice_term(num_dice, sides, match.group(4))
+        terms.append((sign, roll))
+        if sign > 0 and not match.group(4):
+            plain_terms.append((num_dice, sides))
+        if sign < 0:
+            # Subtracting a term swaps which of its bounds contributes to the total's bounds
+            term_min, term_max = (None if term_max is None else -term_max), -term_min
+        minimum = None if minimum is None or term_min is None else minimum + term_min
+        maximum = None if maximum is None or term_max is None else maximum + term_max
+    if position != len(text):
+        raise ValueError(f"Invalid dice expression: '{expression}'")
+    if minimum is not None:
+        minimum += constant
+    if maximum is not None:
+        maximum += constant
+
+    if not terms:
+        def roll(rng):
+            return constant
+    elif len(terms) == 1 and terms[0][0] > 0:
+        single = terms[0][1]
+        if constant:
+            def roll(rng):
+                return single(rng) + constant
+        else:
+            roll = single
+    else:
+        def roll(rng):
+            total = constant
+            for sign, term in terms:
+                total += sign * term(rng)
+            return total
+
+    dice = (*plain_terms[0], constant) if len(terms) == 1 and plain_terms else None
+    return CompiledDice(text.lstrip("+"), roll, minimum, maximum, dice)
+
+
+def roll_expression(expression: str, rng=None) -> int:
+    """
+    Roll a dice expression, compiling it on first use.
+
+    Args:
+        expression (str): Dice expression, e.g. "2d8+1d6+3"
+        rng (random.Random, optional): Random number generator to use (default: the random module)
+
+    Returns:
+        int: The rolled total
+    """
+    return compile_dice(expression).roll(rng)
+
+
+@lru_cache(maxsize=512)
+def parse_damage_string(damage: str) -> Tuple[CompiledDice, str]:
+    """
+    Split a damage string such as "1d8 slashing" into its compiled dice and damage type.
+
+    Args:
+        damage (str): Damage string, dice expression first (e.g. "2d6 fire", "1 piercing")
+
+    Returns:
+        tuple: (CompiledDice, damage type); the damage type is '' if none is given
+
+    Raises:
+        ValueError: If the dice part is invalid
+    """
+    match = _DAMAGE_PATTERN.match(damage)
+    if not match:
+        raise ValueError(f"Invalid damage string: '{damage}'")
+    return compile_dice(match.group(1)), match.group(2).lower()
@@ -0,0 +1,251 @@
+"""
+Exact probability distributions for D&D dice rolls.
+Computes the PMF/CDF of NdX+M rolls, including keep/drop highest/lowest and advantage/disadvantage,
+by dynamic programming over face values instead of sampling. Sub-distributions are memoized.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Tuple
+
+from .dice_rolling import parse_dice_string
+
+__all__ = [
+    "DiceDistribution",
+    "roll_distribution",
+    "dice_distribution",
+]
+
+# Keep/drop suffix, e.g. "kh3", "kl1", "dl1", "dh2"; "adv"/"dis" for advantage/disadvantage
+_KEEP_DROP_PATTERN = re.compile(r"(kh|kl|dh|dl)(\d+)")
+_ADVANTAGE_PATTERN = re.compile(r"(adv|dis)")
+
+
+class DiceDistribution:
+    """
+    An exact, immutable probability distribution of roll totals.
+    Outcomes are stored as integer counts out of a common total so no precision is lost.
+    """
+
+    __slots__ = ("_values", "_counts", "_cumulative", "total")
+
+    def __init__(self, counts: Dict[int, int]):
+        """
+        Initialize a distribution.
+
+        Args:
+            counts (Dict[int, int]): Mapping of roll total to number of ways it can occur
+        """
+        items = sorted((value, count) for value, count in counts.items() if count)
+        self._values = tuple(value for value, _ in items)
+        self._counts = tuple(count for _, count in items)
+        self._cumulative = tuple(accumulate(self._counts))
+        self.total = self._cumulative[-1] if self._cumulative else 0
+
+    def shifted(self, modifier: int) -> "DiceDistribution":
+        """
+        Return this distribution with a flat modifier added to every outcome.
+        """
+        if not modifier:
+            return self
+        return DiceDistribution({value + modifier: count for value, count in zip(self._values, self._counts)})
+
+    @property
+    def pmf(self) -> Dict[int, float]:
+        """Mapping of each possible total to its probability."""
+        return {value: count / self.total for value, count in zip(self._values, self._counts)}
+
+    @property
+    def cdf(self) -> Dict[int, float]:
+        """Mapping of each possible total to the probability of rolling that total or lower."""
+        return {value: cumulative / self.total for value, cumulative in zip(self._values, self._cumulative)}
+
+    @property
+    def min(self) -> int:
+        """Lowest possible total."""
+        return self._values[0]
+
+    @property
+    def max(self) -> int:
+        """Highest possible total."""
+        return self._values[-1]
+
+    @property
+    def mean(self) -> float:
+        """Expected value."""
+        return sum(value * count for value, count in zip(self._values, self._counts)) / self.total
+
+    @property
+    def variance(self) -> float:
+        """Variance of the total."""
+        mean = self.mean
+        return sum((value - mean) ** 2 * count for value, count in zip(self._values, self._counts)) / self.total
+
+    @property
+    def stdev(self) -> float:
+        """Standard deviation of the total."""
+        return math.sqrt(self.variance)
+
+    def probability(self, value: int) -> float:
+        """
+        Probability of rolling exactly value.
+        """
+        index = bisect_left(self._values, value)
+        if index < len(self._values) and self._values[index] == value:
+            return self._counts[index] / self.total
+        return 0.0
+
+    def probability_at_least(self, value: int) -> float:
+        """
+        Probability of rolling value or higher (e.g. meeting a DC).
+        """
+        index = bisect_left(self._values, value)
+        below = self._cumulative[index - 1] if index > 0 else 0
+        return (self.total - below) / self.total
+
+    def percentile(self, p: float) -> int:
+        """
+        Smallest total whose cumulative probability is at least p.
+
+        Args:
+            p (float): Percentile as a fraction between 0 and 1 (e.g. 0.5 for the median)
+
+        Raises:
+            ValueError: If p is outside 0-1
+        """
+        if not 0 <= p <= 1:
+            raise ValueError("Percentile must be between 0 and 1")
+        target = p * self.total
+        index = bisect_left(self._cumulative, target)
+        return self._values[min(index, len(self._values) - 1)]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DiceDistribution):
+            return NotImplemented
+        return self.pmf == other.pmf
+
+    def __repr__(self) -> str:
+        return f"DiceDistribution(min={self.min}, max={self.max}, mean={self.mean:.3f})"
+
+
+@lru_cache(maxsize=None)
+def _sum_counts(num_dice: int, sides: int) -> Tuple[int, ...]:
+    """
+    Ways to roll each total of NdX, indexed by total - num_dice. Built by convolving one die at a time,
+    so every smaller NdX is memoized along the way.
+    """
+    if num_dice == 0:
+        return (1,)
+    previous = _sum_counts(num_dice - 1, sides)
+    counts = [0] * (len(previous) + sides - 1)
+    for offset, ways in enumerate(previous):
+        for face in range(sides):
+            counts[offset + face] += ways
+    return tuple(counts)
+
+
+@lru_cache(maxsize=None)
+def _binomial_row(n: int) -> Tuple[int, ...]:
+    """Binomial coefficients C(n, 0..n)."""
+    return tuple(math.comb(n, k) for k in range(n + 1))
+
+
+@lru_cache(maxsize=1024)
+def _kept_counts(num_dice: int, sides: int, drop_lowest: int, drop_highest: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Ways to roll each total when the highest drop_highest and lowest drop_lowest dice are dropped.
+
+    Works through face values from highest to lowest, choosing how many of the remaining dice show each face.
+    With the dice sorted in descending order, positions [drop_highest, num_dice - drop_lowest) are kept.
+    State is (dice assigned so far, kept sum) -> number of ways.
+    """
+    keep_start = drop_highest
+    keep_end = num_dice - drop_lowest
+    states = {(0, 0): 1}
+    for face in range(sides, 0, -1):
+        next_states = {}
+        last_face = face == 1
+        for (assigned, kept_sum), ways in states.items():
+            remaining = num_dice - assigned
+            binomials = _binomial_row(remaining)
+            # The last face must take every remaining die
+            for showing in (range(remaining, remaining + 1) if last_face else range(remaining + 1)):
+                # Kept positions covered by this face's block [assigned, assigned + showing)
+                kept = max(0, min(assigned + showing, keep_end) - max(assigned, keep_start))
+                key = (assigned + showing, kept_sum + kept * face)
+                next_states[key] = next_states.get(key, 0) + ways * binomials[showing]
+        states = next_states
+    return tuple(sorted((kept_sum, ways) for (_, kept_sum), ways in states.items()))
+
+
+@lru_cache(maxsize=1024)
+def roll_distribution(num_dice: int, sides: int, modifier: int = 0, drop_lowest: int = 0,
+                      drop_highest: int = 0) -> DiceDistribution:
+    """
+    Exact distribution of NdX+M with optional dropped dice. Results are cached.
+
+    Args:
+        num_dice (int): Number of dice rolled
+        sides (int): Number of sides on each die
+        modifier (int): Flat modifier added to the total (default: 0)
+        drop_lowest (int): Number of lowest dice to drop (default: 0)
+        drop_highest (int): Number of highest dice to drop (default: 0)
+
+    Returns:
+        DiceDistribution: Distribution of the total
+
+    Raises:
+        ValueError: If the dice are invalid or all dice would be dropped
+    """
+    if num_dice < 1:
+        raise ValueError("Must roll at least 1 die")
+    if sides < 1:
+        raise ValueError("Die must have at least 1 side")
+    if drop_lowest < 0 or drop_highest < 0 or drop_lowest + drop_highest >= num_dice:
+        raise ValueError("Cannot drop more dice than available")
+    if drop_lowest or drop_highest:
+        counts = dict(_kept_counts(num_dice, sides, drop_lowest, drop_highest))
+    else:
+        counts = {num_dice + offset: ways for offset, ways in enumerate(_sum_counts(num_dice, sides))}
+    return DiceDistribution(counts).shifted(modifier)
+
+
+@lru_cache(maxsize=1024)
+def dice_distribution(expression: str) -> DiceDistribution:
+    """
+    Exact distribution of a dice expression such as "8d6", "4d6dl1", "4d6kh3", "1d20adv+5" or "2d20kl1-1".
+    Keep/drop suffixes (kh, kl, dh, dl) and adv/dis follow the dice; the rest is parsed by parse_dice_string.
+    Results are cached per expression string.
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    text = expression.strip().lower().replace(" ", "")
+    advantage = _ADVANTAGE_PATTERN.search(text)
+    if advantage:
+        text = text[:advantage.start()] + text[advantage.end():]
+    keep_drop = _KEEP_DROP_PATTERN.search(text)
+    if keep_drop:
+        text = text[:keep_drop.start()] + text[keep_drop.end():]
+    dice = parse_dice_string(text)
+    if advantage:
+        if keep_drop:
+            raise ValueError("Cannot combine advantage/disadvantage with keep/drop")
+        return dice.distribution(advantage=advantage.group(1) == "adv", disadvantage=advantage.group(1) == "dis")
+    drop_lowest = drop_highest = 0
+    if keep_drop:
+        kind, amount = keep_drop.group(1), int(keep_drop.group(2))
+        if kind == "dl":
+            drop_lowest = amount
+        elif kind == "dh":
+            drop_highest = amount
+        elif kind == "kh":
+            drop_lowest = dice.num_dice - amount
+        else:
+            drop_highest = dice.num_dice - amount
+        if amount > dice.num_dice:
+            raise ValueError("Cannot keep or drop more dice than available")
+    return dice.distribution(drop_lowest=drop_lowest, drop_highest=drop_highest)
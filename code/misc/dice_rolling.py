@@ -1,18 +1,73 @@
 """
 D&D 5e dice rolling utilities.
 Provides functions and a Dice class for rolling dice, including advantage/disadvantage mechanics.
+Batch methods (roll_batch, roll_drop_lowest_batch, ...) roll many times at once with NumPy.
+Every roll takes an optional rng (a random.Random such as misc.rng.RollStream) for reproducible streams;
+without one, the global random module is used.
+Dice rolls and parse_dice_string go through compile_dice, so each expression is parsed once and cached.
 """
 
 import random
 from typing import List
 
+from .dice_expressions import CompiledDice, compile_dice
 
-def roll_die(sides: int) -> int:
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Shared NumPy generator for batch rolls, created on first use
+_batch_rng = None
+
+
+def get_batch_rng():
+    """
+    Return the shared numpy.random.Generator used by batch rolls, creating it on first use.
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    global _batch_rng
+    if np is None:
+        raise ImportError("NumPy is not installed. Please install it with 'pip install numpy'.")
+    if _batch_rng is None:
+        _batch_rng = np.random.default_rng()
+    return _batch_rng
+
+
+def seed_batch_rng(seed: int) -> None:
+    """
+    Reseed the shared batch generator, making subsequent batch rolls reproducible.
+    
+    Args:
+        seed (int): Seed for numpy.random.default_rng
+    """
+    global _batch_rng
+    if np is None:
+        raise ImportError("NumPy is not installed. Please install it with 'pip install numpy'.")
+    _batch_rng = np.random.default_rng(seed)
+
+
+def _numpy_generator(rng):
+    """
+    Return the numpy.random.Generator to use for batch rolls given an rng argument, or None if rng is a
+    random.Random without one (in which case batch rolls fall back to scalar rolls).
+    """
+    if rng is None:
+        return get_batch_rng()
+    if isinstance(rng, random.Random):
+        return getattr(rng, 'generator', None)
+    return rng
+
+
+def roll_die(sides: int, rng=None) -> int:
     """
     Roll a single die with the specified number of sides.
     
     Args:
         sides (int): Number of sides on the die (e.g., 6 for d6, 20 for d20)
+        rng (random.Random, optional): Random number generator to use (default: the random module)
     
     Returns:
         int: Random integer between 1 and sides (inclusive)
@@ -22,10 +77,10 @@ def roll_die(sides: int) -> int:
     """
     if sides < 1:
         raise ValueError("Die must have at least 1 side")
-    return random.randint(1, sides)
+    return (rng or random).randint(1, sides)
 
 
-def roll_dice(num_dice: int, sides: int, modifier: int = 0) -> int:
+def roll_dice(num_dice: int, sides: int, modifier: int = 0, rng=None) -> int:
     """
     Roll multiple dice and return the sum plus any modifier.
     
@@ -33,6 +88,7 @@ def roll_dice(num_dice: int, sides: int, modifier: int = 0) -> int:
         num_dice (int): Number of dice to roll
         sides (int): Number of sides on each die
         modifier (int): Modifier to add to the total (default: 0)
+        rng (random.Random, optional): Random number generator to use (default: the random module)
     
     Returns:
         int: Sum of all dice rolls plus modifier
@@ -45,7 +101,7 @@ def roll_dice(num_dice: int, sides: int, modifier: int = 0) -> int:
     if sides < 1:
         raise ValueError("Die must have at least 1 side")
     
-    total = sum(roll_die(sides) for _ in range(num_dice))
+    total = sum(roll_die(sides, rng) for _ in range(num_dice))
     return total + modifier
 
 
@@ -71,20 +127,36 @@ class Dice:
         self.num_dice = num_dice
         self.sides = sides
         self.modifier = modifier
+        # (num_dice, sides, keep, modifier) -> CompiledDice, so repeated rolls skip building the expression string
+        self._compiled_rolls = {}
+
+    def _compiled(self, num_dice: int, keep: str = "") -> CompiledDice:
+        """Return the compiled expression for num_dice of these dice with a keep/drop suffix (e.g. "kh1")."""
+        key = (num_dice, self.sides, keep, self.modifier)
+        compiled = self._compiled_rolls.get(key)
+        if compiled is None:
+            compiled = self._compiled_rolls[key] = compile_dice(f"{num_dice}d{self.sides}{keep}{self.modifier:+d}")
+        return compiled
     
-    def roll(self) -> int:
+    def roll(self, rng=None) -> int:
         """
         Roll the dice and return the total.
         
+        Args:
+            rng (random.Random, optional): Random number generator to use (default: the random module)
+        
         Returns:
             int: Sum of all dice rolls plus modifier
         """
-        return roll_dice(self.num_dice, self.sides, self.modifier)
+        return self._compiled(self.num_dice).roll(rng)
     
-    def roll_with_advantage(self) -> int:
+    def roll_with_advantage(self, rng=None) -> int:
         """
         Roll with advantage (roll twice, take higher). Only works with single die rolls.
         
+        Args:
+            rng (random.Random, optional): Random number generator to use (default: the random module)
+        
         Returns:
             int: Higher of two rolls plus modifier
         
@@ -93,15 +165,15 @@ class Dice:
         """
         if self.num_dice != 1:
             raise ValueError("Advantage only works with single die rolls")
-        
-        roll1 = roll_die(self.sides)
-        roll2 = roll_die(self.sides)
-        return max(roll1, roll2) + self.modifier
+        return self._compiled(2, "kh1").roll(rng)
     
-    def roll_with_disadvantage(self) -> int:
+    def roll_with_disadvantage(self, rng=None) -> int:
         """
         Roll with disadvantage (roll twice, take lower). Only works with single die rolls.
         
+        Args:
+            rng (random.Random, optional): Random number generator to use (default: the random module)
+        
         Returns:
             int: Lower of two rolls plus modifier
         
@@ -110,29 +182,33 @@ class Dice:
         """
         if self.num_dice != 1:
             raise ValueError("Disadvantage only works with single die rolls")
-        
-        roll1 = roll_die(self.sides)
-        roll2 = roll_die(self.sides)
-        return min(roll1, roll2) + self.modifier
+        return self._compiled(2, "kl1").roll(rng)
     
-    def roll_multiple(self, times: int) -> List[int]:
+    def roll_multiple(self, times: int, rng=None) -> List[int]:
         """
         Roll the dice multiple times and return all results as a list.
+        Uses roll_batch when NumPy is available.
         
         Args:
             times (int): Number of times to roll the dice
+            rng (random.Random, optional): Random number generator to use (default: the random module)
         
         Returns:
             List[int]: List of results for each roll
         """
-        return [self.roll() for _ in range(times)]
+        if np is not None:
+            generator = _numpy_generator(rng)
+            if generator is not None:
+                return self.roll_batch(times, generator).tolist()
+        return [self.roll(rng) for _ in range(times)]
     
-    def roll_drop_lowest(self, drop_count: int = 1) -> int:
+    def roll_drop_lowest(self, drop_count: int = 1, rng=None) -> int:
         """
         Roll dice and drop the lowest results (useful for ability scores).
         
         Args:
             drop_count: Number of lowest dice to drop (default: 1)
+            rng (random.Random, optional): Random number generator to use (default: the random module)
         
         Returns:
             Sum of remaining dice plus modifier
@@ -142,12 +218,137 @@ class Dice:
         """
         if drop_count >= self.num_dice:
             raise ValueError("Cannot drop more dice than available")
+        return self._compiled(self.num_dice, f"dl{drop_count}").roll(rng)
+    
+    def _roll_matrix(self, times: int, num_dice: int, rng=None):
+        """
+        Roll a (times, num_dice) array of individual dice with NumPy.
+        
+        Args:
+            times (int): Number of rolls (rows)
+            num_dice (int): Dice per roll (columns)
+            rng (numpy.random.Generator or RollStream, optional): Generator to use (default: shared batch generator)
+        
+        Returns:
+            numpy.ndarray: Array of die results between 1 and sides
+        
+        Raises:
+            ValueError: If times is negative
+        """
+        if times < 0:
+            raise ValueError("Cannot roll a negative number of times")
+        rng = _numpy_generator(rng)
+        if rng is None:
+            raise ValueError("Batch rolls need a numpy.random.Generator or a RollStream")
+        # Small dtypes keep the intermediate arrays compact for large batches
+        dtype = np.int8 if self.sides < 128 else np.int64
+        return rng.integers(1, self.sides, size=(times, num_dice), dtype=dtype, endpoint=True)
+    
+    def roll_batch(self, times: int, rng=None):
+        """
+        Roll the dice many times at once.
+        
+        Args:
+            times (int): Number of times to roll the dice
+            rng (numpy.random.Generator or RollStream, optional): Generator to use (default: shared batch generator)
+        
+        Returns:
+            numpy.ndarray: Totals (dice plus modifier) for each roll
+        """
+        rolls = self._roll_matrix(times, self.num_dice, rng)
+        return rolls.sum(axis=1, dtype=np.int64) + self.modifier
+    
+    def roll_drop_lowest_batch(self, times: int, drop_count: int = 1, rng=None):
+        """
+        Batch version of roll_drop_lowest (e.g. a million 4d6-drop-lowest rolls at once).
+        
+        Args:
+            times (int): Number of times to roll the dice
+            drop_count (int): Number of lowest dice to drop from each roll (default: 1)
+            rng (numpy.random.Generator or RollStream, optional): Generator to use (default: shared batch generator)
+        
+        Returns:
+            numpy.ndarray: Sum of the remaining dice plus modifier for each roll
+        
+        Raises:
+            ValueError: If trying to drop more dice than available
+        """
+        if drop_count >= self.num_dice:
+            raise ValueError("Cannot drop more dice than available")
+        rolls = self._roll_matrix(times, self.num_dice, rng)
+        totals = rolls.sum(axis=1, dtype=np.int64)
+        if drop_count == 1:
+            totals -= rolls.min(axis=1)
+        elif drop_count > 1:
+            lowest = np.partition(rolls, drop_count - 1, axis=1)[:, :drop_count]
+            totals -= lowest.sum(axis=1, dtype=np.int64)
+        return totals + self.modifier
+    
+    def roll_with_advantage_batch(self, times: int, rng=None):
+        """
+        Batch version of roll_with_advantage. Only works with single die rolls.
         
-        rolls = [roll_die(self.sides) for _ in range(self.num_dice)]
-        rolls.sort(reverse=True)  # Sort descending
-        kept_rolls = rolls[:self.num_dice - drop_count]
-        return sum(kept_rolls) + self.modifier
+        Args:
+            times (int): Number of times to roll
+            rng (numpy.random.Generator or RollStream, optional): Generator to use (default: shared batch generator)
+        
+        Returns:
+            numpy.ndarray: Higher of two rolls plus modifier for each roll
+        
+        Raises:
+            ValueError: If trying to use advantage with multiple dice
+        """
+        if self.num_dice != 1:
+            raise ValueError("Advantage only works with single die rolls")
+        return self._roll_matrix(times, 2, rng).max(axis=1).astype(np.int64) + self.modifier
     
+    def roll_with_disadvantage_batch(self, times: int, rng=None):
+        """
+        Batch version of roll_with_disadvantage. Only works with single die rolls.
+        
+        Args:
+            times (int): Number of times to roll
+            rng (numpy.random.Generator or RollStream, optional): Generator to use (default: shared batch generator)
+        
+        Returns:
+            numpy.ndarray: Lower of two rolls plus modifier for each roll
+        
+        Raises:
+            ValueError: If trying to use disadvantage with multiple dice
+        """
+        if self.num_dice != 1:
+            raise ValueError("Disadvantage only works with single die rolls")
+        return self._roll_matrix(times, 2, rng).min(axis=1).astype(np.int64) + self.modifier
+
+    def distribution(self, drop_lowest: int = 0, drop_highest: int = 0,
+                     advantage: bool = False, disadvantage: bool = False):
+        """
+        Exact probability distribution of this roll, computed rather than sampled.
+        Results are cached, so repeated queries for the same dice are cheap.
+
+        Args:
+            drop_lowest (int): Number of lowest dice to drop, e.g. 1 for 4d6 drop lowest (default: 0)
+            drop_highest (int): Number of highest dice to drop (default: 0)
+            advantage (bool): Roll twice and take the higher. Only works with single die rolls
+            disadvantage (bool): Roll twice and take the lower. Only works with single die rolls
+
+        Returns:
+            DiceDistribution: Distribution with pmf, cdf, mean, and percentile helpers
+
+        Raises:
+            ValueError: If the options are invalid for these dice
+        """
+        from .dice_probability import roll_distribution
+        if advantage or disadvantage:
+            if advantage and disadvantage:
+                raise ValueError("Cannot roll with both advantage and disadvantage")
+            if self.num_dice != 1:
+                raise ValueError("Advantage only works with single die rolls")
+            if drop_lowest or drop_highest:
+                raise ValueError("Cannot combine advantage/disadvantage with dropped dice")
+            return roll_distribution(2, self.sides, self.modifier, drop_lowest=int(advantage), drop_highest=int(disadvantage))
+        return roll_distribution(self.num_dice, self.sides, self.modifier, drop_lowest, drop_highest)
+
     def __str__(self) -> str:
         """String representation of the dice."""
         modifier_str = ""
@@ -176,19 +377,26 @@ d100 = Dice(1, 100)
 ability_score_dice = Dice(4, 6)
 
 
-def roll_ability_scores() -> List[int]:
+def roll_ability_scores(rng=None) -> List[int]:
     """
     Roll ability scores using the standard 4d6 drop lowest method.
+    Scores are drawn from the precomputed 4d6 drop lowest distribution rather than rolling four dice each.
+    
+    Args:
+        rng (random.Random, optional): Random number generator to use (default: the random module)
     
     Returns:
         List of 6 ability scores
     """
-    return [ability_score_dice.roll_drop_lowest() for _ in range(6)]
+    from .alias_sampler import ability_score_sampler
+    sampler = ability_score_sampler()
+    return [sampler.sample(rng) for _ in range(6)]
 
 
 def parse_dice_string(dice_string: str) -> Dice:
     """
     Parse a dice string like "2d8+3" or "1d20-1" into a Dice object.
+    The string is parsed by compile_dice, so parsing the same string again is a cache lookup.
     
     Args:
         dice_string: String in format "XdY+Z" or "XdY-Z" or "XdY"
@@ -199,31 +407,7 @@ def parse_dice_string(dice_string: str) -> Dice:
     Raises:
         ValueError: If the string format is invalid
     """
-    dice_string = dice_string.strip().lower().replace(" ", "")
-    
-    # Handle modifier
-    modifier = 0
-    if "+" in dice_string:
-        dice_part, mod_part = dice_string.split("+", 1)
-        modifier = int(mod_part)
-    elif "-" in dice_string and dice_string.count("-") == 1:
-        dice_part, mod_part = dice_string.split("-", 1)
-        modifier = -int(mod_part)
-    else:
-        dice_part = dice_string
-    
-    # Parse dice part
-    if "d" not in dice_part:
+    dice = compile_dice(dice_string).dice
+    if dice is None:
         raise ValueError("Invalid dice string format. Expected format: 'XdY' or 'XdY+Z'")
-    
-    num_str, sides_str = dice_part.split("d", 1)
-    
-    # Handle implicit 1 (e.g., "d20" instead of "1d20")
-    if num_str == "":
-        num_dice = 1
-    else:
-        num_dice = int(num_str)
-    
-    sides = int(sides_str)
-    
-    return Dice(num_dice, sides, modifier)
\ No newline at end of file
+    return Dice(*dice)
\ No newline at end of file
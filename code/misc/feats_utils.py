@@ -36,9 +36,10 @@ def choose_fighting_style(styles_available, character=None):
     ).execute()
     return style
 
-def add_feat(character, feat_name, feat_data=None, available_fighting_styles=None):
+def add_feat(character, feat_name, feat_data=None, available_fighting_styles=None, fighting_style=None):
     """
     Add a feat to the character, handling any special logic (e.g., fighting style selection, ability increases).
+    If fighting_style is given it is used instead of prompting (it must be one of the available styles).
     Returns a dict of feat results (e.g., chosen style, ability increases) for display.
     """
     if feat_data is None:
@@ -49,10 +50,13 @@ def add_feat(character, feat_name, feat_data=None, available_fighting_styles=Non
         from misc.feats import FIGHTING_STYLE_FEATS
         if not available_fighting_styles:
             available_fighting_styles = list(FIGHTING_STYLE_FEATS.keys())
-        if feat_name not in available_fighting_styles:
-            print(f"{feat_name} is not available to choose from.")
-            return None
-        style = choose_fighting_style(available_fighting_styles, character=character)
+        if fighting_style is not None:
+            already_chosen = set(getattr(character, 'fighting_styles', [])) if character is not None else set()
+            if fighting_style not in available_fighting_styles or fighting_style in already_chosen:
+                raise ValueError(f"{fighting_style} is not available to choose from.")
+            style = fighting_style
+        else:
+            style = choose_fighting_style(available_fighting_styles, character=character)
         if style is None:
             return None
         # Add to character's fighting_styles if present
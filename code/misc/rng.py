@@ -0,0 +1,146 @@
+"""
+Reproducible random number streams for D&D dice rolling.
+A RollStream is a drop-in random.Random backed by NumPy's counter-based Philox generator, so independent
+streams can be derived from one master seed (per character, per session, or per worker chunk) without any
+shared global state. Without NumPy, streams fall back to the standard Mersenne Twister seeded from the same key.
+"""
+
+import random
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Number of 64-bit words drawn from the bit generator at a time
+_BUFFER_SIZE = 1024
+_TWO_POW_53 = 2.0 ** -53
+
+
+class RollStream(random.Random):
+    """
+    An independent, reproducible random number stream.
+
+    Supports the full random.Random API (randint, choice, choices, sample, shuffle, ...) for the scalar rolls
+    in dice_rolling and dice_expressions, and exposes a numpy.random.Generator on the same stream for batch rolls.
+    """
+
+    def __init__(self, seed=None, spawn_key: tuple = ()):
+        """
+        Initialize a stream.
+
+        Args:
+            seed (int | numpy.random.SeedSequence, optional): Master seed. Defaults to fresh OS entropy.
+            spawn_key (tuple, optional): Path identifying this stream under the master seed, e.g. (chunk_index,).
+                Streams with the same seed and key always produce the same rolls; different keys are independent.
+        """
+        self.spawn_key = tuple(spawn_key)
+        self._words = []
+        self._index = 0
+        self._generator = None
+        self._seed_sequence = None
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        """
+        Reseed the stream from a master seed and this stream's spawn key.
+        """
+        self._words = []
+        self._index = 0
+        if np is None:
+            self._generator = None
+            super().seed(f"{a}:{self.spawn_key}" if a is not None else None, version)
+            return
+        if isinstance(a, np.random.SeedSequence):
+            self._seed_sequence = a
+        else:
+            self._seed_sequence = np.random.SeedSequence(a, spawn_key=self.spawn_key)
+        self._generator = np.random.Generator(np.random.Philox(self._seed_sequence))
+
+    @property
+    def generator(self):
+        """The numpy.random.Generator backing this stream, for batch rolls (None without NumPy)."""
+        return self._generator
+
+    def _next_word(self) -> int:
+        """Return the next raw 64-bit word from the Philox stream, refilling the buffer as needed."""
+        if self._index >= len(self._words):
+            self._words = self._generator.bit_generator.random_raw(_BUFFER_SIZE).tolist()
+            self._index = 0
+        word = self._words[self._index]
+        self._index += 1
+        return word
+
+    def random(self) -> float:
+        """Return the next float in [0.0, 1.0)."""
+        if self._generator is None:
+            return super().random()
+        return (self._next_word() >> 11) * _TWO_POW_53
+
+    def getrandbits(self, k: int) -> int:
+        """Return an int with k random bits."""
+        if self._generator is None:
+            return super().getrandbits(k)
+        if k <= 64:
+            return self._next_word() >> (64 - k) if k else 0
+        result = 0
+        for _ in range((k + 63) // 64):
+            result = (result << 64) | self._next_word()
+        return result >> (-k % 64)
+
+    def _randbelow(self, n: int) -> int:
+        """Return a random int in [0, n), by rejection sampling on the top bits of each word."""
+        if self._generator is None or n.bit_length() > 64:
+            return super()._randbelow(n)
+        if n <= 1:
+            return 0
+        shift = 64 - n.bit_length()
+        while True:
+            if self._index >= len(self._words):
+                self._words = self._generator.bit_generator.random_raw(_BUFFER_SIZE).tolist()
+                self._index = 0
+            value = self._words[self._index] >> shift
+            self._index += 1
+            if value < n:
+                return value
+
+    def spawn(self, count: int) -> List["RollStream"]:
+        """
+        Spawn independent child streams, e.g. one per character in a session.
+
+        Args:
+            count (int): Number of child streams
+
+        Returns:
+            List[RollStream]: The child streams
+        """
+        if self._seed_sequence is None:
+            return [RollStream(self.getrandbits(64)) for _ in range(count)]
+        return [RollStream(child) for child in self._seed_sequence.spawn(count)]
+
+    def getstate(self):
+        if self._generator is None:
+            return super().getstate()
+        return self._generator.bit_generator.state, list(self._words), self._index
+
+    def setstate(self, state):
+        if self._generator is None:
+            return super().setstate(state)
+        self._generator.bit_generator.state, words, self._index = state
+        self._words = list(words)
+
+
+def stream_for(seed: int, *key: int) -> RollStream:
+    """
+    Return the stream identified by key under a master seed, e.g. stream_for(seed, chunk_index).
+    Any stream can be derived directly, so workers need no coordination to stay deterministic.
+
+    Args:
+        seed (int): Master seed
+        *key (int): Non-negative integers identifying the stream
+
+    Returns:
+        RollStream: The stream
+    """
+    return RollStream(seed, spawn_key=key)
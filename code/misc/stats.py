@@ -4,8 +4,8 @@ Provides functions for ability scores, modifiers, HP, AC, and other stat calcula
 """
 
 import inquirer
-from .dice_rolling import Dice
-from equipment.armor_dict import LIGHT_ARMOR_DICT, MEDIUM_ARMOR_DICT, HEAVY_ARMOR_DICT
+from .alias_sampler import ability_score_sampler
+from equipment.item_catalog import lookup_item
 
 ABILITY_NAMES = [
     "Strength",
@@ -16,14 +16,18 @@ ABILITY_NAMES = [
     "Charisma"
 ]
 
-def roll_ability_scores() -> dict[str, int]:
+def roll_ability_scores(rng=None) -> dict[str, int]:
     """
     Roll 4d6, drop the lowest, for each ability and return as a dictionary.
+    Each score is one draw from the precomputed 4d6 drop lowest distribution.
+    Args:
+        rng (random.Random, optional): Random number generator to roll with, e.g. a misc.rng.RollStream.
+            Defaults to the global random module.
     Returns:
         dict[str, int]: Mapping of ability names to rolled scores.
     """
-    dice = Dice(4, 6)
-    scores = {name: dice.roll_drop_lowest() for name in ABILITY_NAMES}
+    sampler = ability_score_sampler()
+    scores = {name: sampler.sample(rng) for name in ABILITY_NAMES}
     return scores
 
 def save_ability_scores(scores: dict[str, int]) -> dict[str, int]:
@@ -36,15 +40,17 @@ def save_ability_scores(scores: dict[str, int]) -> dict[str, int]:
     """
     return dict(scores)
 
-def interactive_ability_assignment() -> dict[str, int]:
+def interactive_ability_assignment(rng=None) -> dict[str, int]:
     """
     Roll 7 ability scores, let user assign each to an ability, removing chosen score from pool after each pick.
     Uses inquirer for interactive selection.
+    Args:
+        rng (random.Random, optional): Random number generator to roll with. Defaults to the global random module.
     Returns:
         dict[str, int]: Final assigned ability scores.
     """
-    dice = Dice(4, 6)
-    pool = [dice.roll_drop_lowest() for _ in range(7)]
+    sampler = ability_score_sampler()
+    pool = [sampler.sample(rng) for _ in range(7)]
     print(f"Rolled ability scores: {pool}")
     assigned = {}
     remaining = pool.copy()
@@ -116,21 +122,17 @@ def calc_ac(equipped_armor=None, dex_mod=0, con_mod=0, wis_mod=0, barbarian=Fals
     # Armor equipped
     ac = 10
     armor_ac = 0
-    if equipped_armor:
-        if equipped_armor in LIGHT_ARMOR_DICT:
-            armor_ac = LIGHT_ARMOR_DICT[equipped_armor]['ac']
+    armor = lookup_item(equipped_armor)
+    if armor is not None and armor.is_body_armor:
+        armor_ac = armor.stats['ac']
+        if armor.subcategory == 'light':
             ac = armor_ac + dex_mod
-        elif equipped_armor in MEDIUM_ARMOR_DICT:
-            armor_ac = MEDIUM_ARMOR_DICT[equipped_armor]['ac']
+        elif armor.subcategory == 'medium':
             ac = armor_ac + min(dex_mod, 2)
-        elif equipped_armor in HEAVY_ARMOR_DICT:
-            armor_ac = HEAVY_ARMOR_DICT[equipped_armor]['ac']
-            ac = armor_ac  # No DEX mod
         else:
-            # Unknown armor, fallback to base 10 + DEX
-            ac = 10 + dex_mod
+            ac = armor_ac  # Heavy armor: no DEX mod
     else:
-        # No armor: base 10 + DEX
+        # No armor, or unknown armor: base 10 + DEX
         ac = 10 + dex_mod
     # Add shield bonus if applicable (not for monk)
     if shield and not monk:
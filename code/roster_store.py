@@ -0,0 +1,413 @@
+"""
+roster_store.py
+---------------
+Columnar, memory-mapped roster files for scanning millions of characters.
+
+A roster stores one column per character field (ability scores, level, class, species, HP, AC, skill and saving
+throw bitmasks, ...) as a contiguous NumPy array, laid out by roster_dtype(). Names, class, species, background,
+spell, and item strings are stored once in lookup tables, with characters holding their IDs. Each character's
+spells and items are variable-length lists, kept in side arrays indexed by offsets (character i's spells are
+spell_ids[spell_offsets[i]:spell_offsets[i + 1]]).
+
+RosterStore memory-maps the file and wraps each column with numpy.frombuffer, so opening is instant, nothing is
+copied, and any number of processes scanning the same roster share it through the page cache. Queries are
+vectorized scans over the columns:
+
+    roster = RosterStore("npcs.roster")
+    roster.mean('ac', level=5, class_name='Fighter', species='Dwarf')
+
+File layout (little-endian):
+    8 bytes  magic b"DNDROSTR"
+    4 bytes  format version
+    4 bytes  header length
+    header   JSON: {"count": n, "tables": {table: [name, ...]}, "sections": {section: [dtype, offset, length]}}
+    sections Column and side arrays, each starting on a 64-byte boundary (offsets are from the start of the file)
+
+Requires NumPy.
+
+Functions:
+    write_roster(path, characters): Writes characters to a roster file and returns how many were written.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from misc.skills import SKILLS_DICT
+from misc.stats import ABILITY_NAMES
+
+_MAGIC = b"DNDROSTR"
+_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+SKILL_NAMES = list(SKILLS_DICT)
+# Columns stored per character: (name, NumPy type code, array module type code)
+ROSTER_COLUMNS = [
+    *((ability.lower(), 'u1', 'B') for ability in ABILITY_NAMES),
+    ('level', 'u1', 'B'),
+    ('class_id', 'u2', 'H'),
+    ('species_id', 'u2', 'H'),
+    ('background_id', 'u2', 'H'),
+    ('hp', 'i2', 'h'),                    # -1 before the character has a class
+    ('ac', 'u1', 'B'),
+    ('spell_save_dc', 'u1', 'B'),         # 0 for non-casters
+    ('passive_perception', 'u1', 'B'),
+    ('skills', 'u4', 'I'),                # bit i set if proficient in SKILL_NAMES[i]
+    ('saving_throws', 'u1', 'B'),         # bit i set if proficient in ABILITY_NAMES[i] saving throws
+    ('gold_pieces', 'u4', 'I'),
+]
+# (lookup table, ID column) for the columns queried by name, e.g. class_name='Fighter'
+_NAMED_COLUMNS = {
+    'class_name': ('class', 'class_id'),
+    'species': ('species', 'species_id'),
+    'background': ('background', 'background_id'),
+}
+# Side arrays: (section, NumPy type code, array module type code)
+_SIDE_ARRAYS = [
+    ('name_offsets', 'u8', 'Q'),
+    ('names', 'u1', 'B'),                 # UTF-8 character names
+    ('spell_offsets', 'u8', 'Q'),
+    ('spell_ids', 'u2', 'H'),
+    ('item_offsets', 'u8', 'Q'),
+    ('item_ids', 'u2', 'H'),
+    ('item_quantities', 'u4', 'I'),
+]
+_SIDE_ARRAY_NAMES = frozenset(name for name, _, _ in _SIDE_ARRAYS)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is not installed. Please install it with 'pip install numpy'.")
+
+
+def roster_dtype():
+    """Return the NumPy structured dtype describing one character's columns (a row of RosterStore.rows())."""
+    _require_numpy()
+    return np.dtype([(name, '<' + code) for name, code, _ in ROSTER_COLUMNS])
+
+
+def _bitmask(names, order):
+    """Return an int with bit i set for each name in names that is order[i]."""
+    mask = 0
+    for name in names:
+        if name in order:
+            mask |= 1 << order.index(name)
+    return mask
+
+
+class _Table:
+    """Strings in the order first seen, each with its index as ID."""
+
+    __slots__ = ('ids', 'names')
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def id_for(self, name):
+        table_id = self.ids.get(name)
+        if table_id is None:
+            table_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return table_id
+
+
+class RosterWriter:
+    """
+    Writes characters to a roster file, one add() at a time. The file is written on close() (or on leaving a
+    with block), to a temporary file that then replaces path, so readers never map a half-written roster.
+    """
+
+    def __init__(self, path):
+        _require_numpy()
+        self.path = Path(path)
+        self._tables = {table: _Table() for table in ('class', 'species', 'background', 'spell', 'item')}
+        self._columns = {name: array(typecode) for name, _, typecode in ROSTER_COLUMNS}
+        self._side = {name: array(typecode) for name, _, typecode in _SIDE_ARRAYS}
+        for offsets in ('name_offsets', 'spell_offsets', 'item_offsets'):
+            self._side[offsets].append(0)
+        self._closed = False
+
+    def add(self, character) -> None:
+        """Append a character (a charGen) to the roster."""
+        columns, side, tables = self._columns, self._side, self._tables
+        scores = character.ability_scores or {}
+        for ability in ABILITY_NAMES:
+            columns[ability.lower()].append(scores.get(ability, 0))
+        columns['level'].append(character.level)
+        columns['class_id'].append(tables['class'].id_for(character.class_name))
+        columns['species_id'].append(tables['species'].id_for(character.species))
+        columns['background_id'].append(tables['background'].id_for(character.background))
+        hp = character.hp
+        columns['hp'].append(-1 if hp is None else hp)
+        columns['ac'].append(character.armor_class)
+        columns['spell_save_dc'].append(character.spell_save_dc or 0)
+        columns['passive_perception'].append(character.passive_perception or 0)
+        columns['skills'].append(_bitmask(character.skills, SKILL_NAMES))
+        columns['saving_throws'].append(
+            _bitmask(getattr(character, 'saving_throw_proficiencies', ()), ABILITY_NAMES))
+        columns['gold_pieces'].append(character.gold_pieces)
+
+        side['names'].frombytes(character.name.encode('utf-8'))
+        side['name_offsets'].append(len(side['names']))
+        spell_table = tables['spell']
+        side['spell_ids'].extend(spell_table.id_for(spell) for spell in sorted(character.spell_loadout))
+        side['spell_offsets'].append(len(side['spell_ids']))
+        item_table = tables['item']
+        for inventory in (character.equipment, character.inventory):
+            for entry in inventory:
+                side['item_ids'].append(item_table.id_for(entry.item_id))
+                side['item_quantities'].append(entry.quantity)
+        side['item_offsets'].append(len(side['item_ids']))
+
+    def extend(self, characters) -> None:
+        """Append every character in an iterable."""
+        for character in characters:
+            self.add(character)
+
+    def __len__(self):
+        return len(self._columns['level'])
+
+    def close(self) -> None:
+        """Write the roster file."""
+        if self._closed:
+            return
+        sections = {}
+        for name, code, _ in ROSTER_COLUMNS:
+            sections[name] = np.frombuffer(self._columns[name], dtype=code)
+        for name, code, _ in _SIDE_ARRAYS:
+            sections[name] = np.frombuffer(self._side[name], dtype=code)
+        tables = {table: values.names for table, values in self._tables.items()}
+        _write_sections(self.path, len(self), tables, sections)
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+
+
+def _write_sections(path, count, tables, sections):
+    """Write a roster file from its lookup tables and {section: NumPy array}."""
+    path = Path(path)
+    layout = {}
+    # Section offsets depend on the header length, which depends on the offsets: lay out with room to spare
+    offset = end = 0
+    for name, values in sections.items():
+        layout[name] = [values.dtype.newbyteorder('<').str, offset, len(values)]
+        end = offset + values.nbytes
+        offset = -(-end // _ALIGNMENT) * _ALIGNMENT
+    header = {"count": count, "tables": tables, "sections": layout}
+    encoded = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # Reserve space for the offsets to grow by up to 20 digits each once the data start is added
+    data_start = -(-(_PREAMBLE.size + len(encoded) + 20 * len(layout)) // _ALIGNMENT) * _ALIGNMENT
+    for entry in layout.values():
+        entry[1] += data_start
+    encoded = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temp_path, "wb") as out:
+        out.write(_PREAMBLE.pack(_MAGIC, _VERSION, len(encoded)))
+        out.write(encoded)
+        for name, values in sections.items():
+            out.seek(layout[name][1])
+            out.write(np.ascontiguousarray(values, dtype=layout[name][0]).data)
+        # Empty sections at the end write nothing; extend the file so their offsets are still inside it
+        out.truncate(data_start + end)
+    os.replace(temp_path, path)
+
+
+def write_roster(path, characters) -> int:
+    """
+    Write characters to a roster file at path.
+
+    Args:
+        path (str or Path): Output file.
+        characters (iterable): charGen objects.
+
+    Returns:
+        int: Number of characters written.
+
+    Example:
+        write_roster("npcs.roster", npcs)
+        write_roster("empty.roster", [])     # an empty roster opens as a store of 0 characters
+        with RosterStore("empty.roster") as roster:
+            roster.count(level=1)            # 0
+    """
+    with RosterWriter(path) as writer:
+        writer.extend(characters)
+    return len(writer)
+
+
+class RosterStore:
+    """
+    A memory-mapped roster file. Columns are read-only NumPy arrays over the mapped file.
+
+    Criteria for the query methods are column=value keyword arguments, ANDed together. class_name, species,
+    and background take names; skill='Perception' or save='Wisdom' test proficiency; a list or tuple value
+    matches any of its values.
+    """
+
+    def __init__(self, path):
+        """
+        Open and memory-map a roster file.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a roster of this version.
+        """
+        _require_numpy()
+        self.path = Path(path)
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _PREAMBLE.size:
+            raise ValueError(f"{path} is not a roster file")
+        magic, version, header_length = _PREAMBLE.unpack_from(self._buffer)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a version {_VERSION} roster file")
+        header = json.loads(self._buffer[_PREAMBLE.size:_PREAMBLE.size + header_length])
+        self._count = header["count"]
+        self.tables = header["tables"]
+        self._table_ids = {table: {name: index for index, name in enumerate(names)}
+                           for table, names in self.tables.items()}
+        self._sections = {
+            name: np.frombuffer(self._buffer, dtype=dtype, count=length, offset=offset)
+            for name, (dtype, offset, length) in header["sections"].items()
+        }
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, column: str):
+        """Return a column (or side array) as a read-only NumPy array."""
+        return self._sections[column]
+
+    @property
+    def columns(self) -> list:
+        """The names of the per-character columns."""
+        return [name for name, _, _ in ROSTER_COLUMNS]
+
+    def rows(self, indices=None):
+        """
+        Return characters' columns as a structured array (a copy) with roster_dtype() fields.
+
+        Args:
+            indices (array-like or slice, optional): Which characters. Defaults to all of them.
+        """
+        selection = slice(None) if indices is None else indices
+        columns = {name: self._sections[name][selection] for name in self.columns}
+        rows = np.empty(len(columns['level']), dtype=roster_dtype())
+        for name, values in columns.items():
+            rows[name] = values
+        return rows
+
+    def lookup(self, table: str, name: str) -> int:
+        """Return the ID of a name in a lookup table ('class', 'species', 'background', 'spell', 'item'), or -1."""
+        return self._table_ids[table].get(name, -1)
+
+    def where(self, **criteria):
+        """Return a boolean mask of the characters matching every criterion (all True without criteria)."""
+        mask = np.ones(self._count, dtype=bool)
+        for key, value in criteria.items():
+            if key == 'skill' or key == 'save':
+                # Proficient in every skill (or saving throw) given
+                column, order = ('skills', SKILL_NAMES) if key == 'skill' else ('saving_throws', ABILITY_NAMES)
+                names = value if isinstance(value, (list, tuple)) else (value,)
+                if any(name not in order for name in names):
+                    raise KeyError(f"Unknown {key}: {', '.join(name for name in names if name not in order)}")
+                bits = _bitmask(names, order)
+                mask &= (self._sections[column] & bits) == bits
+                continue
+            if key in _NAMED_COLUMNS:
+                table, key = _NAMED_COLUMNS[key]
+                value = ([self.lookup(table, name) for name in value] if isinstance(value, (list, tuple))
+                         else self.lookup(table, value))
+            elif key not in self._sections or key in _SIDE_ARRAY_NAMES:
+                raise KeyError(f"{key} is not a roster column")
+            column = self._sections[key]
+            if isinstance(value, (list, tuple)):
+                mask &= np.isin(column, value)
+            else:
+                mask &= column == value
+        return mask
+
+    def count(self, **criteria) -> int:
+        """Return how many characters match the criteria."""
+        return int(np.count_nonzero(self.where(**criteria)))
+
+    def mean(self, column: str, **criteria):
+        """Return the mean of a column over the characters matching the criteria, or None if none match."""
+        values = self._sections[column]
+        if criteria:
+            values = values[self.where(**criteria)]
+        return float(values.mean(dtype=np.float64)) if len(values) else None
+
+    def value_counts(self, column: str, **criteria) -> dict:
+        """Return {value: count} of a column over the characters matching the criteria (names for ID columns)."""
+        values = self._sections[column]
+        if criteria:
+            values = values[self.where(**criteria)]
+        values, counts = np.unique(values, return_counts=True)
+        table = next((table for table, id_column in _NAMED_COLUMNS.values() if id_column == column), None)
+        names = self.tables[table] if table else None
+        return {int(value) if names is None else names[value]: int(total) for value, total in zip(values, counts)}
+
+    def _rows_containing(self, ids_section, offsets_section, table, name):
+        mask = np.zeros(self._count, dtype=bool)
+        table_id = self.lookup(table, name)
+        if table_id >= 0:
+            positions = np.flatnonzero(self._sections[ids_section] == table_id)
+            mask[np.searchsorted(self._sections[offsets_section], positions, side='right') - 1] = True
+        return mask
+
+    def with_spell(self, spell_name: str):
+        """Return a boolean mask of the characters who have a spell."""
+        return self._rows_containing('spell_ids', 'spell_offsets', 'spell', spell_name)
+
+    def with_item(self, item_name: str):
+        """Return a boolean mask of the characters who carry an item."""
+        return self._rows_containing('item_ids', 'item_offsets', 'item', item_name)
+
+    def name(self, index: int) -> str:
+        """Return a character's name."""
+        offsets = self._sections['name_offsets']
+        return bytes(self._sections['names'][offsets[index]:offsets[index + 1]]).decode('utf-8')
+
+    def spells(self, index: int) -> list:
+        """Return the names of a character's spells."""
+        offsets, names = self._sections['spell_offsets'], self.tables['spell']
+        return [names[spell_id] for spell_id in self._sections['spell_ids'][offsets[index]:offsets[index + 1]]]
+
+    def items(self, index: int) -> list:
+        """Return a character's (item name, quantity) pairs, equipment first."""
+        offsets, names = self._sections['item_offsets'], self.tables['item']
+        start, end = offsets[index], offsets[index + 1]
+        return [(names[item_id], int(quantity)) for item_id, quantity in
+                zip(self._sections['item_ids'][start:end], self._sections['item_quantities'][start:end])]
+
+    def close(self) -> None:
+        """Unmap the file, or leave it to be unmapped with the last array still taken from the roster."""
+        self._sections = {}
+        try:
+            self._buffer.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
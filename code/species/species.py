@@ -7,61 +7,119 @@ from InquirerPy import inquirer
 from species.species_utils import print_species_traits, SPECIES_DATA, traits
 from species.species_dict import TRAIT_DATA
 
-def main():
+LINEAGE_MAP = {
+    'Elven Lineage': 'Lineage',
+    'Draconic Ancestry': 'Ancestry',
+    'Giant Ancestry': 'Ancestry',
+    'Gnomish Lineage': 'Lineage',
+    'Fiendish Legacy': 'Legacy',
+}
+
+def get_lineage_options(trait: str) -> dict:
     """
-    Presents a selection menu for species, handles lineage/ancestry/legacy traits,
-    and prints detailed information about the selected species.
-    
+    Return the lineage/ancestry/legacy options dict for a lineage-style trait.
+    """
+    return TRAIT_DATA[trait][1] if isinstance(TRAIT_DATA[trait], list) else TRAIT_DATA[trait]
+
+def get_final_species_name(display_type, chosen_lineage, species_name):
+    if display_type == 'Lineage' and 'Elf' in species_name:
+        return f"{chosen_lineage}"
+    elif display_type == 'Ancestry' and 'Dragonborn' in species_name:
+        return f"{chosen_lineage} Dragonborn"
+    elif display_type == 'Legacy' and 'Tiefling' in species_name:
+        return f"{chosen_lineage} Tiefling"
+    elif display_type == 'Ancestry' and 'Giant' in species_name:
+        return f"{chosen_lineage} Goliath"
+    elif display_type == 'Lineage' and 'Gnome' in species_name:
+        return f"{chosen_lineage} Gnome"
+    return species_name
+
+def resolve_species_traits(species_name: str, lineage: str = None):
+    """
+    Resolve a species' trait list, replacing its lineage/ancestry/legacy trait with the chosen option.
+    If lineage is None, the user is prompted for each lineage-style trait.
+
     Returns:
-        dict: Contains the final species name, trait list, and trait description overrides.
+        tuple: (final_species_name, trait_list, trait_desc_overrides)
+
+    Raises:
+        ValueError: If the species is unknown or the lineage is not a valid option.
     """
-    # Present a selection menu for species instead of text input
-    species_choices = list(SPECIES_DATA.keys())
-    species_name = inquirer.select(
-        message="Select a species:",
-        choices=species_choices,
-    ).execute()
     species_info = SPECIES_DATA.get(species_name)
-    # Check for lineage/ancestry traits
+    if species_info is None:
+        raise ValueError(f"Unknown species: {species_name}")
     trait_list = species_info[traits][:]
     trait_desc_overrides = {}
-    lineage_map = {
-        'Elven Lineage': 'Lineage',
-        'Draconic Ancestry': 'Ancestry',
-        'Giant Ancestry': 'Ancestry',
-        'Gnomish Lineage': 'Lineage',
-        'Fiendish Legacy': 'Legacy',
-    }
-
-    def get_final_species_name(display_type, chosen_lineage, species_name):
-        if display_type == 'Lineage' and 'Elf' in species_name:
-            return f"{chosen_lineage}"
-        elif display_type == 'Ancestry' and 'Dragonborn' in species_name:
-            return f"{chosen_lineage} Dragonborn"
-        elif display_type == 'Legacy' and 'Tiefling' in species_name:
-            return f"{chosen_lineage} Tiefling"
-        elif display_type == 'Ancestry' and 'Giant' in species_name:
-            return f"{chosen_lineage} Goliath"
-        elif display_type == 'Lineage' and 'Gnome' in species_name:
-            return f"{chosen_lineage} Gnome"
-        return species_name
-
     final_species_name = species_name
     # Use a copy to avoid modifying while iterating
     for trait in trait_list[:]:
-        if trait in lineage_map:
-            display_type = lineage_map[trait]
-            options_dict = TRAIT_DATA[trait][1] if isinstance(TRAIT_DATA[trait], list) else TRAIT_DATA[trait]
-            lineage_options = list(options_dict.keys())
-            chosen_lineage = inquirer.select(
-                message=f"Select {display_type}:",
-                choices=lineage_options,
-            ).execute()
+        if trait in LINEAGE_MAP:
+            display_type = LINEAGE_MAP[trait]
+            options_dict = get_lineage_options(trait)
+            if lineage is None:
+                chosen_lineage = inquirer.select(
+                    message=f"Select {display_type}:",
+                    choices=list(options_dict.keys()),
+                ).execute()
+            elif lineage in options_dict:
+                chosen_lineage = lineage
+            else:
+                raise ValueError(f"{lineage} is not a valid {display_type} for {species_name}")
             trait_list.remove(trait)
             trait_list.append(chosen_lineage)
             trait_desc_overrides[chosen_lineage] = options_dict[chosen_lineage]
             final_species_name = get_final_species_name(display_type, chosen_lineage, species_name)
+    return final_species_name, trait_list, trait_desc_overrides
+
+def build_species(species_name: str, lineage: str = None) -> dict:
+    """
+    Build the species result for a species and lineage without prompting.
+    This is the non-interactive counterpart of main().
+
+    Args:
+        species_name (str): Key into SPECIES_DATA.
+        lineage (str, optional): Lineage/ancestry/legacy option, required for species that have one.
+
+    Returns:
+        dict: Contains the final species name, trait list, and proficiencies.
+
+    Raises:
+        ValueError: If the species is unknown or the lineage is missing or invalid.
+    """
+    if lineage is None and any(t in LINEAGE_MAP for t in SPECIES_DATA.get(species_name, {}).get(traits, [])):
+        raise ValueError(f"{species_name} requires a lineage choice")
+    final_species_name, trait_list, _ = resolve_species_traits(species_name, lineage)
+    return species_result(final_species_name, trait_list)
+
+def species_result(final_species_name: str, trait_list: list) -> dict:
+    """
+    Package the chosen species and traits in the format returned by main().
+    """
+    # Add proficiencies if any species grants them (future-proof, e.g. custom/variant)
+    proficiencies = {'weapons': set(), 'armor': set(), 'tools': set()}
+    # Example: if a trait grants a proficiency, add here (none in default data)
+    # For now, just return empty sets
+    return {
+        'species': final_species_name,
+        'species_traits': trait_list,
+        'proficiencies': proficiencies
+    }
+
+def main():
+    """
+    Presents a selection menu for species, handles lineage/ancestry/legacy traits,
+    and prints detailed information about the selected species.
+    
+    Returns:
+        dict: Contains the final species name, trait list, and trait description overrides.
+    """
     while True:
+        # Present a selection menu for species instead of text input
+        species_name = inquirer.select(
+            message="Select a species:",
+            choices=list(SPECIES_DATA.keys()),
+        ).execute()
+        final_species_name, trait_list, trait_desc_overrides = resolve_species_traits(species_name)
         # Print species info with updated traits and description overrides, using the base species_name for lookup
         print_species_traits(species_name, override_traits=trait_list, trait_desc_overrides=trait_desc_overrides)
         print(f"\nFinal traits for {final_species_name}:")
@@ -74,38 +132,9 @@ def main():
         if confirm == "Yes":
             break
         # If No, go back to main species selection
-        species_name = inquirer.select(
-            message="Select a species:",
-            choices=list(SPECIES_DATA.keys()),
-        ).execute()
-        species_info = SPECIES_DATA.get(species_name)
-        trait_list = species_info[traits][:]
-        trait_desc_overrides = {}
-        final_species_name = species_name
-        for trait in trait_list[:]:
-            if trait in lineage_map:
-                display_type = lineage_map[trait]
-                options_dict = TRAIT_DATA[trait][1] if isinstance(TRAIT_DATA[trait], list) else TRAIT_DATA[trait]
-                lineage_options = list(options_dict.keys())
-                chosen_lineage = inquirer.select(
-                    message=f"Select {display_type}:",
-                    choices=lineage_options,
-                ).execute()
-                trait_list.remove(trait)
-                trait_list.append(chosen_lineage)
-                trait_desc_overrides[chosen_lineage] = options_dict[chosen_lineage]
-                final_species_name = get_final_species_name(display_type, chosen_lineage, species_name)
     print(f"{final_species_name} selected as species.")
     # Return species and traits for use by caller
-    # Add proficiencies if any species grants them (future-proof, e.g. custom/variant)
-    proficiencies = {'weapons': set(), 'armor': set(), 'tools': set()}
-    # Example: if a trait grants a proficiency, add here (none in default data)
-    # For now, just return empty sets
-    return {
-        'species': final_species_name,
-        'species_traits': trait_list,
-        'proficiencies': proficiencies
-    }
+    return species_result(final_species_name, trait_list)
 
 if __name__ == "__main__":
     main()
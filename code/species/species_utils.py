@@ -103,10 +103,14 @@ def get_species_traits(species_name: str):
 
 
 
-def handle_special_skill_traits(traits: list, current_skills: list) -> list:
+def handle_special_skill_traits(traits: list, current_skills: list, choices: dict = None) -> list:
     """
     Handle special skill-granting traits like Keen Senses and Skillful.
     Prompts the user to choose a skill if needed and returns the updated skills list.
+    If choices is a dict mapping trait names to skills (e.g. {'Keen Senses': 'Perception'}), it is used instead of prompting.
+
+    Raises:
+        ValueError: If a provided choice is not an available skill for that trait.
     """
     # For Keen Senses
     keen_skills = ["Insight", "Perception", "Survival"]
@@ -114,21 +118,29 @@ def handle_special_skill_traits(traits: list, current_skills: list) -> list:
         # Only show non-proficient keen skills
         non_proficient_keen = [s for s in keen_skills if s not in current_skills]
         if non_proficient_keen:
-            choice = inquirer.select(
-                message="Keen Senses: Choose a skill to gain proficiency in:",
-                choices=non_proficient_keen
-            ).execute()
+            if choices is None:
+                choice = inquirer.select(
+                    message="Keen Senses: Choose a skill to gain proficiency in:",
+                    choices=non_proficient_keen
+                ).execute()
+            else:
+                choice = choices.get("Keen Senses")
+                if choice not in non_proficient_keen:
+                    raise ValueError(f"Keen Senses must grant one of: {', '.join(non_proficient_keen)}")
             current_skills.append(choice)
     # For Skillful
     if "Skillful" in traits:
         all_skills = list(SKILLS_DICT.keys())
         non_proficient = [s for s in all_skills if s not in current_skills]
         if non_proficient:
-            choice = inquirer.select(
-                message="Skillful: Choose any skill to gain proficiency in:",
-                choices=non_proficient
-            ).execute()
+            if choices is None:
+                choice = inquirer.select(
+                    message="Skillful: Choose any skill to gain proficiency in:",
+                    choices=non_proficient
+                ).execute()
+            else:
+                choice = choices.get("Skillful")
+                if choice not in non_proficient:
+                    raise ValueError(f"Skillful must grant one of: {', '.join(non_proficient)}")
             current_skills.append(choice)
     return current_skills
-
-
@@ -1,8 +1,18 @@
-from .cantrips import CANTRIPS_DICT
-from .level1 import FIRST_LEVEL_SPELLS_DICT
-from .level2 import SECOND_LEVEL_SPELLS_DICT
-from .level3 import THIRD_LEVEL_SPELLS_DICT
-from .spells import prompt_and_print_class_spell_list
+"""
+Spells package. The spell level dictionaries and prompt_and_print_class_spell_list are loaded on first access
+through a module __getattr__, so importing the package does not build every spell dict.
+"""
+
+import importlib
+
+# Attribute name -> submodule defining it
+_LAZY_ATTRIBUTES = {
+    "CANTRIPS_DICT": ".cantrips",
+    "FIRST_LEVEL_SPELLS_DICT": ".level1",
+    "SECOND_LEVEL_SPELLS_DICT": ".level2",
+    "THIRD_LEVEL_SPELLS_DICT": ".level3",
+    "prompt_and_print_class_spell_list": ".spells",
+}
 
 __all__ = [
     "CANTRIPS_DICT",
@@ -11,3 +21,17 @@ __all__ = [
     "THIRD_LEVEL_SPELLS_DICT",
     "prompt_and_print_class_spell_list",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
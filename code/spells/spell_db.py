@@ -0,0 +1,196 @@
+"""
+spell_db.py
+-----------
+Precompiled, memory-mapped spell database.
+build_spell_db() packs every spell level into one binary file; open_spell_db() memory-maps it and decodes a
+spell only when it is looked up, so the catalog is available without importing or allocating the spell
+dict literals, and worker processes share the file through the page cache.
+
+File layout (little-endian):
+    8 bytes  magic b"DNDSPELL"
+    4 bytes  format version
+    4 bytes  header length
+    header   JSON: {"sources": {module: [mtime_ns, size]}, "levels": {level: [[name, offset, length, classes], ...]}}
+    records  JSON-encoded spell data, at offset bytes past the end of the header
+
+Build from the code directory with:
+    python -m spells.spell_db
+
+Functions:
+    build_spell_db(path=DEFAULT_SPELL_DB_PATH): Compiles the spell modules into the database file.
+    open_spell_db(path=DEFAULT_SPELL_DB_PATH): Opens the database, or returns None if it is missing or out of date.
+"""
+
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+
+from .spells_utils import SPELL_LEVEL_MODULES
+
+DEFAULT_SPELL_DB_PATH = Path(__file__).resolve().parent / "spell_catalog.bin"
+
+_MAGIC = b"DNDSPELL"
+_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def spell_source_stats():
+    """
+    Return {module_name: [mtime_ns, size]} for the spell level source files, used to detect a stale database.
+    """
+    package_dir = Path(__file__).resolve().parent
+    stats = {}
+    for module_name, _ in SPELL_LEVEL_MODULES.values():
+        source = package_dir / f"{module_name}.py"
+        if source.exists():
+            stat = source.stat()
+            stats[module_name] = [stat.st_mtime_ns, stat.st_size]
+    return stats
+
+
+def build_spell_db(path=DEFAULT_SPELL_DB_PATH):
+    """
+    Compile every spell level module into the database file at path.
+
+    Args:
+        path (str or Path, optional): Output file. Defaults to spell_catalog.bin in the spells package.
+
+    Returns:
+        int: Number of spells written.
+    """
+    levels = {}
+    records = bytearray()
+    count = 0
+    for level, (module_name, dict_name) in SPELL_LEVEL_MODULES.items():
+        spells = getattr(importlib.import_module(f".{module_name}", __package__), dict_name)
+        entries = levels[str(level)] = []
+        for name, data in spells.items():
+            encoded = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            entries.append([name, len(records), len(encoded), list(data.get("classes", []))])
+            records += encoded
+            count += 1
+    header = json.dumps({"sources": spell_source_stats(), "levels": levels},
+                        ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    path = Path(path)
+    # Write to a temporary file and rename, so readers never map a half-written database
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temp_path, "wb") as out:
+        out.write(_PREAMBLE.pack(_MAGIC, _VERSION, len(header)))
+        out.write(header)
+        out.write(records)
+    os.replace(temp_path, path)
+    return count
+
+
+class SpellLevel(Mapping):
+    """
+    Read-only {spell_name: spell_data} mapping for one spell level, decoding each spell on first access.
+    """
+
+    def __init__(self, buffer, data_start, entries):
+        self._buffer = buffer
+        self._data_start = data_start
+        self._entries = {name: (offset, length, classes) for name, offset, length, classes in entries}
+        self._decoded = {}
+
+    def __getitem__(self, name):
+        data = self._decoded.get(name)
+        if data is None:
+            offset, length, _ = self._entries[name]
+            start = self._data_start + offset
+            data = self._decoded[name] = json.loads(self._buffer[start:start + length])
+        return data
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def spell_classes(self, name):
+        """Return the classes that have a spell on their list, without decoding the spell."""
+        return self._entries[name][2]
+
+
+class SpellDatabase(Mapping):
+    """
+    Read-only {level: SpellLevel} mapping over a memory-mapped spell database.
+    A drop-in replacement for the dict returned by get_spell_dicts().
+    """
+
+    def __init__(self, path=DEFAULT_SPELL_DB_PATH):
+        """
+        Open and memory-map a spell database.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a spell database of this version
+        """
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _PREAMBLE.size:
+            self.close()
+            raise ValueError(f"{path} is not a spell database")
+        magic, version, header_length = _PREAMBLE.unpack_from(self._buffer)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {_VERSION} spell database")
+        header_end = _PREAMBLE.size + header_length
+        header = json.loads(self._buffer[_PREAMBLE.size:header_end])
+        self.sources = header["sources"]
+        self._levels = {
+            int(level): SpellLevel(self._buffer, header_end, entries)
+            for level, entries in header["levels"].items()
+        }
+
+    def __getitem__(self, level):
+        return self._levels[level]
+
+    def __iter__(self):
+        return iter(self._levels)
+
+    def __len__(self):
+        return len(self._levels)
+
+    def loaded_levels(self):
+        """Every level is available as soon as the database is open."""
+        return sorted(self._levels)
+
+    def is_current(self):
+        """Return True if the database was built from the spell source files as they are now."""
+        return all(self.sources.get(module) == stat for module, stat in spell_source_stats().items())
+
+    def close(self) -> None:
+        """Unmap the database file; spells already decoded stay readable."""
+        self._buffer.close()
+
+
+def open_spell_db(path=DEFAULT_SPELL_DB_PATH):
+    """
+    Open the spell database if it exists and is up to date with the spell source files.
+
+    Returns:
+        SpellDatabase or None: The database, or None if it is missing, unreadable, or stale.
+    """
+    try:
+        database = SpellDatabase(path)
+    except (OSError, ValueError):
+        return None
+    if not database.is_current():
+        database.close()
+        return None
+    return database
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SPELL_DB_PATH
+    written = build_spell_db(output)
+    print(f"Wrote {written} spells to {output}")
@@ -0,0 +1,185 @@
+"""
+spell_index.py
+--------------
+Inverted index over the spell catalog returned by get_spell_dicts().
+Built once, it maps class -> level -> sorted spell names, plus school, concentration, ritual, and component
+keys, so spell filtering is set intersection and difference instead of a scan over every spell.
+
+Functions:
+    get_spell_index(): Returns the shared SpellIndex, building it on first use.
+"""
+
+from functools import cached_property, lru_cache
+
+
+def is_concentration(spell_data):
+    """
+    Return True if a spell requires Concentration: an explicit 'concentration' key if present,
+    otherwise a duration of "Concentration, up to ...".
+    """
+    if "concentration" in spell_data:
+        return bool(spell_data["concentration"])
+    return spell_data.get("duration", "").startswith("Concentration")
+
+
+def is_ritual(spell_data):
+    """
+    Return True if a spell can be cast as a Ritual: an explicit 'ritual' key if present,
+    otherwise a casting time mentioning "Ritual".
+    """
+    if "ritual" in spell_data:
+        return bool(spell_data["ritual"])
+    return "ritual" in spell_data.get("casting_time", "").lower()
+
+
+class SpellIndex:
+    """
+    Inverted index of a spell catalog.
+
+    Class lists are indexed one level at a time, as levels are asked for, so a lazily loaded catalog only
+    loads the levels in use. The catalog-wide keys below are built together on first access.
+
+    Attributes:
+        spell_dicts (Mapping): {level: {spell_name: spell_data}} the index is built from.
+        level_of (dict): {spell_name: level}.
+        by_class (dict): {class_name: {level: tuple of sorted spell names}}.
+        by_school (dict): {school: frozenset of spell names}.
+        by_component (dict): {'V'/'S'/'M': frozenset of spell names}.
+        concentration (frozenset): Spells that require Concentration.
+        ritual (frozenset): Spells that can be cast as Rituals.
+    """
+
+    def __init__(self, spell_dicts):
+        self.spell_dicts = spell_dicts
+        # level -> {class_name: frozenset of spell names}
+        self._class_sets = {}
+
+    def _level_class_sets(self, level):
+        """Index one level's spells by class, loading that level if needed."""
+        class_sets = self._class_sets.get(level)
+        if class_sets is None:
+            by_class = {}
+            spells = self.spell_dicts.get(level, {})
+            # The spell database can list a spell's classes without decoding the spell
+            spell_classes = getattr(spells, "spell_classes", None)
+            for name in spells:
+                classes = spell_classes(name) if spell_classes else spells[name].get("classes", [])
+                for class_name in classes:
+                    by_class.setdefault(class_name, set()).add(name)
+            class_sets = self._class_sets[level] = {
+                class_name: frozenset(names) for class_name, names in by_class.items()
+            }
+        return class_sets
+
+    @cached_property
+    def _catalog_keys(self):
+        """Build every catalog-wide key in one pass over all levels."""
+        level_of, by_school, by_component = {}, {}, {}
+        concentration, ritual = set(), set()
+        for level, spells in self.spell_dicts.items():
+            for name, data in spells.items():
+                level_of[name] = level
+                by_school.setdefault(data.get("school", ""), set()).add(name)
+                for component in data.get("components", []):
+                    by_component.setdefault(component, set()).add(name)
+                if is_concentration(data):
+                    concentration.add(name)
+                if is_ritual(data):
+                    ritual.add(name)
+        by_class = {}
+        for level in self.spell_dicts:
+            for class_name, names in self._level_class_sets(level).items():
+                by_class.setdefault(class_name, {})[level] = tuple(sorted(names))
+        return {
+            "level_of": level_of,
+            "by_class": {class_name: dict(sorted(levels.items())) for class_name, levels in sorted(by_class.items())},
+            "by_school": {school: frozenset(names) for school, names in by_school.items()},
+            "by_component": {component: frozenset(names) for component, names in by_component.items()},
+            "concentration": frozenset(concentration),
+            "ritual": frozenset(ritual),
+        }
+
+    level_of = property(lambda self: self._catalog_keys["level_of"])
+    by_class = property(lambda self: self._catalog_keys["by_class"])
+    by_school = property(lambda self: self._catalog_keys["by_school"])
+    by_component = property(lambda self: self._catalog_keys["by_component"])
+    concentration = property(lambda self: self._catalog_keys["concentration"])
+    ritual = property(lambda self: self._catalog_keys["ritual"])
+
+    @property
+    def classes(self):
+        """Sorted names of every class with at least one spell."""
+        return list(self.by_class)
+
+    def level_for_dict(self, spells):
+        """
+        Return the level of a spell dict from this catalog, or None if it is not one of the catalog's dicts.
+        Only levels that are already loaded are checked, since spells must have come from one of them.
+        """
+        loaded = getattr(self.spell_dicts, "loaded_levels", None)
+        for level in (loaded() if loaded else self.spell_dicts):
+            if self.spell_dicts[level] is spells:
+                return level
+        return None
+
+    def class_spells(self, class_name, level):
+        """
+        Return the frozenset of spell names on a class's list at a level.
+        """
+        return self._level_class_sets(level).get(class_name, frozenset())
+
+    def query(self, class_name=None, level=None, school=None, concentration=None, ritual=None,
+              components=None, exclude=None):
+        """
+        Return the sorted names of spells matching every given criterion.
+
+        Args:
+            class_name (str, optional): Spells on this class's list.
+            level (int, optional): Spells of this level (0 for cantrips).
+            school (str, optional): Spells of this school.
+            concentration (bool, optional): Only (True) or no (False) Concentration spells.
+            ritual (bool, optional): Only (True) or no (False) Ritual spells.
+            components (iterable, optional): Spells requiring all of these components, e.g. ['V', 'S'].
+            exclude (iterable, optional): Spell names to leave out (e.g., already known spells).
+
+        Returns:
+            list: Sorted spell names.
+        """
+        if class_name is not None and level is not None:
+            result = self.class_spells(class_name, level)
+        elif class_name is not None:
+            result = frozenset().union(*(self.class_spells(class_name, lvl) for lvl in self.spell_dicts))
+        elif level is not None:
+            result = frozenset(self.spell_dicts.get(level, {}))
+        else:
+            result = frozenset(self.level_of)
+        if school is not None:
+            result = result & self.by_school.get(school, frozenset())
+        if concentration is not None:
+            result = result & self.concentration if concentration else result - self.concentration
+        if ritual is not None:
+            result = result & self.ritual if ritual else result - self.ritual
+        for component in components or ():
+            result = result & self.by_component.get(component, frozenset())
+        if exclude:
+            result = result - set(exclude)
+        return sorted(result)
+
+    def spell_data(self, name):
+        """
+        Return the data for a spell by name, or None if it is unknown.
+        """
+        level = self.level_of.get(name)
+        return None if level is None else self.spell_dicts[level][name]
+
+
+@lru_cache(maxsize=1)
+def get_spell_index():
+    """
+    Return the shared SpellIndex over get_spell_dicts(), building it on first use.
+
+    Returns:
+        SpellIndex: The spell index.
+    """
+    from .spells_utils import get_spell_dicts
+    return SpellIndex(get_spell_dicts())
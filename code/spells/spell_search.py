@@ -0,0 +1,251 @@
+"""
+spell_search.py
+---------------
+Full-text spell search.
+Spells are tokenized over name, description, school, range, and duration into an inverted index ranked with
+BM25, and every indexed term goes into a prefix trie so the last, partly typed word of a query completes as
+you type. The index is persisted next to the spell modules and rebuilt only when the spell files change.
+
+Functions:
+    tokenize(text): Splits text into lowercase search terms.
+    get_spell_search_index(path=DEFAULT_SEARCH_INDEX_PATH): Returns the shared search index, loading or building it.
+"""
+
+import math
+import pickle
+import re
+from pathlib import Path
+
+from prompt_toolkit.completion import Completer, Completion
+
+from .spell_db import spell_source_stats
+
+DEFAULT_SEARCH_INDEX_PATH = Path(__file__).resolve().parent / "spell_search_index.pkl"
+
+# Each field's terms count this many times toward a spell's term frequencies
+FIELD_WEIGHTS = {
+    "name": 3,
+    "school": 1,
+    "range": 1,
+    "duration": 1,
+    "description": 1,
+}
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Most terms a partly typed word expands to
+MAX_PREFIX_EXPANSIONS = 50
+
+_INDEX_VERSION = 2
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_END = "$"
+
+_search_index = None
+
+
+def tokenize(text):
+    """
+    Split text into lowercase alphanumeric search terms.
+    """
+    return _TOKEN_PATTERN.findall(text.lower().replace("'", "").replace("’", ""))
+
+
+class PrefixTrie:
+    """
+    Character trie of search terms, for completing partly typed words.
+    """
+
+    def __init__(self, terms=()):
+        self._root = {}
+        for term in terms:
+            self.insert(term)
+
+    def insert(self, term):
+        node = self._root
+        for char in term:
+            node = node.setdefault(char, {})
+        node[_END] = True
+
+    def complete(self, prefix, limit=None):
+        """
+        Return the terms starting with prefix, shortest first then alphabetically, at most limit of them.
+        """
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        terms = []
+        # Breadth-first, so shorter (closer) completions come first
+        level = [(prefix, node)]
+        while level and (limit is None or len(terms) < limit):
+            next_level = []
+            for text, current in sorted(level, key=lambda item: item[0]):
+                if _END in current:
+                    terms.append(text)
+                next_level.extend((text + char, child) for char, child in current.items() if char != _END)
+            level = next_level
+        return terms[:limit] if limit is not None else terms
+
+
+class SpellSearchIndex:
+    """
+    BM25 inverted index over the spell catalog.
+
+    Attributes:
+        names (list): Spell name for each document ID; each spell has one.
+        levels (list): Spell level for each document ID (the lowest, for spells listed at two levels).
+        sources (dict): Spell source file stats the index was built from.
+    """
+
+    def __init__(self, spell_dicts, sources=None):
+        """
+        Build the index.
+
+        Args:
+            spell_dicts (Mapping): {level: {spell_name: spell_data}}, e.g. get_spell_dicts().
+            sources (dict, optional): Spell source file stats, used to tell when a saved index is stale.
+        """
+        self.names = []
+        self.levels = []
+        self.sources = sources or {}
+        self._postings = {}
+        self._doc_lengths = []
+        self._doc_ids = {}
+        for level in sorted(spell_dicts):
+            for name, data in spell_dicts[level].items():
+                # A few spells are listed at two levels (e.g. Summon Beast); each is indexed once, at its lowest level
+                if name in self._doc_ids:
+                    continue
+                doc_id = self._doc_ids[name] = len(self.names)
+                self.names.append(name)
+                self.levels.append(level)
+                frequencies = {}
+                for field, weight in FIELD_WEIGHTS.items():
+                    value = name if field == "name" else data.get(field, "")
+                    for term in tokenize(value or ""):
+                        frequencies[term] = frequencies.get(term, 0) + weight
+                for term, frequency in frequencies.items():
+                    self._postings.setdefault(term, {})[doc_id] = frequency
+                self._doc_lengths.append(sum(frequencies.values()))
+        count = len(self.names)
+        average_length = sum(self._doc_lengths) / count if count else 0
+        # Precompute each posting's BM25 score so a query only adds numbers up
+        self._scores = {}
+        for term, postings in self._postings.items():
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            self._scores[term] = {
+                doc_id: idf * frequency * (K1 + 1)
+                / (frequency + K1 * (1 - B + B * self._doc_lengths[doc_id] / average_length))
+                for doc_id, frequency in postings.items()
+            }
+        self.trie = PrefixTrie(self._postings)
+
+    def _term_scores(self, token, is_prefix):
+        """
+        Return {doc_id: score} for a query token; a prefix token scores each spell by its best matching term.
+        """
+        if not is_prefix:
+            return self._scores.get(token, {})
+        combined = {}
+        for term in self.trie.complete(token, MAX_PREFIX_EXPANSIONS):
+            for doc_id, score in self._scores[term].items():
+                if score > combined.get(doc_id, 0):
+                    combined[doc_id] = score
+        return combined
+
+    def search(self, query, limit=10, candidates=None):
+        """
+        Return the spells best matching a query.
+        Unless the query ends in a space, its last word is treated as a prefix (as-you-type completion).
+
+        Args:
+            query (str): Search text, e.g. "fire dam" or "concentration heal".
+            limit (int, optional): Most results to return. Defaults to 10.
+            candidates (set, optional): Only return spells whose names are in this set (e.g., a class's available spells).
+
+        Returns:
+            list: (spell_name, score) tuples, best match first.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        last_is_prefix = not query[-1:].isspace()
+        scores = {}
+        for position, token in enumerate(tokens):
+            is_prefix = last_is_prefix and position == len(tokens) - 1
+            for doc_id, score in self._term_scores(token, is_prefix).items():
+                scores[doc_id] = scores.get(doc_id, 0) + score
+        if candidates is not None:
+            allowed = {self._doc_ids[name] for name in candidates if name in self._doc_ids}
+            scores = {doc_id: score for doc_id, score in scores.items() if doc_id in allowed}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.names[item[0]]))
+        return [(self.names[doc_id], score) for doc_id, score in ranked[:limit]]
+
+    def level_of(self, name):
+        """Return the level of an indexed spell."""
+        return self.levels[self._doc_ids[name]]
+
+    def save(self, path=DEFAULT_SEARCH_INDEX_PATH):
+        """Persist the index to path."""
+        with open(path, "wb") as out:
+            pickle.dump((_INDEX_VERSION, self), out, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path=DEFAULT_SEARCH_INDEX_PATH):
+        """
+        Load a persisted index, or return None if it is missing, unreadable, or from another index version.
+        """
+        try:
+            with open(path, "rb") as file:
+                version, index = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError):
+            return None
+        return index if version == _INDEX_VERSION else None
+
+
+class SpellCompleter(Completer):
+    """
+    prompt_toolkit completer offering the best search matches for the text typed so far.
+    """
+
+    def __init__(self, index, candidates=None, limit=15):
+        """
+        Args:
+            index (SpellSearchIndex): The search index.
+            candidates (set, optional): Only complete to these spell names.
+            limit (int, optional): Most completions to show. Defaults to 15.
+        """
+        self.index = index
+        self.candidates = candidates
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        text = document.text_before_cursor
+        for name, _ in self.index.search(text, self.limit, self.candidates):
+            level = self.index.level_of(name)
+            yield Completion(name, start_position=-len(text),
+                             display_meta="Cantrip" if level == 0 else f"Level {level}")
+
+
+def get_spell_search_index(path=DEFAULT_SEARCH_INDEX_PATH):
+    """
+    Return the shared spell search index: the persisted index if it matches the current spell files,
+    otherwise a freshly built one (which is then saved for next time).
+
+    Returns:
+        SpellSearchIndex: The search index.
+    """
+    global _search_index
+    if _search_index is None:
+        sources = spell_source_stats()
+        index = SpellSearchIndex.load(path)
+        if index is None or index.sources != sources:
+            from .spells_utils import get_spell_dicts
+            index = SpellSearchIndex(get_spell_dicts(), sources)
+            try:
+                index.save(path)
+            except OSError:
+                pass
+        _search_index = index
+    return _search_index
@@ -0,0 +1,242 @@
+"""
+spell_set.py
+------------
+Bitset sets of spells.
+Every spell in the catalog gets a dense integer ID (levels in order, names sorted within a level) and a SpellSet
+stores its members as the bits of one Python int, so union, intersection, difference, and class filtering are
+single integer operations, and a SpellSet is hashable for comparing or deduplicating characters by spell loadout.
+
+IDs are assigned per process, so compare SpellSets within a run; persist spell names, not bits.
+
+Functions:
+    get_spell_registry(): Returns the shared SpellRegistry over get_spell_dicts().
+"""
+
+from functools import lru_cache
+
+
+class SpellRegistry:
+    """
+    Dense integer IDs for spell names.
+
+    A level's spells get a contiguous block of IDs, in name order, the first time that level is needed, so a
+    lazily loaded catalog only loads the levels in use. A spell listed at more than one level keeps the ID of
+    the first level assigned. Names outside the catalog get IDs after the catalog's.
+
+    Attributes:
+        spell_dicts (Mapping): {level: {spell_name: spell_data}} the IDs are assigned from.
+        names (list): Spell name for each ID.
+    """
+
+    def __init__(self, spell_dicts):
+        self.spell_dicts = spell_dicts
+        self.names = []
+        self._ids = {}
+        # level -> bitmask of that level's spells
+        self._level_masks = {}
+        # (class_name, level) -> bitmask of the class's spells at that level
+        self._class_masks = {}
+
+    def _assign(self, name):
+        spell_id = self._ids[name] = len(self.names)
+        self.names.append(name)
+        return spell_id
+
+    def level_mask(self, level):
+        """Return the bitmask of every spell of a level, assigning that level's IDs if needed."""
+        mask = self._level_masks.get(level)
+        if mask is None:
+            mask = 0
+            for name in sorted(self.spell_dicts.get(level, {})):
+                spell_id = self._ids.get(name)
+                mask |= 1 << (self._assign(name) if spell_id is None else spell_id)
+            self._level_masks[level] = mask
+        return mask
+
+    def id_of(self, name):
+        """
+        Return the ID of a spell name, assigning one if it has none yet.
+        Catalog levels are assigned first, so a catalog spell always gets an ID in a level's block.
+        """
+        spell_id = self._ids.get(name)
+        if spell_id is None:
+            for level in self.spell_dicts:
+                self.level_mask(level)
+            spell_id = self._ids.get(name)
+            if spell_id is None:
+                spell_id = self._assign(name)
+        return spell_id
+
+    def mask_of(self, names):
+        """Return the bitmask of a collection of spell names."""
+        mask = 0
+        for name in names:
+            mask |= 1 << self.id_of(name)
+        return mask
+
+    def class_mask(self, class_name, level):
+        """Return the bitmask of the spells on a class's list at a level."""
+        key = (class_name, level)
+        mask = self._class_masks.get(key)
+        if mask is None:
+            from .spell_index import get_spell_index
+            self.level_mask(level)
+            mask = self._class_masks[key] = self.mask_of(get_spell_index().class_spells(class_name, level))
+        return mask
+
+
+@lru_cache(maxsize=1)
+def get_spell_registry():
+    """
+    Return the shared SpellRegistry over get_spell_dicts(), creating it on first use.
+
+    Returns:
+        SpellRegistry: The spell registry.
+    """
+    from .spells_utils import get_spell_dicts
+    return SpellRegistry(get_spell_dicts())
+
+
+def _level_number(level):
+    """Return the int level for a known_spells key ('Cantrips', '1', ...) or an int level."""
+    if level == 'Cantrips':
+        return 0
+    return int(level)
+
+
+class SpellSet:
+    """
+    Immutable set of spell names stored as a bitmask over SpellRegistry IDs.
+
+    Supports |, &, -, ^, <=, >=, in, len, iteration (in ID order; use names() for sorted names), equality,
+    and hashing.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, names=()):
+        """
+        Args:
+            names (iterable, optional): Spell names in the set.
+        """
+        self._bits = get_spell_registry().mask_of(names)
+
+    @classmethod
+    def _from_bits(cls, bits):
+        spell_set = object.__new__(cls)
+        spell_set._bits = bits
+        return spell_set
+
+    @classmethod
+    def coerce(cls, spells):
+        """
+        Return spells as a SpellSet: a SpellSet unchanged, None as the empty set, anything else as its names.
+        """
+        if isinstance(spells, SpellSet):
+            return spells
+        return cls(spells or ())
+
+    @classmethod
+    def from_known_spells(cls, known_spells, levels=None):
+        """
+        Build a SpellSet from a character's known_spells dict ({'Cantrips': {...}, '1': {...}, ...}).
+
+        Args:
+            known_spells (dict): Spell names by level key.
+            levels (str, int, or iterable, optional): Only these levels ('Cantrips' or 0 for cantrips). Defaults to all.
+
+        Returns:
+            SpellSet: The known spells at those levels.
+        """
+        known_spells = known_spells or {}
+        if levels is None:
+            keys = list(known_spells)
+        elif isinstance(levels, (str, int)):
+            keys = [levels]
+        else:
+            keys = list(levels)
+        registry = get_spell_registry()
+        bits = 0
+        for key in keys:
+            level = _level_number(key)
+            # Assign the level's block first so its spells keep their level order
+            registry.level_mask(level)
+            bits |= registry.mask_of(known_spells.get('Cantrips' if level == 0 else str(level), ()))
+        return cls._from_bits(bits)
+
+    @classmethod
+    def class_spells(cls, class_name, level):
+        """Return the SpellSet of spells on a class's list at a level (0 for cantrips)."""
+        return cls._from_bits(get_spell_registry().class_mask(class_name, level))
+
+    @classmethod
+    def level_spells(cls, level):
+        """Return the SpellSet of every spell of a level (0 for cantrips)."""
+        return cls._from_bits(get_spell_registry().level_mask(level))
+
+    @property
+    def bits(self):
+        """The membership bitmask; bit n is set if the spell with ID n is in the set."""
+        return self._bits
+
+    def for_class(self, class_name, level):
+        """Return the spells in this set that are on a class's list at a level."""
+        return SpellSet._from_bits(self._bits & get_spell_registry().class_mask(class_name, level))
+
+    def at_level(self, level):
+        """Return the spells in this set of a level (0 for cantrips)."""
+        return SpellSet._from_bits(self._bits & get_spell_registry().level_mask(level))
+
+    def names(self):
+        """Return the spell names in the set, sorted."""
+        return sorted(self)
+
+    def isdisjoint(self, other):
+        return not self._bits & SpellSet.coerce(other)._bits
+
+    def __or__(self, other):
+        return SpellSet._from_bits(self._bits | SpellSet.coerce(other)._bits)
+
+    def __and__(self, other):
+        return SpellSet._from_bits(self._bits & SpellSet.coerce(other)._bits)
+
+    def __sub__(self, other):
+        return SpellSet._from_bits(self._bits & ~SpellSet.coerce(other)._bits)
+
+    def __xor__(self, other):
+        return SpellSet._from_bits(self._bits ^ SpellSet.coerce(other)._bits)
+
+    def __le__(self, other):
+        return not self._bits & ~SpellSet.coerce(other)._bits
+
+    def __ge__(self, other):
+        return not SpellSet.coerce(other)._bits & ~self._bits
+
+    def __contains__(self, name):
+        spell_id = get_spell_registry()._ids.get(name)
+        return spell_id is not None and bool(self._bits >> spell_id & 1)
+
+    def __iter__(self):
+        names = get_spell_registry().names
+        bits = self._bits
+        while bits:
+            lowest = bits & -bits
+            yield names[lowest.bit_length() - 1]
+            bits ^= lowest
+
+    def __len__(self):
+        return self._bits.bit_count()
+
+    def __bool__(self):
+        return bool(self._bits)
+
+    def __eq__(self, other):
+        if isinstance(other, SpellSet):
+            return self._bits == other._bits
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._bits)
+
+    def __repr__(self):
+        return f"SpellSet({self.names()!r})"
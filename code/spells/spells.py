@@ -7,9 +7,14 @@ Provides functions for prompting and displaying spells by class and level.
 Functions:
     prompt_and_print_class_spell_list(): Prompts for class and level, then displays available spells.
     add_class_spell(class_name, level, known_spells=None): Prompts user to select a spell for a class/level, excluding already known spells.
+    pick_class_spell(class_name, level, spell_name, known_spells=None): Non-interactive counterpart of add_class_spell.
+    prompt_spell_search(): Prompts for a search over all spells, with as-you-type completion, and displays the chosen spell.
 """
 
-from .spells_utils import get_spell_dicts, filter_spells_by_class_and_known, print_spell_table
+from .spells_utils import get_spell_dicts, filter_spells_by_class_and_known, print_spell_table, print_class_spell_table
+from .spell_index import get_spell_index
+from .spell_search import get_spell_search_index, SpellCompleter
+from .spell_set import SpellSet
 from InquirerPy import inquirer
 try:
     from prettytable import PrettyTable
@@ -27,12 +32,8 @@ def prompt_and_print_class_spell_list():
         None
     """
     spell_dicts = get_spell_dicts()
-    # Collect all unique classes from all spell dictionaries
-    all_classes = set()
-    for d in spell_dicts.values():
-        for spell in d.values():
-            all_classes.update(spell.get("classes", []))
-    all_classes = sorted(all_classes)
+    # All classes with spells, from the spell index
+    all_classes = get_spell_index().classes
 
     questions = [
         inquirer.List(
@@ -66,13 +67,14 @@ def prompt_and_print_class_spell_list():
 def add_class_spell(class_name, level, known_spells=None, exclude_spells=None):
     """
     Prompts the user to select a spell for the given class and level, displaying a PrettyTable of available spells.
-    Only spells not already in known_spells or exclude_spells are selectable. Uses inquirer with bottom>top cycling.
+    Only spells not already in known_spells or exclude_spells are selectable. The spell is typed into an inquirer.text
+    prompt whose SpellCompleter suggests the best-ranked matching spells as you type.
 
     Args:
         class_name (str): The class for which to select a spell.
         level (int): The spell level (0 for cantrips).
-        known_spells (list or set, optional): List or set of already known spell names for this level.
-        exclude_spells (list or set, optional): List or set of spell names to exclude (e.g., feature-granted spells).
+        known_spells (list, set, or SpellSet, optional): Already known spell names for this level.
+        exclude_spells (list, set, or SpellSet, optional): Spell names to exclude (e.g., feature-granted spells).
 
     Returns:
         tuple: (spell_name, spell_data) for the selected spell, or (None, None) if cancelled.
@@ -89,20 +91,76 @@ def add_class_spell(class_name, level, known_spells=None, exclude_spells=None):
         return None, None
 
     columns = ["Name", "School", "Casting Time", "Range", "Duration", "Description"]
-    print_spell_table(filtered, columns, PrettyTable)
+    # The learn_spell loop re-prompts the same class and level with one more spell excluded each time;
+    # the cached table only drops that row instead of rendering every spell again
+    excluded = SpellSet.coerce(known_spells) | SpellSet.coerce(exclude_spells)
+    print_class_spell_table(class_name, level, filtered, excluded, columns)
 
-    # Inquirer prompt with bottom>top cycling
-    spell_choices = list(filtered.keys())
-    if not spell_choices:
-        print("No selectable spells.")
-        return None, None
-    spell_name = inquirer.select(
-        message="Select a spell:",
-        choices=spell_choices,
-        cycle=True,
-        pointer=">"
-    ).execute()
+    spell_name = _prompt_spell_name("Select a spell (type to search):", filtered)
     if not spell_name:
         print("No spell selected.")
         return None, None
     return spell_name, filtered[spell_name]
+
+def _prompt_spell_name(message, spells):
+    """
+    Prompt for one of the given spells by name, with ranked search completions as you type.
+    Names are matched case-insensitively; only names in spells are accepted.
+
+    Args:
+        message (str): Prompt message.
+        spells (dict or Mapping): Selectable spells keyed by name.
+
+    Returns:
+        str: The chosen spell name.
+    """
+    names_by_key = {name.lower(): name for name in spells}
+    return inquirer.text(
+        message=message,
+        completer=SpellCompleter(get_spell_search_index(), candidates=set(spells)),
+        validate=lambda text: text.strip().lower() in names_by_key,
+        invalid_message="Not an available spell; type part of a name, school, or effect to see matches.",
+        filter=lambda text: names_by_key.get(text.strip().lower()),
+    ).execute()
+
+def prompt_spell_search():
+    """
+    Prompts for a spell with search completions over every spell (name, description, school, range, duration),
+    then displays the chosen spell.
+
+    Returns:
+        tuple: (spell_name, spell_data) for the chosen spell.
+    """
+    index = get_spell_index()
+    all_spells = {name: None for name in index.level_of}
+    spell_name = _prompt_spell_name("Search spells:", all_spells)
+    spell_data = index.spell_data(spell_name)
+    columns = ["Name", "School", "Casting Time", "Range", "Duration", "Description"]
+    print_spell_table({spell_name: spell_data}, columns, PrettyTable)
+    print(f"Classes: {', '.join(spell_data.get('classes', []))}")
+    print(spell_data.get("description", ""))
+    return spell_name, spell_data
+
+def pick_class_spell(class_name, level, spell_name, known_spells=None, exclude_spells=None):
+    """
+    Non-interactive counterpart of add_class_spell: selects a named spell for the given class and level.
+    The spell must be on the class's list for that level and not in known_spells or exclude_spells.
+
+    Args:
+        class_name (str): The class for which to select a spell.
+        level (int): The spell level (0 for cantrips).
+        spell_name (str): The spell to select.
+        known_spells (list, set, or SpellSet, optional): Already known spell names for this level.
+        exclude_spells (list, set, or SpellSet, optional): Spell names to exclude (e.g., feature-granted spells).
+
+    Returns:
+        tuple: (spell_name, spell_data) for the selected spell.
+
+    Raises:
+        ValueError: If the spell is not available to the class at that level.
+    """
+    spells = get_spell_dicts().get(level, {})
+    filtered = filter_spells_by_class_and_known(spells, class_name, known_spells, exclude_spells)
+    if spell_name not in filtered:
+        raise ValueError(f"{spell_name} is not an available level {level} {class_name} spell")
+    return spell_name, filtered[spell_name]
@@ -5,28 +5,82 @@ Helper functions for D&D 5e spell utilities.
 Provides reusable logic for filtering, displaying, and managing spell data.
 
 Functions:
-    get_spell_dicts(): Returns a dictionary mapping spell levels to their respective spell dictionaries.
+    get_spell_dicts(): Returns a mapping of spell levels to their respective spell dictionaries, loading each level on first access.
     filter_spells_by_class_and_known(spells, class_name, known_spells=None): Filters spells by class and optionally excludes already known spells.
+        Uses the spell index (spell_index.py) for the level dicts returned by get_spell_dicts().
     print_spell_table(filtered, columns, prettytable_cls=None): Prints a PrettyTable of spells with selected columns.
+    render_spell_table(filtered, columns, prettytable_cls=None): Returns the same table as a string.
+    SpellTableCache: Caches rendered class spell tables for repeated prompts (e.g., the learn_spell loop).
+    print_class_spell_table(class_name, level, filtered, excluded, columns): Prints a class spell table through the shared cache.
 """
 
+import importlib
+from collections.abc import Mapping
+
+from .spell_set import SpellSet
+
+# Spell level -> (module, dict name) defining that level's spells
+SPELL_LEVEL_MODULES = {
+    0: ("cantrips", "CANTRIPS_DICT"),
+    1: ("level1", "FIRST_LEVEL_SPELLS_DICT"),
+    2: ("level2", "SECOND_LEVEL_SPELLS_DICT"),
+    3: ("level3", "THIRD_LEVEL_SPELLS_DICT"),
+}
+
+
+class LazySpellCatalog(Mapping):
+    """
+    Read-only {level: spell_dict} mapping that imports each spell level module the first time that level is accessed.
+    Iterating over the keys or checking membership does not load anything.
+    """
+
+    def __init__(self, level_modules):
+        self._level_modules = level_modules
+        self._loaded = {}
+
+    def __getitem__(self, level):
+        spells = self._loaded.get(level)
+        if spells is None:
+            if level not in self._level_modules:
+                raise KeyError(level)
+            module_name, dict_name = self._level_modules[level]
+            module = importlib.import_module(f".{module_name}", __package__)
+            spells = self._loaded[level] = getattr(module, dict_name)
+        return spells
+
+    def __iter__(self):
+        return iter(self._level_modules)
+
+    def __len__(self):
+        return len(self._level_modules)
+
+    def __contains__(self, level):
+        return level in self._level_modules
+
+    def loaded_levels(self):
+        """Return the levels that have been loaded so far."""
+        return sorted(self._loaded)
+
+
+_SPELL_CATALOG = None
+# spell_name -> (spell data, table row) for spell_table_row()
+_ROW_CACHE = {}
+
+
 def get_spell_dicts():
     """
-    Import and return a dictionary mapping spell levels to their respective spell dictionaries.
+    Return the spell catalog, a mapping of spell levels to their respective spell dictionaries.
+    Uses the precompiled spell database (spell_db.py) when it is built and up to date; otherwise each
+    level's module is imported the first time that level is accessed.
 
     Returns:
-        dict: {level: spell_dict} for levels 0-3.
-    """
-    from .cantrips import CANTRIPS_DICT
-    from .level1 import FIRST_LEVEL_SPELLS_DICT
-    from .level2 import SECOND_LEVEL_SPELLS_DICT
-    from .level3 import THIRD_LEVEL_SPELLS_DICT
-    return {
-        0: CANTRIPS_DICT,
-        1: FIRST_LEVEL_SPELLS_DICT,
-        2: SECOND_LEVEL_SPELLS_DICT,
-        3: THIRD_LEVEL_SPELLS_DICT,
-    }
+        Mapping: {level: spell_dict} for levels 0-3 (a SpellDatabase or LazySpellCatalog).
+    """
+    global _SPELL_CATALOG
+    if _SPELL_CATALOG is None:
+        from .spell_db import open_spell_db
+        _SPELL_CATALOG = open_spell_db() or LazySpellCatalog(SPELL_LEVEL_MODULES)
+    return _SPELL_CATALOG
 
 def filter_spells_by_class_and_known(spells, class_name, known_spells=None, exclude_spells=None):
     """
@@ -35,26 +89,51 @@ def filter_spells_by_class_and_known(spells, class_name, known_spells=None, excl
     Args:
         spells (dict): Dictionary of spells to filter.
         class_name (str): The class to filter spells for.
-        known_spells (set or list, optional): Spells to exclude from the result.
-        exclude_spells (set or list, optional): Additional spells to exclude (e.g., feature-granted spells).
+        known_spells (set, list, or SpellSet, optional): Spells to exclude from the result.
+        exclude_spells (set, list, or SpellSet, optional): Additional spells to exclude (e.g., feature-granted spells).
 
     Returns:
         dict: Filtered dictionary of spells for the class and not already known or excluded.
     """
-    if known_spells is None:
-        known_spells = set()
-    else:
-        known_spells = set(known_spells)
-    if exclude_spells is None:
-        exclude_spells = set()
-    else:
-        exclude_spells = set(exclude_spells)
-    all_excluded = known_spells | exclude_spells
+    # Level dicts from get_spell_dicts() are answered with spell bitsets (spell_set.py)
+    from .spell_index import get_spell_index
+    level = get_spell_index().level_for_dict(spells)
+    if level is not None:
+        names = SpellSet.class_spells(class_name, level) - SpellSet.coerce(known_spells) - SpellSet.coerce(exclude_spells)
+        return {name: spells[name] for name in names.names()}
+    all_excluded = set(known_spells or ()) | set(exclude_spells or ())
     return {name: data for name, data in spells.items() if class_name in data.get("classes", []) and name not in all_excluded}
 
-def print_spell_table(filtered, columns, prettytable_cls=None):
+def spell_table_row(name, data):
     """
-    Print a PrettyTable of spells with the given columns.
+    Return the table cells for a spell: name, school, casting time, range, duration, and a description
+    truncated to 60 characters. Rows are cached per spell, so descriptions are only truncated once.
+
+    Args:
+        name (str): The spell name.
+        data (dict): The spell data.
+
+    Returns:
+        list: The row's cells.
+    """
+    cached = _ROW_CACHE.get(name)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    description = data.get("description", "") or ""
+    row = [
+        name,
+        data.get("school", ""),
+        data.get("casting_time", ""),
+        data.get("range", ""),
+        data.get("duration", ""),
+        description[:60] + ("..." if len(description) > 60 else ""),
+    ]
+    _ROW_CACHE[name] = (data, row)
+    return row
+
+def render_spell_table(filtered, columns, prettytable_cls=None):
+    """
+    Render a PrettyTable of spells with the given columns and return it as a string.
 
     Args:
         filtered (dict): Dictionary of spells to display.
@@ -62,27 +141,148 @@ def print_spell_table(filtered, columns, prettytable_cls=None):
         prettytable_cls (type, optional): PrettyTable class to use (for dependency injection/testing).
 
     Returns:
-        None
+        str: The rendered table, or None if PrettyTable is not installed.
     """
     if prettytable_cls is None:
         try:
             from prettytable import PrettyTable
         except ImportError:
-            print("PrettyTable is not installed. Please install it with 'pip install prettytable'.")
-            print(filtered)
-            return
+            return None
     else:
         PrettyTable = prettytable_cls
     table = PrettyTable()
     table.field_names = columns
     table.align = "l"
     for name, data in filtered.items():
-        table.add_row([
-            name,
-            data.get("school", ""),
-            data.get("casting_time", ""),
-            data.get("range", ""),
-            data.get("duration", ""),
-            (data.get("description", "") or "")[:60] + ("..." if data.get("description") and len(data.get("description")) > 60 else "")
-        ])
-    print(table)
+        table.add_row(spell_table_row(name, data))
+    return table.get_string()
+
+def print_spell_table(filtered, columns, prettytable_cls=None):
+    """
+    Print a PrettyTable of spells with the given columns.
+
+    Args:
+        filtered (dict): Dictionary of spells to display.
+        columns (list): List of column names for the table.
+        prettytable_cls (type, optional): PrettyTable class to use (for dependency injection/testing).
+
+    Returns:
+        None
+    """
+    rendered = render_spell_table(filtered, columns, prettytable_cls)
+    if rendered is None:
+        print("PrettyTable is not installed. Please install it with 'pip install prettytable'.")
+        print(filtered)
+        return
+    print(rendered)
+
+class SpellTableCache:
+    """
+    Cache of rendered class spell tables, keyed by (class, level, excluded spells).
+
+    When the excluded set grows by spells that were rows of an already rendered table (e.g. the spell just
+    picked in the learn_spell loop), those rows are dropped from the cached text instead of re-rendering.
+    """
+
+    # Rendered tables kept at once
+    MAX_ENTRIES = 64
+    # Lines before the first row in a rendered table: top border, header, header border
+    _HEADER_LINES = 3
+
+    def __init__(self, prettytable_cls=None):
+        self._prettytable_cls = prettytable_cls
+        # (class_name, level, columns, excluded) -> (rendered lines, row names)
+        self._entries = {}
+        # (class_name, level, columns) -> most recent key for that table, the base for incremental updates
+        self._latest = {}
+
+    def render(self, class_name, level, filtered, excluded, columns):
+        """
+        Return the rendered table for a class's spells at a level, minus the excluded spells.
+
+        Args:
+            class_name (str): The class the table is for.
+            level (int): The spell level.
+            filtered (dict): The spells to display (the class's spells at that level, minus excluded).
+            excluded (SpellSet or set): The spells left out of filtered (known and feature-granted spells).
+            columns (list): List of column names for the table.
+
+        Returns:
+            str: The rendered table, or None if PrettyTable is not installed.
+        """
+        table_key = (class_name, level, tuple(columns))
+        key = table_key + (SpellSet.coerce(excluded),)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._drop_rows(self._latest.get(table_key), key[-1], filtered)
+        if entry is None:
+            rendered = render_spell_table(filtered, columns, self._prettytable_cls)
+            if rendered is None:
+                return None
+            lines = rendered.splitlines()
+            names = list(filtered)
+            # Rows with embedded newlines span several lines; those tables can't be updated row by row
+            entry = (lines, names if len(lines) == len(names) + self._HEADER_LINES + 1 else None)
+        self._store(table_key, key, entry)
+        return "\n".join(entry[0])
+
+    def _drop_rows(self, base_key, excluded, filtered):
+        """
+        Derive a table from a cached one by dropping rows, or return None if that isn't possible.
+        """
+        base = self._entries.get(base_key) if base_key else None
+        if base is None or base[1] is None or not base_key[-1] <= excluded:
+            return None
+        lines, names = base
+        keep = [i for i, name in enumerate(names) if name in filtered]
+        if len(keep) != len(filtered) or not keep:
+            return None
+        # Column widths come from the widest cells; if a dropped row held one, the columns would narrow
+        dropped_widths = self._column_widths(name for name in names if name not in filtered)
+        kept_widths = self._column_widths(filtered)
+        if any(dropped > kept for dropped, kept in zip(dropped_widths, kept_widths)):
+            return None
+        header, footer = lines[:self._HEADER_LINES], lines[-1:]
+        rows = [lines[self._HEADER_LINES + i] for i in keep]
+        return header + rows + footer, [names[i] for i in keep]
+
+    @staticmethod
+    def _column_widths(names):
+        """Return the length of the widest cell in each column over the given spells' rows."""
+        widths = None
+        for name in names:
+            row = _ROW_CACHE[name][1]
+            lengths = [len(str(cell)) for cell in row]
+            widths = lengths if widths is None else [max(pair) for pair in zip(widths, lengths)]
+        return widths or []
+
+    def _store(self, table_key, key, entry):
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        self._latest[table_key] = key
+        while len(self._entries) > self.MAX_ENTRIES:
+            oldest = next(iter(self._entries))
+            del self._entries[oldest]
+
+
+_SPELL_TABLE_CACHE = SpellTableCache()
+
+def print_class_spell_table(class_name, level, filtered, excluded, columns):
+    """
+    Print a class's spell table for a level through the shared SpellTableCache.
+
+    Args:
+        class_name (str): The class the table is for.
+        level (int): The spell level.
+        filtered (dict): The spells to display, as returned by filter_spells_by_class_and_known().
+        excluded (SpellSet): The spells left out of filtered (known and feature-granted spells).
+        columns (list): List of column names for the table.
+
+    Returns:
+        None
+    """
+    rendered = _SPELL_TABLE_CACHE.render(class_name, level, filtered, excluded, columns)
+    if rendered is None:
+        print_spell_table(filtered, columns)
+        return
+    print(rendered)